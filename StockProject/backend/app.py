@@ -1,12 +1,24 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import logging
+import time
 
 from config import get_settings
+from database import engine
+from metrics import REGISTRY, CONTENT_TYPE, HTTP_REQUEST_SECONDS
+from tracing import TimedJSONResponse, start_trace, end_trace, current_trace, trace_buffer
 from services.korea_investment import ki_service
-from routers import auth_router, stock_router, watchlist_router, market_router, portfolio_router
+from services.realtime import realtime_feed, KIS_WS_ENABLED
+from services.quote_stream import quote_hub
+from services.market_ranking import top_stock_ranking
+from services.news import news_fetcher
+from services.news_prefetch import news_prefetcher, NEWS_PREFETCH_ENABLED
+from services.stock_search import stock_search
+from services.stock_master import stock_master
+from routers import auth_router, stock_router, watchlist_router, market_router, portfolio_router, stream_router, admin_router, news_router
 
 # 설정
 settings = get_settings()
@@ -22,17 +34,31 @@ async def lifespan(app: FastAPI):
     # Startup
     try:
         logger.info("✅ 서버 시작")
-        token = ki_service.get_access_token()
+        token = await ki_service.get_access_token()
         if token:
             logger.info("✅ 한국투자증권 API 토큰 발급 완료")
         else:
             logger.warning("⚠️ 토큰 발급 실패")
+        ki_service.token_manager.start()
+        stock_search.start()
+        top_stock_ranking.start()
+        if NEWS_PREFETCH_ENABLED:
+            news_prefetcher.start()
+        if KIS_WS_ENABLED:
+            realtime_feed.start()
     except Exception as e:
         logger.error(f"❌ 서버 시작 중 오류: {e}")
     
     yield
     
     logger.info("👋 서버 종료 중...")
+    await realtime_feed.stop()
+    await top_stock_ranking.stop()
+    await stock_search.stop()
+    await news_prefetcher.stop()
+    await ki_service.token_manager.stop()
+    await ki_service.aclose()
+    await news_fetcher.aclose()
 
 
 # FastAPI 앱
@@ -41,6 +67,7 @@ app = FastAPI(
     description="한국투자증권 OpenAPI를 활용한 주식 정보 제공 API",
     version="1.0.0",
     debug=settings.DEBUG,
+    default_response_class=TimedJSONResponse,
     lifespan=lifespan
 )
 
@@ -51,14 +78,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+
+
+# 라우트별 처리 시간 메트릭 + 단계별 시간 (Server-Timing 헤더, 느린 요청 보관)
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    token = start_trace(request.method, request.url.path)
+    trace = current_trace()
+    response = None
+    try:
+        response = await call_next(request)
+    finally:
+        end_trace(token)
+        status_code = response.status_code if response is not None else 500
+        route = getattr(request.scope.get("route"), "path", None)
+        trace.finish(status_code, route)
+        HTTP_REQUEST_SECONDS.observe(trace.duration, request.method, route or "unmatched", str(status_code))
+        trace_buffer.add(trace)
+
+    response.headers["Server-Timing"] = trace.server_timing()
+    return response
+
+
 # 라우터 등록
 app.include_router(auth_router)
 app.include_router(stock_router)
 app.include_router(watchlist_router)
 app.include_router(market_router)
-app.include_router(portfolio_router) 
+app.include_router(portfolio_router)
+app.include_router(stream_router)
+app.include_router(admin_router)
+app.include_router(news_router)
 
 # 루트 엔드포인트
 @app.get("/")
@@ -76,10 +129,73 @@ async def health_check():
     return {
         "status": "healthy",
         "timestamp": datetime.now(timezone.utc).isoformat(),
-        "token_exists": ki_service.access_token is not None
+        "token_exists": ki_service.access_token is not None,
+        "token_expires_in": ki_service.token_manager.expires_in,
+        "kis_scheduler": ki_service.scheduler.metrics(),
+        "kis_inflight": ki_service.inflight.metrics(),
+        "kis_cache": ki_service.cache.metrics(),
+        "kis_realtime": realtime_feed.metrics(),
+        "quote_stream": quote_hub.metrics(),
+        "top_stocks": top_stock_ranking.metrics(),
+        "news": news_fetcher.metrics(),
+        "news_prefetch": news_prefetcher.metrics(),
+        "stock_search": stock_search.metrics(),
+        "stock_master": stock_master.metrics(),
+        "slow_traces": trace_buffer.metrics()
     }
 
 
+# ==================== 메트릭 ====================
+# 다른 객체가 이미 집계하는 값은 /metrics 수집 시점에 읽음
+REGISTRY.callback(
+    "kis_cache_lookups", "counter", "KIS 응답 캐시 조회 수",
+    lambda: {("hit",): ki_service.cache.hits, ("miss",): ki_service.cache.misses}, ("result",)
+)
+REGISTRY.callback(
+    "kis_cache_hit_ratio", "gauge", "KIS 응답 캐시 적중률",
+    lambda: ki_service.cache.metrics()["hit_ratio"]
+)
+REGISTRY.callback("kis_cache_entries", "gauge", "KIS 응답 캐시 항목 수", lambda: len(ki_service.cache))
+REGISTRY.callback("kis_cache_bytes", "gauge", "KIS 응답 캐시 메모리 사용량 (추정)", lambda: ki_service.cache.bytes)
+REGISTRY.callback("kis_cache_evictions", "counter", "KIS 응답 캐시 용량 초과 제거 수", lambda: ki_service.cache.evictions)
+REGISTRY.callback(
+    "kis_singleflight_calls", "counter", "KIS 동시 호출 중복 제거 (executed: 실제 호출, shared: 결과 공유)",
+    lambda: {("executed",): ki_service.inflight.executed, ("shared",): ki_service.inflight.shared}, ("result",)
+)
+
+
+def _scheduler_queue_depth():
+    scheduler_metrics = ki_service.scheduler.metrics()
+    return {
+        ("interactive",): scheduler_metrics["queue_depth_interactive"],
+        ("background",): scheduler_metrics["queue_depth_background"]
+    }
+
+
+REGISTRY.callback(
+    "kis_scheduler_queue_depth", "gauge", "KIS 호출 한도 대기열 길이", _scheduler_queue_depth, ("priority",)
+)
+REGISTRY.callback(
+    "kis_rate_limit_timeouts", "counter", "KIS 호출 한도 대기 시간 초과 수 (tr_id별)",
+    lambda: {(tr_id,): count for tr_id, count in ki_service.scheduler.timeouts.items()}, ("tr_id",)
+)
+REGISTRY.callback(
+    "db_pool_checked_out", "gauge", "사용 중인 DB 커넥션 수",
+    lambda: engine.pool.checkedout() if hasattr(engine.pool, "checkedout") else 0
+)
+REGISTRY.callback(
+    "db_pool_size", "gauge", "DB 커넥션 풀 크기",
+    lambda: engine.pool.size() if hasattr(engine.pool, "size") else 0
+)
+REGISTRY.callback("quote_stream_sessions", "gauge", "실시간 시세 스트림 연결 수", lambda: quote_hub.metrics()["sessions"])
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 수집용 메트릭"""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,3 @@
+"""
+부하 테스트 (KIS 대역 서버 + 벤치마크용 백엔드)
+"""
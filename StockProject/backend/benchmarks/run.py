@@ -0,0 +1,379 @@
+"""
+백엔드 부하 테스트
+
+KIS 대역 서버와 벤치마크용 백엔드(SQLite)를 띄우고, 동시 사용자 수를 늘려 가며 혼합 트래픽을 보낸 뒤
+엔드포인트별 p50/p95/p99 지연 시간, 처리량, KIS 호출 수를 JSON으로 저장함
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.run --concurrency 1,8,32 --duration 10
+    python -m benchmarks.run --compare benchmarks/baseline.json   # 기준 결과와 비교 (회귀 시 종료 코드 1)
+
+- mixed 단계: 모든 시나리오를 가중치대로 섞어서 호출
+- isolated 단계: 시나리오 하나씩만 호출 (엔드포인트별 KIS 호출 수 측정용)
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+
+
+# ==================== 시나리오 ====================
+
+class Context:
+    """가상 사용자가 공유하는 테스트 데이터 (종목, 로그인 토큰)"""
+
+    def __init__(self, stocks: List[Dict[str, str]], tokens: List[str], seed: int):
+        self.stocks = stocks
+        self.tokens = tokens
+        self.rng = random.Random(seed)
+        # 인기 종목에 호출이 몰리도록 순위의 역수로 가중치 (Zipf)
+        self._weights = [1 / (rank + 1) for rank in range(len(stocks))]
+
+    def hot_code(self) -> str:
+        return self.rng.choices(self.stocks, weights=self._weights)[0]["stock_code"]
+
+    def search_term(self) -> str:
+        name = self.rng.choice(self.stocks)["stock_name"]
+        return name[:self.rng.randint(1, min(3, len(name)))]
+
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+
+Scenario = Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]
+
+SCENARIOS: Dict[str, Scenario] = {
+    "top_stocks": lambda c, ctx: c.get("/api/stock/top-stocks", params={"limit": 20}),
+    "portfolio": lambda c, ctx: c.get("/api/portfolio", headers=ctx.auth()),
+    "watchlist": lambda c, ctx: c.get("/api/watchlist", params={"with_prices": "true"}, headers=ctx.auth()),
+    "search": lambda c, ctx: c.get("/api/stocks/search", params={"q": ctx.search_term()}),
+    "quote": lambda c, ctx: c.get(f"/api/stock/current/{ctx.hot_code()}"),
+    "chart": lambda c, ctx: c.get(f"/api/stock/chart/{ctx.hot_code()}", params={"period": "D"}),
+}
+
+# 혼합 트래픽 가중치
+MIX = {"top_stocks": 10, "portfolio": 15, "watchlist": 15, "search": 30, "quote": 20, "chart": 10}
+
+
+# ==================== 측정 ====================
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """최근접 순위 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(p / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0
+    }
+
+
+async def upstream_counts(kis_url: Optional[str]) -> Dict[str, int]:
+    if not kis_url:
+        return {}
+    async with httpx.AsyncClient(base_url=kis_url) as client:
+        return (await client.get("/mock/metrics")).json()["requests"]
+
+
+def diff_counts(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    return {k: v - before.get(k, 0) for k, v in after.items() if v - before.get(k, 0)}
+
+
+async def run_phase(
+    base_url: str,
+    kis_url: Optional[str],
+    ctx: Context,
+    mix: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    warmup: float
+) -> Dict[str, Any]:
+    """동시 사용자 concurrency명이 duration초 동안 쉬지 않고 요청 (closed loop)"""
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    names, weights = list(mix), list(mix.values())
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def user(deadline: float, record: bool):
+            while time.monotonic() < deadline:
+                name = ctx.rng.choices(names, weights=weights)[0]
+                started = time.perf_counter()
+                try:
+                    res = await SCENARIOS[name](client, ctx)
+                    ok = res.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if not record:
+                    continue
+                latencies[name].append(time.perf_counter() - started)
+                if not ok:
+                    errors[name] += 1
+
+        if warmup:
+            await asyncio.gather(*(user(time.monotonic() + warmup, False) for _ in range(concurrency)))
+
+        before = await upstream_counts(kis_url)
+        started = time.monotonic()
+        await asyncio.gather(*(user(started + duration, True) for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+        upstream = diff_counts(before, await upstream_counts(kis_url))
+
+    total = [v for values in latencies.values() for v in values]
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 2),
+        "total": summarize(total, sum(errors.values()), elapsed),
+        "upstream": upstream,
+        "endpoints": {
+            name: summarize(latencies[name], errors[name], elapsed)
+            for name in names if latencies[name]
+        }
+    }
+
+
+# ==================== 준비 ====================
+
+async def prepare(base_url: str, users: int, seed: int) -> Context:
+    """종목 목록 수집 + 벤치마크 사용자 생성 (관심 종목 / 포트폴리오 등록)"""
+    rng = random.Random(seed)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        stocks = []
+        page = 1
+        while True:
+            data = (await client.get("/api/stocks/list", params={"page": page, "limit": 100})).json()
+            stocks.extend(data["stocks"])
+            if len(stocks) >= data["total"] or not data["stocks"]:
+                break
+            page += 1
+
+        run_id = int(time.time())
+        tokens = []
+        for i in range(users):
+            res = await client.post("/api/auth/register", json={
+                "email": f"bench{run_id}_{i}@example.com",
+                "password": "benchmark",
+                "username": f"bench{i}"
+            })
+            res.raise_for_status()
+            token = res.json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            for stock in rng.sample(stocks[:200], 5):
+                await client.post(f"/api/watchlist/{stock['stock_code']}", headers=headers)
+            for stock in rng.sample(stocks[:200], 5):
+                await client.post("/api/portfolio", headers=headers, json={
+                    "stock_code": stock["stock_code"],
+                    "quantity": rng.randint(1, 100),
+                    "avg_price": rng.randint(1, 100) * 1000,
+                    "purchase_date": "2026-01-02"
+                })
+            tokens.append(token)
+
+    return Context(stocks, tokens, seed)
+
+
+async def wait_ready(url: str, path: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(path)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"서버가 준비되지 않았습니다: {url}{path}")
+
+
+def spawn(args: List[str], log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    return subprocess.Popen([sys.executable, "-m", *args], cwd=BACKEND_DIR, stdout=log, stderr=subprocess.STDOUT)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ==================== 비교 ====================
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """p95 지연 시간이나 처리량이 기준보다 threshold 비율 이상 나빠진 항목"""
+    def index(data):
+        return {
+            (phase["phase"], phase["concurrency"], name): stats
+            for phase in data["phases"]
+            for name, stats in [("total", phase["total"]), *phase["endpoints"].items()]
+        }
+
+    base = index(baseline)
+    regressions = []
+    if not base.keys() & index(result).keys():
+        print("\n⚠️ 기준 결과와 겹치는 단계가 없습니다 (--concurrency / --mode 확인)")
+        return regressions
+    print(f"\n{'단계':<22}{'엔드포인트':<12}{'p95 (ms)':>22}{'처리량 (rps)':>24}")
+    for key, stats in index(result).items():
+        if key not in base:
+            continue
+        old = base[key]
+        p95_change = (stats["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        rps_change = (stats["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"] if old["throughput_rps"] else 0.0
+        flag = ""
+        if p95_change > threshold or rps_change < -threshold:
+            flag = "  ⚠️ 회귀"
+            regressions.append(f"{key}: p95 {p95_change:+.0%}, 처리량 {rps_change:+.0%}")
+        phase = f"{key[0]} x{key[1]}"
+        print(
+            f"{phase:<22}{key[2]:<12}"
+            f"{old['p95_ms']:>9.1f} → {stats['p95_ms']:>7.1f} ({p95_change:+.0%})"
+            f"{old['throughput_rps']:>9.1f} → {stats['throughput_rps']:>7.1f} ({rps_change:+.0%}){flag}"
+        )
+    return regressions
+
+
+def print_phase(phase: Dict[str, Any]):
+    total = phase["total"]
+    print(
+        f"\n[{phase['phase']} x{phase['concurrency']}] {total['count']}건, {total['throughput_rps']} rps, "
+        f"p50 {total['p50_ms']}ms / p95 {total['p95_ms']}ms / p99 {total['p99_ms']}ms, "
+        f"오류 {total['errors']}, KIS 호출 {phase['upstream']}"
+    )
+    for name, stats in phase["endpoints"].items():
+        print(
+            f"  {name:<12} {stats['count']:>7}건 {stats['throughput_rps']:>8} rps  "
+            f"p50 {stats['p50_ms']:>8}  p95 {stats['p95_ms']:>8}  p99 {stats['p99_ms']:>8}  오류 {stats['errors']}"
+        )
+
+
+# ==================== 실행 ====================
+
+async def main_async(args) -> int:
+    processes = []
+    workdir = tempfile.mkdtemp(prefix="stock-bench-")
+    base_url, kis_url = args.base_url, args.kis_url
+
+    try:
+        if not base_url:
+            kis_port, api_port = args.port + 1, args.port
+            kis_url = f"http://127.0.0.1:{kis_port}"
+            processes.append(spawn([
+                "mock_kis.http_server", "--port", str(kis_port),
+                "--latency", args.latency, "--rate-limit", str(args.kis_rate_limit)
+            ], os.path.join(workdir, "mock_kis.log")))
+            await wait_ready(kis_url, "/mock/metrics")
+
+            processes.append(spawn([
+                "benchmarks.server", "--workdir", workdir, "--kis-url", kis_url,
+                "--port", str(api_port), "--stocks", str(args.stocks)
+            ], os.path.join(workdir, "backend.log")))
+            base_url = f"http://127.0.0.1:{api_port}"
+            await wait_ready(base_url, "/api/health", timeout=120)
+
+        ctx = await prepare(base_url, args.users, args.seed)
+        print(f"📦 종목 {len(ctx.stocks)}개, 사용자 {len(ctx.tokens)}명 준비 완료")
+
+        phases = []
+        for concurrency in args.concurrency:
+            if args.mode in ("mixed", "both"):
+                phase = await run_phase(base_url, kis_url, ctx, MIX, concurrency, args.duration, args.warmup)
+                phases.append({"phase": "mixed", **phase})
+                print_phase(phases[-1])
+            if args.mode in ("isolated", "both"):
+                for name in MIX:
+                    phase = await run_phase(base_url, kis_url, ctx, {name: 1}, concurrency, args.duration, args.warmup)
+                    phases.append({"phase": f"isolated:{name}", **phase})
+                    print_phase(phases[-1])
+
+        result = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "git_commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "options": {k: v for k, v in vars(args).items() if k not in ("output", "compare")}
+            },
+            "phases": phases
+        }
+
+        output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {output}")
+
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as f:
+                regressions = compare(result, json.load(f), args.threshold)
+            if regressions:
+                print("\n❌ 회귀 발견:\n  " + "\n  ".join(regressions))
+                return 1
+            print("\n✅ 회귀 없음")
+        return 0
+
+    finally:
+        for process in processes[::-1]:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if args.keep_workdir:
+            print(f"📁 작업 디렉토리: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="백엔드 부하 테스트")
+    parser.add_argument("--concurrency", type=lambda s: [int(v) for v in s.split(",")], default=[1, 8, 32],
+                        help="동시 사용자 수 단계 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=5, help="단계별 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=1, help="단계별 예열 시간 (초, 측정 제외)")
+    parser.add_argument("--mode", choices=["mixed", "isolated", "both"], default="both")
+    parser.add_argument("--users", type=int, default=10, help="벤치마크 사용자 수")
+    parser.add_argument("--stocks", type=int, default=3000, help="합성 종목 수")
+    parser.add_argument("--latency", default="lognormal:40,0.5", help="KIS 대역 서버 지연 분포 (ms)")
+    parser.add_argument("--kis-rate-limit", type=float, default=20, help="KIS 대역 서버 초당 호출 한도")
+    parser.add_argument("--port", type=int, default=18000, help="백엔드 포트 (대역 서버는 +1)")
+    parser.add_argument("--base-url", default=None, help="이미 실행 중인 백엔드 주소 (지정 시 서버를 띄우지 않음)")
+    parser.add_argument("--kis-url", default=None, help="--base-url 사용 시 KIS 대역 서버 주소 (호출 수 집계용)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="결과 파일 (기본: benchmarks/results/<시각>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 기준 결과 파일")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 판단할 변화 비율")
+    parser.add_argument("--keep-workdir", action="store_true", help="DB / 로그가 있는 작업 디렉토리 유지")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+벤치마크용 백엔드 실행기
+
+작업 디렉토리에 SQLite DB를 만들어 종목을 채우고, KIS 대역 서버를 바라보도록 설정을 바꾼 뒤 app:app을 띄움.
+토큰 캐시 / 봉 저장소도 작업 디렉토리를 사용하므로 실제 운영 파일을 건드리지 않음
+
+    python -m benchmarks.server --workdir /tmp/bench --kis-url http://127.0.0.1:19443 --port 18000
+"""
+import argparse
+import os
+import random
+
+# 종목 목록 파일을 읽을 수 없을 때 채우는 합성 종목명
+NAME_PREFIXES = ["삼성", "현대", "LG", "SK", "한화", "롯데", "대한", "한국", "신한", "KB", "포스코", "두산", "CJ", "카카오", "셀트리온"]
+NAME_SUFFIXES = ["전자", "화학", "바이오", "건설", "증권", "중공업", "제약", "에너지", "물산", "생명", "화재", "반도체", "디스플레이", "엔터", "홀딩스"]
+
+# 시가총액 상위 종목 조회 대상 중 일부 (합성 종목과 함께 항상 등록)
+KNOWN_STOCKS = [
+    ("005930", "삼성전자"), ("000660", "SK하이닉스"), ("373220", "LG에너지솔루션"),
+    ("207940", "삼성바이오로직스"), ("005935", "삼성전자우"), ("005380", "현대차"),
+    ("105560", "KB금융"), ("000270", "기아"), ("068270", "셀트리온"), ("035420", "NAVER"),
+    ("055550", "신한지주"), ("035720", "카카오"), ("005490", "POSCO홀딩스"), ("051910", "LG화학")
+]
+
+
+def synthetic_stocks(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    stocks = dict(KNOWN_STOCKS)
+    while len(stocks) < count:
+        code = f"{rng.randrange(1, 999999):06d}"
+        name = rng.choice(NAME_PREFIXES) + rng.choice(NAME_SUFFIXES)
+        if rng.random() < 0.3:
+            name += rng.choice(["우", "2우B", f"{rng.randint(1, 9)}호", "리츠", "스팩"])
+        stocks.setdefault(code, name)
+    return list(stocks.items())
+
+
+def seed_database(stock_count: int, stock_file: str):
+    from database import SessionLocal, Stock, init_db
+
+    init_db()
+    db = SessionLocal()
+    try:
+        if db.query(Stock).count():
+            return
+        try:
+            from load_stocks import load_stocks_from_excel
+            if os.path.exists(stock_file):
+                load_stocks_from_excel(stock_file)
+                return
+        except ImportError:
+            pass  # pandas/openpyxl 미설치
+
+        db.add_all(Stock(stock_code=code, stock_name=name) for code, name in synthetic_stocks(stock_count))
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 백엔드 실행기")
+    parser.add_argument("--workdir", required=True)
+    parser.add_argument("--kis-url", required=True, help="KIS 대역 서버 주소")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18000)
+    parser.add_argument("--stocks", type=int, default=3000, help="합성 종목 수 (종목 목록 파일을 읽을 수 없을 때)")
+    parser.add_argument("--stock-file", default="kospi_code_name.xlsx")
+    args = parser.parse_args()
+
+    os.makedirs(args.workdir, exist_ok=True)
+
+    # config 로드 전에 환경변수로 덮어씀 (pydantic-settings는 .env보다 환경변수를 우선)
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(args.workdir, 'bench.db')}",
+        "REAL_URL": args.kis_url,
+        "REAL_APP_KEY": "benchmark-app-key",
+        "REAL_APP_SECRET": "benchmark-app-secret",
+        "DEBUG": "false"
+    })
+
+    seed_database(args.stocks, args.stock_file)
+
+    from services.bar_store import BarStore
+    from services.korea_investment import ki_service
+    # 락 파일도 cache_path 옆에 만들어지므로 운영 토큰 락과 겹치지 않음
+    ki_service.token_manager.cache_path = os.path.join(args.workdir, "kis_token.json")
+    if ki_service.bar_store is not None:
+        ki_service.bar_store.close()
+        ki_service.bar_store = BarStore(os.path.join(args.workdir, "bars.sqlite3"))
+
+    import uvicorn
+    from app import app
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 # pip install sqlalchemy psycopg2-binary alembic
 # python database.py 실행
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, ForeignKey, Text, JSON, Index
+from sqlalchemy import create_engine, event, DDL, Column, Integer, String, DateTime, Boolean, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import DeclarativeBase, sessionmaker, relationship
 from datetime import datetime, timezone
+import time
 import uuid
 from config import get_settings
+from metrics import DB_CHECKOUT_SECONDS, DB_QUERY_SECONDS
+from tracing import record, span
 
 # 설정 로드
 settings = get_settings()
@@ -21,6 +24,27 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# 쿼리 실행 시간 측정 (구문 종류별: SELECT / INSERT / UPDATE / DELETE ...)
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    DB_QUERY_SECONDS.observe(elapsed, statement.lstrip().split(None, 1)[0].upper())
+    record("db", started, elapsed)
+
+
+@event.listens_for(engine, "handle_error")
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
 # SQLAlchemy 2.0 스타일
 class Base(DeclarativeBase):
     pass
@@ -105,10 +129,62 @@ class Portfolio(Base):
     user = relationship("User", back_populates="portfolio")
     stock = relationship("Stock", back_populates="portfolio_items")
 
+# ==================== 뉴스 테이블 ====================
+class News(Base):
+    __tablename__ = "news"
+    
+    news_id = Column(Integer, primary_key=True, autoincrement=True)
+    link_hash = Column(String(64), unique=True, nullable=False)  # 정규화한 링크의 해시
+    title_hash = Column(String(64), nullable=False, index=True)  # 정규화한 제목의 해시
+    title = Column(Text, nullable=False)
+    link = Column(Text, nullable=False)
+    source = Column(String(200), nullable=True)
+    published_at = Column(DateTime, nullable=True, index=True)
+    fetched_at = Column(DateTime, default=utc_now)
+    
+    # 관계 설정
+    stocks = relationship("NewsStock", back_populates="news", cascade="all, delete-orphan")
+
+# ==================== 뉴스-종목 연결 테이블 ====================
+class NewsStock(Base):
+    __tablename__ = "news_stocks"
+    
+    news_id = Column(Integer, ForeignKey("news.news_id", ondelete="CASCADE"), primary_key=True)
+    stock_id = Column(Integer, ForeignKey("stocks.stock_id", ondelete="CASCADE"), primary_key=True, index=True)
+    
+    # 관계 설정
+    news = relationship("News", back_populates="stocks")
+    stock = relationship("Stock")
+
+# 뉴스 전문 검색 인덱스 (SQLite: FTS5 trigram, PostgreSQL: tsvector + GIN)
+for statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5("
+    "title, source, content='news', content_rowid='news_id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS news_fts_insert AFTER INSERT ON news BEGIN "
+    "INSERT INTO news_fts(rowid, title, source) VALUES (new.news_id, new.title, new.source); END",
+    "CREATE TRIGGER IF NOT EXISTS news_fts_delete AFTER DELETE ON news BEGIN "
+    "INSERT INTO news_fts(news_fts, rowid, title, source) VALUES ('delete', old.news_id, old.title, old.source); END",
+    "CREATE TRIGGER IF NOT EXISTS news_fts_update AFTER UPDATE ON news BEGIN "
+    "INSERT INTO news_fts(news_fts, rowid, title, source) VALUES ('delete', old.news_id, old.title, old.source); "
+    "INSERT INTO news_fts(rowid, title, source) VALUES (new.news_id, new.title, new.source); END",
+):
+    event.listen(News.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(News.__table__, "before_drop", DDL("DROP TABLE IF EXISTS news_fts").execute_if(dialect="sqlite"))
+
+for statement in (
+    "ALTER TABLE news ADD COLUMN search_vector tsvector GENERATED ALWAYS AS "
+    "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(source, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_news_search_vector ON news USING GIN (search_vector)",
+):
+    event.listen(News.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
 # ==================== 데이터베이스 세션 ====================
 def get_db():
     db = SessionLocal()
     try:
+        # 커넥션 풀 대기 시간을 재기 위해 세션 시작 시 바로 체크아웃
+        with DB_CHECKOUT_SECONDS.time(), span("db_checkout"):
+            db.connection()
         yield db
     finally:
         db.close()
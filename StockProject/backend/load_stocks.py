@@ -108,6 +108,7 @@ def load_stocks_from_excel(file_path: str):
         print(f"⏭️  건너뜀: {skipped_count}개")
         print(f"❌ 실패: {error_count}개")
         print(f"📈 총 DB 종목 수: {db.query(Stock).count()}개")
+        print("🔎 실행 중인 서버는 STOCK_INDEX_CHECK_INTERVAL(기본 60초) 안에 종목 검색 인덱스를 다시 만듭니다")
         print("="*60)
         
         # 샘플 데이터 출력
@@ -0,0 +1,221 @@
+"""
+Prometheus 텍스트 형식 메트릭
+
+라우트 / KIS 호출 / DB / 뉴스 수집 단계별 지연 시간과 카운터를 프로세스 메모리에 모아 /metrics로 노출.
+캐시 적중률처럼 이미 다른 객체가 집계하고 있는 값은 수집 시점에 콜백으로 읽음
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+# 기본 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+CallbackResult = Union[float, Dict[LabelValues, float]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for values, value in sorted(self._values.items()):
+            yield f"{self.name}_total{_format_labels(self.labels, values)} {_format_value(value)}"
+
+
+class Histogram:
+    """누적 구간 히스토그램 (_bucket / _sum / _count)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, List[float]] = {}  # 구간별 개수..., +Inf 개수, 합계
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(label_values)
+            if counts is None:
+                counts = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, *label_values: str):
+        """블록 실행 시간 기록 (예외가 나도 기록)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def samples(self) -> Iterator[str]:
+        for values, counts in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.labels + ("le",), values + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, values)
+            yield f"{self.name}_sum{labels} {_format_value(counts[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackMetric:
+    """수집 시점에 콜백으로 값을 읽는 메트릭 (다른 객체의 metrics() 값 노출용)"""
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        help: str,
+        callback: Callable[[], CallbackResult],
+        labels: Sequence[str] = ()
+    ):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.labels = tuple(labels)
+        self.callback = callback
+
+    def samples(self) -> Iterator[str]:
+        result = self.callback()
+        if not isinstance(result, dict):
+            result = {(): result}
+        suffix = "_total" if self.kind == "counter" else ""
+        for values, value in sorted(result.items()):
+            yield f"{self.name}{suffix}{_format_labels(self.labels, values)} {_format_value(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def callback(
+        self,
+        name: str,
+        kind: str,
+        help: str,
+        callback: Callable[[], CallbackResult],
+        labels: Sequence[str] = ()
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, kind, help, callback, labels))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            try:
+                samples = list(metric.samples())
+            except Exception as e:  # 콜백 하나가 실패해도 나머지는 노출
+                lines.append(f"# {metric.name} 수집 실패: {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ==================== 공통 메트릭 ====================
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "라우트별 요청 처리 시간 (응답 헤더까지)", ("method", "route", "status")
+)
+
+KIS_REQUEST_SECONDS = REGISTRY.histogram(
+    "kis_request_duration_seconds", "KIS 업스트림 호출 시간 (tr_id별)", ("tr_id",)
+)
+KIS_REQUESTS = REGISTRY.counter(
+    "kis_requests", "KIS 업스트림 호출 수 (result: ok / error / rate_limited / token_expired / transport_error)",
+    ("tr_id", "result")
+)
+KIS_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "kis_queue_wait_seconds", "KIS 호출 한도 대기 시간 (tr_id별)", ("tr_id",)
+)
+
+DB_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "db_pool_checkout_seconds", "DB 커넥션 풀 체크아웃 대기 시간"
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_duration_seconds", "SQL 실행 시간 (구문 종류별)", ("statement",)
+)
+
+NEWS_FETCH_SECONDS = REGISTRY.histogram(
+    "news_fetch_duration_seconds", "뉴스 피드 수집 시간 (피드 종류별)", ("feed",)
+)
+NEWS_FETCH_ERRORS = REGISTRY.counter(
+    "news_fetch_errors", "뉴스 피드 수집 실패 수", ("feed",)
+)
+NEWS_NOT_MODIFIED = REGISTRY.counter(
+    "news_fetch_not_modified", "조건부 요청에 304로 응답받은 뉴스 피드 수집 수", ("feed",)
+)
+NEWS_CACHE_LOOKUPS = REGISTRY.counter(
+    "news_cache_lookups", "뉴스 피드 캐시 조회 수 (fresh / stale: 재검증 중 이전 값 / miss)", ("result",)
+)
@@ -0,0 +1,7 @@
+"""
+한국투자증권 OpenAPI 대역 서버 (실제 계정 없이 백엔드를 실행/부하 테스트하기 위한 용도)
+
+- synthetic.py: 종목 코드로 시드를 고정한 합성 시세 생성기
+- http_server.py: REST API 서버 (토큰 발급, 현재가, 기간별 시세 + 지연/오류 주입)
+- ws_server.py: 실시간 체결가(H0STCNT0) WebSocket 서버
+"""
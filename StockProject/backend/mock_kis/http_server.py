@@ -0,0 +1,390 @@
+"""
+한국투자증권 OpenAPI REST 대역 서버 (오프라인 실행 / 부하 테스트용)
+
+구현 범위:
+    POST /oauth2/tokenP                                            접근토큰 발급
+    POST /oauth2/Approval                                          실시간 접속키 발급
+    GET  /uapi/domestic-stock/v1/quotations/inquire-price          주식현재가 시세 (FHKST01010100)
+    GET  /uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice
+                                                                   기간별 시세 (FHKST03010100)
+    GET  /mock/metrics, POST /mock/expire-tokens                   대역 서버 전용
+
+실행 (backend 디렉토리에서):
+    python -m mock_kis.http_server --port 9443 --latency lognormal:40,0.5 --rate-limit 20
+
+백엔드 config.py 설정:
+    REAL_URL = "http://127.0.0.1:9443"
+
+응답은 기본적으로 합성 시세 생성기로 만들고, --fixtures 디렉토리에 녹화한 KIS 응답(JSON)이 있으면 그대로 돌려줌:
+    {fixtures}/inquire-price/{종목코드}.json
+    {fixtures}/inquire-daily-itemchartprice/{종목코드}_{기간구분}.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import secrets
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from .synthetic import SyntheticMarket, now_kst
+
+QUOTE_TR_ID = "FHKST01010100"
+CHART_TR_ID = "FHKST03010100"
+
+# 오류 응답 (KIS와 같은 msg_cd / 상태코드 500)
+ERROR_RATE_LIMIT = ("EGW00201", "초당 거래건수를 초과하였습니다.")
+ERROR_TOKEN_EXPIRED = ("EGW00123", "기간이 만료된 token 입니다.")
+ERROR_TOKEN_INVALID = ("EGW00121", "유효하지 않은 token 입니다.")
+ERROR_TOKEN_ISSUE = ("EGW00133", "접근토큰 발급 잠시 후 다시 시도하세요(1분당 1회)")
+ERROR_INTERNAL = ("EGW00500", "대역 서버 오류 주입")
+
+# 응답 한 번에 담기는 최대 봉 수
+CHART_MAX_ROWS = 100
+
+SECTORS = ["전기,전자", "화학", "서비스업", "운수장비", "금융업", "철강금속", "의약품", "유통업"]
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    지연 시간 분포 (ms) -> 초 단위 샘플 함수
+
+    fixed:50 / uniform:20,80 / normal:50,10 / lognormal:40,0.5 (중앙값, 시그마)
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",")] if args else []
+    if kind == "none":
+        return lambda: 0.0
+    if kind == "fixed":
+        return lambda: values[0] / 1000
+    if kind == "uniform":
+        return lambda: random.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda: max(random.gauss(values[0], values[1]), 0) / 1000
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda: random.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+def error(code_message, status_code: int = 500) -> JSONResponse:
+    msg_cd, msg1 = code_message
+    return JSONResponse({"rt_cd": "1", "msg_cd": msg_cd, "msg1": msg1}, status_code=status_code)
+
+
+class MockOptions:
+    """대역 서버 동작 설정"""
+
+    def __init__(
+        self,
+        latency: str = "none",
+        rate_limit: float = 20,
+        error_rate: float = 0.0,
+        token_ttl: int = 86400,
+        token_issue_interval: float = 0,
+        fixtures: Optional[str] = None,
+        seed: int = 0
+    ):
+        self.latency = parse_latency(latency)
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.token_ttl = token_ttl
+        self.token_issue_interval = token_issue_interval
+        self.fixtures = fixtures
+        self.seed = seed
+
+
+class MockKIS:
+    """대역 서버 상태 (발급한 토큰, 앱키별 호출 한도, 메트릭)"""
+
+    def __init__(self, options: MockOptions):
+        self.options = options
+        self.market = SyntheticMarket(seed=options.seed)
+        self.tokens: Dict[str, float] = {}  # access_token -> 만료 시각
+        self.last_issued: Dict[str, float] = {}  # appkey -> 마지막 발급 시각
+        self._windows: Dict[str, deque] = defaultdict(deque)  # appkey -> 최근 1초 호출 시각
+        self._w52: Dict[str, tuple] = {}  # 종목코드 -> (52주 최고, 최저)
+
+        # 메트릭
+        self.requests = defaultdict(int)
+        self.errors = defaultdict(int)
+
+    def issue_token(self, appkey: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        if now - self.last_issued.get(appkey, 0) < self.options.token_issue_interval:
+            return None
+        self.last_issued[appkey] = now
+
+        token = secrets.token_urlsafe(32)
+        self.tokens[token] = now + self.options.token_ttl
+        expired_at = now_kst() + timedelta(seconds=self.options.token_ttl)
+        return {
+            "access_token": token,
+            "token_type": "Bearer",
+            "expires_in": self.options.token_ttl,
+            "access_token_token_expired": expired_at.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def check_token(self, authorization: str):
+        """토큰 오류면 (msg_cd, msg1), 정상이면 None"""
+        token = authorization.removeprefix("Bearer ").strip()
+        expires_at = self.tokens.get(token)
+        if expires_at is None:
+            return ERROR_TOKEN_INVALID
+        if time.time() >= expires_at:
+            return ERROR_TOKEN_EXPIRED
+        return None
+
+    def expire_tokens(self):
+        now = time.time()
+        for token in self.tokens:
+            self.tokens[token] = now
+
+    def allow(self, appkey: str) -> bool:
+        """앱키별 초당 호출 한도 (최근 1초 슬라이딩 윈도)"""
+        now = time.monotonic()
+        window = self._windows[appkey]
+        while window and now - window[0] >= 1.0:
+            window.popleft()
+        if len(window) >= self.options.rate_limit:
+            return False
+        window.append(now)
+        return True
+
+    def fixture(self, kind: str, name: str) -> Optional[Dict[str, Any]]:
+        if not self.options.fixtures:
+            return None
+        path = os.path.join(self.options.fixtures, kind, f"{name}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    # ==================== 합성 응답 ====================
+
+    def quote(self, stock_code: str) -> Dict[str, Any]:
+        state = self.market.tick(stock_code)
+        rng = random.Random(f"{self.options.seed}:{stock_code}:fundamentals")
+        eps = max(int(state.prev_close / rng.uniform(5, 40)), 1)
+        bps = int(state.prev_close / rng.uniform(0.5, 3))
+        w52_high, w52_low = self._w52_range(stock_code)
+        output = {
+            "stck_prpr": state.price,
+            "prdy_vrss": state.change,
+            "prdy_vrss_sign": state.sign,
+            "prdy_ctrt": f"{state.change_rate:.2f}",
+            "acml_vol": state.volume,
+            "stck_oprc": state.open,
+            "stck_hgpr": state.high,
+            "stck_lwpr": state.low,
+            "stck_sdpr": state.prev_close,
+            "lstn_stcn": state.listed_shares,
+            "hts_avls": state.price * state.listed_shares // 100_000_000,  # 시가총액 (억원)
+            "per": f"{state.price / eps:.2f}",
+            "pbr": f"{state.price / bps:.2f}",
+            "eps": f"{eps:.2f}",
+            "bps": f"{bps:.2f}",
+            "w52_hgpr": max(w52_high, state.high),
+            "w52_lwpr": min(w52_low, state.low),
+            "bstp_kor_isnm": SECTORS[rng.randrange(len(SECTORS))]
+        }
+        return {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output": {k: str(v) for k, v in output.items()}
+        }
+
+    def _w52_range(self, stock_code: str) -> tuple:
+        if stock_code not in self._w52:
+            today = now_kst()
+            bars = self.market.daily_bars(
+                stock_code,
+                (today - timedelta(days=365)).strftime("%Y%m%d"),
+                today.strftime("%Y%m%d")
+            )
+            self._w52[stock_code] = (max(bar[2] for bar in bars), min(bar[3] for bar in bars))
+        return self._w52[stock_code]
+
+    def chart(self, stock_code: str, start_date: str, end_date: str, period: str) -> Dict[str, Any]:
+        daily = self.market.daily_bars(stock_code, start_date, end_date)
+        bars = daily if period == "D" else aggregate(daily, period)
+        bars = bars[:CHART_MAX_ROWS]
+
+        state = self.market.state(stock_code)
+        output2 = [
+            {
+                "stck_bsop_date": date,
+                "stck_oprc": str(open_),
+                "stck_hgpr": str(high),
+                "stck_lwpr": str(low),
+                "stck_clpr": str(close),
+                "acml_vol": str(volume)
+            }
+            for date, open_, high, low, close, volume in bars
+        ]
+        return {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output1": {
+                "stck_prpr": str(state.price),
+                "prdy_vrss": str(state.change),
+                "prdy_ctrt": f"{state.change_rate:.2f}",
+                "stck_shrn_iscd": stock_code
+            },
+            "output2": output2
+        }
+
+
+def aggregate(daily: List[tuple], period: str) -> List[tuple]:
+    """일봉(최신순) -> 주/월/년봉(최신순), 기준일은 구간의 마지막 거래일"""
+    def bucket(date: str):
+        d = datetime.strptime(date, "%Y%m%d").date()
+        if period == "W":
+            return d.isocalendar()[:2]
+        if period == "M":
+            return d.year, d.month
+        return d.year
+
+    groups: Dict[Any, List[tuple]] = {}
+    for bar in daily:
+        groups.setdefault(bucket(bar[0]), []).append(bar)
+
+    result = []
+    for bars in groups.values():  # 각 그룹도 최신순
+        result.append((
+            bars[0][0],
+            bars[-1][1],
+            max(bar[2] for bar in bars),
+            min(bar[3] for bar in bars),
+            bars[0][4],
+            sum(bar[5] for bar in bars)
+        ))
+    return result
+
+
+def create_app(options: MockOptions) -> FastAPI:
+    app = FastAPI(title="KIS 대역 서버")
+    kis = MockKIS(options)
+    app.state.kis = kis
+
+    async def guard(request: Request, tr_id: str) -> Optional[JSONResponse]:
+        """지연 / 토큰 / 호출 한도 / 오류 주입 (문제가 없으면 None)"""
+        kis.requests[tr_id] += 1
+        await asyncio.sleep(options.latency())
+
+        token_error = kis.check_token(request.headers.get("authorization", ""))
+        if token_error:
+            kis.errors[token_error[0]] += 1
+            return error(token_error)
+        if request.headers.get("tr_id") != tr_id:
+            kis.errors["tr_id"] += 1
+            return error(("OPSQ0002", "tr_id가 올바르지 않습니다."))
+        if not kis.allow(request.headers.get("appkey", "")):
+            kis.errors[ERROR_RATE_LIMIT[0]] += 1
+            return error(ERROR_RATE_LIMIT)
+        if options.error_rate and random.random() < options.error_rate:
+            kis.errors[ERROR_INTERNAL[0]] += 1
+            return error(ERROR_INTERNAL)
+        return None
+
+    @app.post("/oauth2/tokenP")
+    async def issue_token(request: Request):
+        kis.requests["tokenP"] += 1
+        body = await request.json()
+        token = kis.issue_token(body.get("appkey", ""))
+        if token is None:
+            kis.errors[ERROR_TOKEN_ISSUE[0]] += 1
+            return JSONResponse({"error_code": ERROR_TOKEN_ISSUE[0], "error_description": ERROR_TOKEN_ISSUE[1]}, status_code=403)
+        return token
+
+    @app.post("/oauth2/Approval")
+    async def issue_approval_key():
+        kis.requests["Approval"] += 1
+        return {"approval_key": secrets.token_hex(16)}
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-price")
+    async def inquire_price(request: Request, fid_input_iscd: str, fid_cond_mrkt_div_code: str = "J"):
+        rejected = await guard(request, QUOTE_TR_ID)
+        if rejected:
+            return rejected
+        return kis.fixture("inquire-price", fid_input_iscd) or kis.quote(fid_input_iscd)
+
+    @app.get("/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice")
+    async def inquire_daily_chart(
+        request: Request,
+        fid_input_iscd: str,
+        fid_input_date_1: str,
+        fid_input_date_2: str,
+        fid_period_div_code: str = "D",
+        fid_cond_mrkt_div_code: str = "J",
+        fid_org_adj_prc: str = "0"
+    ):
+        rejected = await guard(request, CHART_TR_ID)
+        if rejected:
+            return rejected
+        fixture = kis.fixture("inquire-daily-itemchartprice", f"{fid_input_iscd}_{fid_period_div_code}")
+        if fixture is not None:
+            return fixture
+        return kis.chart(fid_input_iscd, fid_input_date_1, fid_input_date_2, fid_period_div_code)
+
+    @app.get("/mock/metrics")
+    async def metrics():
+        return {
+            "requests": dict(kis.requests),
+            "errors": dict(kis.errors),
+            "tokens": len(kis.tokens)
+        }
+
+    @app.post("/mock/expire-tokens")
+    async def expire_tokens():
+        """발급한 토큰을 모두 만료시킴 (토큰 갱신 테스트용)"""
+        kis.expire_tokens()
+        return {"expired": len(kis.tokens)}
+
+    @app.post("/mock/reset")
+    async def reset():
+        kis.requests.clear()
+        kis.errors.clear()
+        return {"success": True}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="한국투자증권 OpenAPI REST 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--latency", default="none", help="지연 분포 (ms): none / fixed:50 / uniform:20,80 / normal:50,10 / lognormal:40,0.5")
+    parser.add_argument("--rate-limit", type=float, default=20, help="앱키별 초당 호출 한도 (초과 시 EGW00201)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="무작위 500 오류 비율 (0~1)")
+    parser.add_argument("--token-ttl", type=int, default=86400, help="접근토큰 유효 시간 (초, 만료 후 EGW00123)")
+    parser.add_argument("--token-issue-interval", type=float, default=0, help="앱키별 토큰 재발급 최소 간격 (초, KIS: 60)")
+    parser.add_argument("--fixtures", default=None, help="녹화한 응답 디렉토리")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    options = MockOptions(
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        token_ttl=args.token_ttl,
+        token_issue_interval=args.token_issue_interval,
+        fixtures=args.fixtures,
+        seed=args.seed
+    )
+
+    import uvicorn
+    uvicorn.run(create_app(options), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import math
+import random
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+KST = timezone(timedelta(hours=9))
+
+
+def now_kst() -> datetime:
+    return datetime.now(KST)
+
+
+def tick_size(price: int) -> int:
+    """KRX 호가 단위"""
+    if price < 2000:
+        return 1
+    if price < 5000:
+        return 5
+    if price < 20000:
+        return 10
+    if price < 50000:
+        return 50
+    if price < 200000:
+        return 100
+    if price < 500000:
+        return 500
+    return 1000
+
+
+def round_tick(price: float) -> int:
+    price = max(int(price), 1)
+    unit = tick_size(price)
+    return max(price // unit * unit, unit)
+
+
+class SymbolState:
+    """종목 하나의 당일 시세 상태"""
+
+    __slots__ = ("stock_code", "prev_close", "price", "open", "high", "low", "volume", "trade_volume", "listed_shares")
+
+    def __init__(self, stock_code: str, prev_close: int, listed_shares: int):
+        self.stock_code = stock_code
+        self.prev_close = prev_close
+        self.price = prev_close
+        self.open = prev_close
+        self.high = prev_close
+        self.low = prev_close
+        self.volume = 0
+        self.trade_volume = 0
+        self.listed_shares = listed_shares
+
+    @property
+    def change(self) -> int:
+        return self.price - self.prev_close
+
+    @property
+    def change_rate(self) -> float:
+        return round(self.change / self.prev_close * 100, 2)
+
+    @property
+    def sign(self) -> str:
+        """전일 대비 부호 (2: 상승, 3: 보합, 5: 하락)"""
+        if self.change > 0:
+            return "2"
+        if self.change < 0:
+            return "5"
+        return "3"
+
+
+class SyntheticMarket:
+    """
+    합성 시세 생성기 (오프라인 테스트용)
+
+    종목 코드로 시드를 고정해 같은 종목은 항상 같은 기준가/과거 일봉을 만들고,
+    체결은 랜덤 워크로 생성함
+    """
+
+    def __init__(self, seed: int = 0, volatility: float = 0.002):
+        self.seed = seed
+        self.volatility = volatility
+        self._symbols: Dict[str, SymbolState] = {}
+        self._rng = random.Random(seed)
+
+    def _symbol_rng(self, stock_code: str, salt: str = "") -> random.Random:
+        return random.Random(f"{self.seed}:{stock_code}:{salt}")
+
+    def state(self, stock_code: str) -> SymbolState:
+        state = self._symbols.get(stock_code)
+        if state is None:
+            rng = self._symbol_rng(stock_code)
+            state = SymbolState(
+                stock_code,
+                prev_close=round_tick(rng.lognormvariate(10.3, 1.0)),
+                listed_shares=rng.randint(5, 600) * 1_000_000
+            )
+            self._symbols[stock_code] = state
+        return state
+
+    def tick(self, stock_code: str) -> SymbolState:
+        """체결 하나 생성 (가격은 전일 종가 ±30% 안에서 움직임)"""
+        state = self.state(stock_code)
+        step = state.price * self._rng.gauss(0, self.volatility)
+        limit_up = round_tick(state.prev_close * 1.3)
+        limit_down = round_tick(state.prev_close * 0.7)
+        state.price = min(max(round_tick(state.price + step), limit_down), limit_up)
+        state.high = max(state.high, state.price)
+        state.low = min(state.low, state.price)
+        state.trade_volume = self._rng.randint(1, 500)
+        state.volume += state.trade_volume
+        return state
+
+    def _close(self, stock_code: str, day: date) -> int:
+        """날짜별 종가 (이전 날짜에 의존하지 않는 완만한 파동 + 잡음)"""
+        phase = self._symbol_rng(stock_code, "phase").uniform(0, 2 * math.pi)
+        noise = self._symbol_rng(stock_code, day.isoformat()).gauss(0, 0.01)
+        t = day.toordinal()
+        drift = 0.25 * math.sin(t / 60 + phase) + 0.1 * math.sin(t / 17 + 2 * phase)
+        return round_tick(self.state(stock_code).prev_close * math.exp(drift + noise))
+
+    def daily_bars(self, stock_code: str, start_date: str, end_date: str) -> List[tuple]:
+        """
+        과거 일봉 [(YYYYMMDD, 시가, 고가, 저가, 종가, 거래량)] (최신순, 주말 제외)
+
+        날짜만으로 값이 정해지므로 조회 구간이 달라도 같은 날짜는 같은 값
+        """
+        start = datetime.strptime(start_date, "%Y%m%d").date()
+        end = datetime.strptime(end_date, "%Y%m%d").date()
+
+        bars = []
+        day = end
+        while day >= start:
+            if day.weekday() < 5:
+                rng = self._symbol_rng(stock_code, "bar:" + day.isoformat())
+                close = self._close(stock_code, day)
+                open_ = self._close(stock_code, day - timedelta(days=3 if day.weekday() == 0 else 1))
+                high = round_tick(max(open_, close) * (1 + abs(rng.gauss(0, 0.01))))
+                low = round_tick(min(open_, close) * (1 - abs(rng.gauss(0, 0.01))))
+                bars.append((day.strftime("%Y%m%d"), open_, high, low, close, rng.randint(10_000, 5_000_000)))
+            day -= timedelta(days=1)
+        return bars
@@ -0,0 +1,172 @@
+"""
+KIS 실시간 체결가(H0STCNT0) WebSocket 대역 서버 (오프라인 테스트 / 부하 테스트용)
+
+실행 (backend 디렉토리에서):
+    python -m mock_kis.ws_server --port 21000 --rate 2
+
+백엔드 config.py 설정:
+    KIS_WS_URL = "ws://127.0.0.1:21000"
+    KIS_WS_APPROVAL_KEY = "mock"   # oauth2/Approval 호출 생략
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed
+
+from .synthetic import SyntheticMarket, now_kst
+
+logger = logging.getLogger(__name__)
+
+TICK_TR_ID = "H0STCNT0"
+TICK_FIELD_COUNT = 46
+
+
+def tick_record(market: SyntheticMarket, stock_code: str) -> str:
+    """H0STCNT0 레코드 한 건 ('^' 구분 46개 필드, 사용하지 않는 필드는 0)"""
+    state = market.tick(stock_code)
+    fields = ["0"] * TICK_FIELD_COUNT
+    fields[0] = stock_code
+    fields[1] = now_kst().strftime("%H%M%S")
+    fields[2] = str(state.price)
+    fields[3] = state.sign
+    fields[4] = str(state.change)
+    fields[5] = f"{state.change_rate:.2f}"
+    fields[7] = str(state.open)
+    fields[8] = str(state.high)
+    fields[9] = str(state.low)
+    fields[12] = str(state.trade_volume)
+    fields[13] = str(state.volume)
+    return "^".join(fields)
+
+
+def response(tr_id: str, tr_key: str, rt_cd: str, msg_cd: str, msg1: str) -> str:
+    return json.dumps({
+        "header": {"tr_id": tr_id, "tr_key": tr_key, "encrypt": "N"},
+        "body": {"rt_cd": rt_cd, "msg_cd": msg_cd, "msg1": msg1}
+    })
+
+
+class MockRealtimeServer:
+    """
+    연결마다 구독 목록을 관리하고 구독 종목의 합성 체결을 전송
+
+    - rate: 종목당 초당 평균 체결 수 (포아송 도착)
+    - ping_interval: PINGPONG 전송 간격 (초)
+    - drop_after: 지정한 시간(초)이 지나면 연결을 끊음 (재접속 테스트용)
+    - max_subscriptions: 세션당 등록 한도 (KIS: 41건)
+    """
+
+    def __init__(
+        self,
+        market: SyntheticMarket,
+        rate: float = 1.0,
+        ping_interval: float = 10.0,
+        drop_after: float = 0,
+        max_subscriptions: int = 41
+    ):
+        self.market = market
+        self.rate = rate
+        self.ping_interval = ping_interval
+        self.drop_after = drop_after
+        self.max_subscriptions = max_subscriptions
+
+        # 메트릭
+        self.connections = 0
+        self.frames_sent = 0
+
+    async def handler(self, ws):
+        self.connections += 1
+        subscriptions = set()
+        tasks = [
+            asyncio.create_task(self._emit(ws, subscriptions)),
+            asyncio.create_task(self._ping(ws))
+        ]
+        if self.drop_after:
+            tasks.append(asyncio.create_task(self._drop(ws)))
+
+        try:
+            async for message in ws:
+                await self._handle(ws, message, subscriptions)
+        except ConnectionClosed:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _handle(self, ws, message: str, subscriptions: set):
+        data = json.loads(message)
+        header = data.get("header", {})
+        if header.get("tr_id") == "PINGPONG":
+            return
+
+        request = data.get("body", {}).get("input", {})
+        tr_id, tr_key = request.get("tr_id"), request.get("tr_key")
+        if tr_id != TICK_TR_ID or not header.get("approval_key"):
+            await ws.send(response(tr_id, tr_key, "1", "OPSP0003", "invalid request"))
+            return
+
+        if header.get("tr_type") == "2":
+            subscriptions.discard(tr_key)
+            reply = response(tr_id, tr_key, "0", "OPSP0001", "UNSUBSCRIBE SUCCESS")
+        elif len(subscriptions) >= self.max_subscriptions and tr_key not in subscriptions:
+            reply = response(tr_id, tr_key, "1", "OPSP0008", "MAX SUBSCRIBE OVER")
+        else:
+            subscriptions.add(tr_key)
+            reply = response(tr_id, tr_key, "0", "OPSP0000", "SUBSCRIBE SUCCESS")
+        await ws.send(reply)
+
+    async def _emit(self, ws, subscriptions: set):
+        while True:
+            if not subscriptions:
+                await asyncio.sleep(0.1)
+                continue
+            # 전체 구독 종목 기준 포아송 도착 간격
+            await asyncio.sleep(random.expovariate(self.rate * len(subscriptions)))
+            if not subscriptions:
+                continue
+            stock_code = random.choice(tuple(subscriptions))
+            await ws.send(f"0|{TICK_TR_ID}|001|{tick_record(self.market, stock_code)}")
+            self.frames_sent += 1
+
+    async def _ping(self, ws):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            ping = {"header": {"tr_id": "PINGPONG", "datetime": now_kst().strftime("%Y%m%d%H%M%S")}}
+            await ws.send(json.dumps(ping))
+
+    async def _drop(self, ws):
+        await asyncio.sleep(self.drop_after)
+        logger.info("연결 강제 종료 (drop_after)")
+        await ws.close(code=1011, reason="mock drop")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="KIS 실시간 시세 WebSocket 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=21000)
+    parser.add_argument("--rate", type=float, default=1.0, help="종목당 초당 평균 체결 수")
+    parser.add_argument("--ping-interval", type=float, default=10.0, help="PINGPONG 전송 간격 (초)")
+    parser.add_argument("--drop-after", type=float, default=0, help="N초 후 연결 강제 종료 (0: 사용 안 함)")
+    parser.add_argument("--max-subscriptions", type=int, default=41)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = MockRealtimeServer(
+        SyntheticMarket(seed=args.seed),
+        rate=args.rate,
+        ping_interval=args.ping_interval,
+        drop_after=args.drop_after,
+        max_subscriptions=args.max_subscriptions
+    )
+    async with serve(server.handler, args.host, args.port) as ws_server:
+        print(f"🛰️ KIS 실시간 대역 서버: ws://{args.host}:{args.port}")
+        await ws_server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
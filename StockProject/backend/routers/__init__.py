@@ -3,11 +3,17 @@ from .stock_router import router as stock_router
 from .watchlist_router import router as watchlist_router
 from .market_router import router as market_router
 from .portfolio_router import router as portfolio_router
+from .stream_router import router as stream_router
+from .admin_router import router as admin_router
+from .news_router import router as news_router
 
 __all__ = [
     "auth_router",
     "stock_router",
     "watchlist_router",
     "market_router",
-    "portfolio_router"
+    "portfolio_router",
+    "stream_router",
+    "admin_router",
+    "news_router"
 ]
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from typing import Optional
+import hmac
+
+from config import get_settings
+from services.stock_search import stock_search
+from tracing import trace_buffer
+
+router = APIRouter(prefix="/api/admin", tags=["운영"])
+settings = get_settings()
+
+# 운영 API 토큰 (설정하지 않으면 DEBUG 모드에서만 허용)
+ADMIN_TOKEN = getattr(settings, "ADMIN_TOKEN", None)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """X-Admin-Token 헤더 확인"""
+    if ADMIN_TOKEN:
+        if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+            raise HTTPException(status_code=403, detail="운영 API 토큰이 올바르지 않습니다")
+    elif not settings.DEBUG:
+        raise HTTPException(status_code=403, detail="ADMIN_TOKEN을 설정해야 사용할 수 있습니다")
+
+
+@router.get("/traces", dependencies=[Depends(require_admin)])
+async def get_slow_traces(
+    limit: int = Query(50, ge=1, le=500),
+    min_ms: float = Query(0, ge=0, description="최소 처리 시간 (ms)"),
+    route: Optional[str] = Query(None, description="라우트 경로 (예: /api/stock/top-stocks)")
+):
+    """최근 느린 요청의 단계별 시간 (최신순)"""
+    return {
+        "success": True,
+        **trace_buffer.metrics(),
+        "traces": trace_buffer.recent(limit, min_ms, route)
+    }
+
+
+@router.delete("/traces", dependencies=[Depends(require_admin)])
+async def clear_slow_traces():
+    """보관 중인 느린 요청 삭제"""
+    trace_buffer.clear()
+    return {"success": True}
+
+
+@router.post("/stock-index/reload", dependencies=[Depends(require_admin)])
+async def reload_stock_index():
+    """종목 검색 인덱스 즉시 다시 만들기 (load_stocks.py 실행 직후 등)"""
+    index = await stock_search.reload()
+    return {"success": True, "stocks": len(index), "version": index.version}
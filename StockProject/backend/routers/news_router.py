@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import asyncio
+import logging
+
+from services.news_store import search
+
+router = APIRouter(prefix="/api/news", tags=["뉴스"])
+logger = logging.getLogger(__name__)
+
+
+@router.get("/search")
+async def search_news(
+    q: str = Query(..., min_length=1, max_length=100, description="검색어 (공백으로 나눈 단어를 모두 포함)"),
+    stock_code: Optional[str] = Query(None, description="종목코드로 한정"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """
+    저장된 뉴스 검색 (전체 종목, 최신순)
+
+    수집해 둔 뉴스만 검색하며 RSS를 다시 받지 않음
+    """
+    try:
+        news = await asyncio.to_thread(search, q, stock_code, limit, offset)
+        return {
+            "success": True,
+            "query": q,
+            "count": len(news),
+            "news": news
+        }
+    except Exception as e:
+        logger.error(f"뉴스 검색 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -40,6 +40,9 @@ async def get_portfolio(
             .order_by(Portfolio.created_at.desc())\
             .all()
         
+        # 실시간 현재가 동시 조회
+        quotes, errors = await ki_service.get_quotes([item.stock.stock_code for item in portfolio_items])
+        
         result = []
         total_purchase_amount = 0
         total_current_value = 0
@@ -47,12 +50,10 @@ async def get_portfolio(
         for item in portfolio_items:
             stock = item.stock
             
-            # 실시간 현재가 조회
-            try:
-                current_price_data = ki_service.get_current_price(stock.stock_code)
-                current_price = int(current_price_data['output']['stck_prpr'])
-            except Exception as e:
-                logger.error(f"현재가 조회 실패 ({stock.stock_code}): {e}")
+            if stock.stock_code in quotes:
+                current_price = quotes[stock.stock_code].price
+            else:
+                logger.error(f"현재가 조회 실패 ({stock.stock_code}): {errors.get(stock.stock_code)}")
                 current_price = item.avg_price  # 실패 시 평균 매입가 사용
             
             # 계산
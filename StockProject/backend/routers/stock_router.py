@@ -1,64 +1,114 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, case
-from typing import List
+from typing import Optional
+import asyncio
+import logging
 
 from database import get_db, Stock
+from services.stock_master import fetch_page, stream_universe, stock_master
+from services.stock_search import stock_search
 
 router = APIRouter(prefix="/api/stocks", tags=["주식 검색"])
+logger = logging.getLogger(__name__)
 
 @router.get("/list")  # 구체적인 경로를 먼저 등록
 async def list_stocks(
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, le=100),
-    db: Session = Depends(get_db)
+    request: Request,
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (이 종목코드 다음부터)"),
+    page: int = Query(1, ge=1, description="cursor가 없을 때만 사용 (OFFSET 방식이라 뒤 페이지일수록 느림)"),
+    limit: int = Query(20, ge=1, le=100),
+    stream: bool = Query(False, description="전체 종목을 NDJSON 스트림 하나로 (gzip 지원 시 압축)")
 ):
-    """전체 종목 목록 조회"""
-    query = db.query(Stock)
-    total = query.count()
-    stocks = query.offset((page - 1) * limit).limit(limit).all()
+    """
+    전체 종목 목록 조회 (종목코드 순)
+
+    cursor 기반 페이지: 응답의 next_cursor를 다음 요청의 cursor로 넘기면 됨 (마지막 페이지면 null).
+    total은 종목 검색 인덱스의 종목 수를 사용 (종목 마스터가 바뀌면 함께 갱신)
+    """
+    if stream:
+        compress = "gzip" in request.headers.get("accept-encoding", "")
+        headers = {"Vary": "Accept-Encoding"}
+        if compress:
+            headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(stream_universe(compress), media_type="application/x-ndjson", headers=headers)
+    
+    try:
+        index = await stock_search.get_index()
+        if cursor is not None:
+            stocks = await asyncio.to_thread(fetch_page, cursor, limit)
+        else:
+            stocks = await asyncio.to_thread(fetch_page, None, limit, (page - 1) * limit)
+    except Exception as e:
+        logger.error(f"종목 목록 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
     
     return {
         "success": True,
-        "total": total,
-        "page": page,
+        "total": len(index),
+        "page": page if cursor is None else None,
         "limit": limit,
+        "next_cursor": stocks[-1][0] if len(stocks) == limit else None,
         "stocks": [
             {
-                "stock_code": stock.stock_code,
-                "stock_name": stock.stock_name
+                "stock_code": stock_code,
+                "stock_name": stock_name
             }
-            for stock in stocks
+            for stock_code, stock_name in stocks
         ]
     }
 
+@router.get("/master")
+async def get_stock_master(request: Request):
+    """
+    종목 마스터 전체 (종목코드 순 [종목코드, 종목명] 배열, version 포함)
+
+    종목 마스터가 바뀔 때만 새로 만드는 스냅샷을 그대로 전송 (gzip 지원 시 미리 압축한 본문).
+    ETag를 If-None-Match로 보내면 바뀌지 않았을 때 304 - 클라이언트는 한 번 받아서 로컬에서 검색
+    """
+    try:
+        snapshot = await stock_master.get()
+    except Exception as e:
+        logger.error(f"종목 마스터 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {
+        "ETag": snapshot.gzip_etag if compress else snapshot.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if snapshot.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+        return Response(snapshot.gzip_body, media_type="application/json", headers=headers)
+    return Response(snapshot.body, media_type="application/json", headers=headers)
+
+
 @router.get("/search")
 async def search_stocks(
     q: str = Query(..., min_length=1, description="검색어"),
     limit: int = Query(10, le=50, description="결과 개수"),
-    db: Session = Depends(get_db)
+    hangul: bool = Query(True, description="자모 / 초성 검색 (예: 삼성저, ㅅㅅㅈㅈ)"),
+    fuzzy: bool = Query(False, description="오타 검색 (예: NAVR, 삼송전)")
 ):
-    """주식 종목 검색"""
+    """
+    주식 종목 검색
+
+    메모리 검색 인덱스 사용 (종목명 접두 > 종목코드 접두 > 종목명 포함 > 종목코드 포함 순,
+    한글 검색어는 그 뒤에 자모 / 초성 접두 > 포함 순, 오타 검색은 마지막에 편집 거리 순)
+    """
     search_query = q.strip()
     
-    priority = case(
-        (Stock.stock_name.like(f"{search_query}%"), 1),
-        (Stock.stock_code.like(f"{search_query}%"), 2),
-        (Stock.stock_name.like(f"%{search_query}%"), 3),
-        (Stock.stock_code.like(f"%{search_query}%"), 4),
-        else_=5
-    )
-    
-    conditions = or_(
-        Stock.stock_name.like(f"%{search_query}%"),
-        Stock.stock_code.like(f"%{search_query}%")
-    )
+    try:
+        index = await stock_search.get_index()
+    except Exception as e:
+        logger.error(f"종목 검색 인덱스 생성 실패: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
     
-    results = db.query(Stock)\
-        .filter(conditions)\
-        .order_by(priority, Stock.stock_name)\
-        .limit(limit)\
-        .all()
+    results = index.search(search_query, limit, hangul, fuzzy)
     
     return {
         "success": True,
@@ -66,10 +116,10 @@ async def search_stocks(
         "query": search_query,
         "stocks": [
             {
-                "stock_code": stock.stock_code,
-                "stock_name": stock.stock_name
+                "stock_code": stock_code,
+                "stock_name": stock_name
             }
-            for stock in results
+            for stock_code, stock_name in results
         ]
     }
 
@@ -0,0 +1,101 @@
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import List, Tuple
+import asyncio
+import logging
+import re
+
+from services.quote_stream import quote_hub, STREAM_MAX_CODES
+
+router = APIRouter(prefix="/api/stream", tags=["실시간 시세"])
+logger = logging.getLogger(__name__)
+
+STOCK_CODE_PATTERN = re.compile(r"^[0-9A-Z]{6}$")
+
+
+def split_codes(codes) -> Tuple[List[str], List[str]]:
+    """(올바른 종목코드, 잘못된 값)"""
+    if isinstance(codes, str):
+        codes = codes.split(",")
+    valid, invalid = [], []
+    for code in codes or []:
+        code = str(code).strip()
+        if code:
+            (valid if STOCK_CODE_PATTERN.match(code) else invalid).append(code)
+    return valid, invalid
+
+
+@router.websocket("/quotes")
+async def quote_stream(websocket: WebSocket, codes: str = ""):
+    """
+    실시간 시세 WebSocket
+
+    - 요청: {"action": "subscribe" | "unsubscribe", "codes": ["005930", ...]}
+      (접속 URL의 ?codes=005930,000660 으로 처음 구독할 종목 지정 가능)
+    - 응답: {"type": "quote", "stock_code": ..., 바뀐 필드만} (구독 직후에는 전체 필드)
+    """
+    await websocket.accept()
+    session = quote_hub.open()
+
+    async def send_quotes():
+        async for message in session.messages():
+            await websocket.send_text(message)
+
+    sender = asyncio.create_task(send_quotes())
+
+    async def handle(action: str, requested):
+        valid, invalid = split_codes(requested)
+        if action == "subscribe":
+            added = await quote_hub.subscribe(session, valid)
+            await websocket.send_json({
+                "type": "subscribed",
+                "codes": added,
+                "invalid": invalid,
+                "max_codes": STREAM_MAX_CODES
+            })
+        elif action == "unsubscribe":
+            quote_hub.unsubscribe(session, valid)
+            await websocket.send_json({"type": "unsubscribed", "codes": valid})
+        else:
+            await websocket.send_json({"type": "error", "detail": f"알 수 없는 action: {action}"})
+
+    try:
+        if codes:
+            await handle("subscribe", codes)
+        while True:
+            try:
+                request = await websocket.receive_json()
+            except ValueError:
+                await websocket.send_json({"type": "error", "detail": "JSON 형식이 아닙니다"})
+                continue
+            await handle(request.get("action"), request.get("codes"))
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"실시간 시세 연결 오류: {e}")
+    finally:
+        quote_hub.close(session)
+        sender.cancel()
+
+
+@router.get("/quotes")
+async def quote_stream_sse(
+    codes: str = Query(..., description="쉼표로 구분한 종목코드 (예: 005930,000660)")
+):
+    """실시간 시세 SSE (WebSocket을 쓸 수 없는 클라이언트용, 메시지 형식은 같음)"""
+    valid, _ = split_codes(codes)
+    session = quote_hub.open()
+
+    async def events():
+        try:
+            await quote_hub.subscribe(session, valid)
+            async for message in session.messages():
+                yield f"data: {message}\n\n"
+        finally:
+            quote_hub.close(session)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 import logging
 
 from database import get_db, Watchlist, Stock, User
 from auth import get_current_user
+from services.korea_investment import ki_service
 
 router = APIRouter(prefix="/api/watchlist", tags=["관심 종목"])
 logger = logging.getLogger(__name__)
@@ -11,6 +12,7 @@ logger = logging.getLogger(__name__)
 
 @router.get("")
 async def get_watchlist(
+    with_prices: bool = Query(False, description="현재가 포함 여부"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -20,6 +22,12 @@ async def get_watchlist(
         .order_by(Watchlist.added_at.desc())\
         .all()
     
+    quotes = {}
+    if with_prices:
+        quotes, errors = await ki_service.get_quotes([item.stock.stock_code for item in watchlist_items])
+        for stock_code, error in errors.items():
+            logger.error(f"현재가 조회 실패 ({stock_code}): {error}")
+    
     result = []
     for item in watchlist_items:
         stock = item.stock
@@ -32,6 +40,13 @@ async def get_watchlist(
             "alert_enabled": item.alert_enabled,
             "target_price": item.target_price
         })
+        if with_prices:
+            quote = quotes.get(stock.stock_code)
+            result[-1].update({
+                "current_price": quote.price if quote else None,
+                "change": quote.change if quote else None,
+                "change_rate": quote.change_rate if quote else None
+            })
     
     return {
         "success": True,
@@ -1,5 +1,5 @@
 from .user import UserRegister, UserLogin, UserResponse, TokenResponse
-from .stock import StockResponse, StockSearchResponse
+from .stock import StockResponse, StockSearchResponse, QuoteBatchRequest
 
 __all__ = [
     "UserRegister",
@@ -7,5 +7,6 @@ __all__ = [
     "UserResponse",
     "TokenResponse",
     "StockResponse",
-    "StockSearchResponse"
+    "StockSearchResponse",
+    "QuoteBatchRequest"
 ]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List
 
 
@@ -12,3 +12,7 @@ class StockSearchResponse(BaseModel):
     count: int
     query: str
     stocks: List[StockResponse]
+
+
+class QuoteBatchRequest(BaseModel):
+    codes: List[str] = Field(..., min_length=1, max_length=100)
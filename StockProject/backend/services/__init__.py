@@ -1,3 +1,4 @@
 from .korea_investment import KoreaInvestmentService
+from .quote import Quote
 
-__all__ = ["KoreaInvestmentService"]
+__all__ = ["KoreaInvestmentService", "Quote"]
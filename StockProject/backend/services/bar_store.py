@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from .bars import Bars
+
+
+class BarStore:
+    """
+    로컬 OHLCV 저장소 (SQLite)
+
+    (stock_code, period, date)를 키로 봉 데이터를 저장하고, 종목/기간 구분별로
+    업스트림에서 받아 온 구간(first_date ~ synced_to)을 기록해 증분 동기화에 사용
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS bars (
+                stock_code TEXT NOT NULL,
+                period TEXT NOT NULL,
+                date TEXT NOT NULL,
+                open INTEGER NOT NULL,
+                high INTEGER NOT NULL,
+                low INTEGER NOT NULL,
+                close INTEGER NOT NULL,
+                volume INTEGER NOT NULL,
+                PRIMARY KEY (stock_code, period, date)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS bar_sync (
+                stock_code TEXT NOT NULL,
+                period TEXT NOT NULL,
+                first_date TEXT NOT NULL,
+                synced_to TEXT NOT NULL,
+                synced_at REAL NOT NULL,
+                PRIMARY KEY (stock_code, period)
+            ) WITHOUT ROWID;
+        """)
+
+    def coverage(self, stock_code: str, period: str) -> Optional[Tuple[str, str, float]]:
+        """저장된 구간 (first_date, synced_to, synced_at)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT first_date, synced_to, synced_at FROM bar_sync WHERE stock_code = ? AND period = ?",
+                (stock_code, period)
+            ).fetchone()
+
+    def get_bars(self, stock_code: str, period: str, start_date: str, end_date: str) -> Bars:
+        """구간 내 봉 데이터 (날짜 오름차순)"""
+        with self._lock:
+            records = self._conn.execute(
+                "SELECT CAST(date AS INTEGER), open, high, low, close, volume FROM bars "
+                "WHERE stock_code = ? AND period = ? AND date BETWEEN ? AND ? "
+                "ORDER BY date",
+                (stock_code, period, start_date, end_date)
+            ).fetchall()
+        return Bars.from_records(records)
+
+    def replace_range(
+        self,
+        stock_code: str,
+        period: str,
+        start_date: str,
+        end_date: str,
+        bars: Bars
+    ):
+        """
+        구간 [start_date, end_date]의 봉을 업스트림에서 받은 봉으로 교체하고 동기화 구간 갱신
+
+        주/월봉처럼 진행 중인 봉의 기준일이 바뀌는 경우도 구간째 교체하므로 중복이 남지 않음
+        """
+        values = [
+            (stock_code, period, str(date), open_, high, low, close, volume)
+            for date, open_, high, low, close, volume in bars.records()
+        ]
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "DELETE FROM bars WHERE stock_code = ? AND period = ? AND date BETWEEN ? AND ?",
+                    (stock_code, period, start_date, end_date)
+                )
+                self._conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)", values)
+
+                current = self._conn.execute(
+                    "SELECT first_date, synced_to, synced_at FROM bar_sync WHERE stock_code = ? AND period = ?",
+                    (stock_code, period)
+                ).fetchone()
+                if current is None:
+                    first_date, synced_to, synced_at = start_date, end_date, time.time()
+                else:
+                    first_date = min(start_date, current[0])
+                    synced_to = max(end_date, current[1])
+                    # synced_at은 최신 구간(tail)을 받아 온 시각
+                    synced_at = time.time() if end_date >= current[1] else current[2]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO bar_sync VALUES (?, ?, ?, ?, ?)",
+                    (stock_code, period, first_date, synced_to, synced_at)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
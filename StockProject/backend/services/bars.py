@@ -0,0 +1,98 @@
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+# KIS output2 필드 (일자, 시가, 고가, 저가, 종가, 거래량)
+KIS_BAR_FIELDS = ("stck_bsop_date", "stck_oprc", "stck_hgpr", "stck_lwpr", "stck_clpr", "acml_vol")
+
+
+class Bars:
+    """
+    봉 데이터 (컬럼형, 날짜 오름차순)
+
+    dates는 YYYYMMDD int32, 가격/거래량은 int64 배열.
+    KIS 응답은 서비스 계층에서 한 번만 파싱하고 이후에는 이 구조로만 다룸
+    """
+
+    __slots__ = ("dates", "open", "high", "low", "close", "volume")
+
+    def __init__(self, dates, open, high, low, close, volume):
+        self.dates = dates
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def empty(cls) -> "Bars":
+        return cls.from_matrix(np.empty((0, 6), dtype=np.int64))
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> "Bars":
+        """(date, open, high, low, close, volume) 행렬 -> 날짜순 정렬된 Bars"""
+        matrix = matrix[np.argsort(matrix[:, 0], kind="stable")]
+        return cls(
+            matrix[:, 0].astype(np.int32),
+            *(np.ascontiguousarray(matrix[:, i], dtype=np.int64) for i in range(1, 6))
+        )
+
+    @classmethod
+    def from_kis_rows(cls, rows: Iterable[Dict[str, str]]) -> "Bars":
+        """KIS output2 (문자열 dict 목록, 최신순) -> Bars"""
+        values = [
+            tuple(int(row.get(field) or 0) for field in KIS_BAR_FIELDS)
+            for row in rows if row.get("stck_bsop_date")
+        ]
+        if not values:
+            return cls.empty()
+        return cls.from_matrix(np.array(values, dtype=np.int64))
+
+    @classmethod
+    def from_records(cls, records: Sequence[Sequence[int]]) -> "Bars":
+        """(date, open, high, low, close, volume) 튜플 목록 -> Bars"""
+        if not records:
+            return cls.empty()
+        return cls.from_matrix(np.array(records, dtype=np.int64))
+
+    @classmethod
+    def concat(cls, parts: List["Bars"]) -> "Bars":
+        """여러 구간을 합치고 같은 날짜는 하나만 남김 (앞쪽 구간 우선)"""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        matrix = np.concatenate([part.to_matrix() for part in parts])
+        _, first = np.unique(matrix[:, 0], return_index=True)
+        return cls.from_matrix(matrix[first])
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def to_matrix(self) -> np.ndarray:
+        return np.column_stack([getattr(self, name).astype(np.int64) for name in self.__slots__])
+
+    def records(self) -> List[tuple]:
+        """(date, open, high, low, close, volume) 튜플 목록 (저장소 입력용)"""
+        return [tuple(row) for row in self.to_matrix().tolist()]
+
+    def slice(self, start_date: int, end_date: int) -> "Bars":
+        """날짜 구간 [start_date, end_date]"""
+        lo = int(np.searchsorted(self.dates, start_date, side="left"))
+        hi = int(np.searchsorted(self.dates, end_date, side="right"))
+        return Bars(*(getattr(self, name)[lo:hi] for name in self.__slots__))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 컬럼형 dict"""
+        return {
+            "count": len(self),
+            "dates": self.dates.tolist(),
+            "open": self.open.tolist(),
+            "high": self.high.tolist(),
+            "low": self.low.tolist(),
+            "close": self.close.tolist(),
+            "volume": self.volume.tolist()
+        }
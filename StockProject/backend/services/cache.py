@@ -0,0 +1,103 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+def estimate_size(obj: Any) -> int:
+    """JSON 형태 객체(dict/list/str/숫자)와 __slots__ 객체의 대략적인 메모리 사용량 (바이트)"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += estimate_size(k) + estimate_size(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            size += estimate_size(v)
+    elif hasattr(obj, "__slots__"):
+        for name in obj.__slots__:
+            size += estimate_size(getattr(obj, name, None))
+    return size
+
+
+class TTLCache:
+    """
+    LRU + TTL 캐시
+
+    - 항목별 TTL (만료된 항목은 조회 시 제거)
+    - 항목 수(max_entries)와 메모리 예산(max_bytes)을 넘으면 가장 오래 안 쓴 항목부터 제거
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, expires_at, size)
+        self.bytes = 0
+
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float, size: Optional[int] = None):
+        if ttl <= 0:
+            return
+        if key in self._data:
+            self._remove(key)
+
+        size = size if size is not None else estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        self._data[key] = (value, time.monotonic() + ttl, size)
+        self.bytes += size
+
+        while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        if key in self._data:
+            self._remove(key)
+
+    def clear(self):
+        self._data.clear()
+        self.bytes = 0
+
+    def _remove(self, key: Hashable):
+        _, _, size = self._data.pop(key)
+        self.bytes -= size
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -0,0 +1,74 @@
+"""
+한글 자모 분해 (종목 검색용)
+
+완성형 음절을 호환용 자모로 풀어 씀. 겹모음 / 겹받침은 입력 순서대로 더 나눠서
+입력 중인 글자("삼성저", "ㄱㅗ")도 완성된 이름의 앞부분과 비교할 수 있게 함
+"""
+import unicodedata
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSUNG = ["", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+            "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+
+# 겹모음 / 겹받침 -> 입력 순서
+_COMPOUND = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+_CHOSUNG_SET = frozenset(CHOSUNG)
+
+
+def _syllable(ch: str):
+    """완성형 음절이면 (초성, 중성, 종성) 번호, 아니면 None"""
+    code = ord(ch)
+    if _SYLLABLE_BASE <= code <= _SYLLABLE_LAST:
+        index = code - _SYLLABLE_BASE
+        return index // 588, (index % 588) // 28, index % 28
+    return None
+
+
+def normalize(text: str) -> str:
+    """NFC 정규화 + 대소문자 통일 (조합형 자모로 들어온 입력도 완성형으로 맞춤)"""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def to_jamo(text: str) -> str:
+    """'삼성' -> 'ㅅㅏㅁㅅㅓㅇ' (한글이 아닌 글자는 그대로)"""
+    out = []
+    for ch in text:
+        parts = _syllable(ch)
+        if parts is None:
+            out.append(_COMPOUND.get(ch, ch))
+            continue
+        cho, jung, jong = parts
+        out.append(CHOSUNG[cho])
+        out.append(_COMPOUND.get(JUNGSUNG[jung], JUNGSUNG[jung]))
+        if jong:
+            out.append(_COMPOUND.get(JONGSUNG[jong], JONGSUNG[jong]))
+    return "".join(out)
+
+
+def to_chosung(text: str) -> str:
+    """'삼성전자' -> 'ㅅㅅㅈㅈ' (한글이 아닌 글자는 그대로)"""
+    out = []
+    for ch in text:
+        parts = _syllable(ch)
+        out.append(CHOSUNG[parts[0]] if parts is not None else ch)
+    return "".join(out)
+
+
+def has_hangul(text: str) -> bool:
+    """완성형 음절이나 호환용 자모가 있는지"""
+    return any(_syllable(ch) is not None or "ㄱ" <= ch <= "ㆎ" for ch in text)
+
+
+def is_chosung_query(text: str) -> bool:
+    """한글은 초성(자음)만 있는 검색어인지 ('ㅅㅅㅈㅈ', 'skㅎㅇ')"""
+    hangul = [ch for ch in text if _syllable(ch) is not None or "ㄱ" <= ch <= "ㆎ"]
+    return bool(hangul) and all(ch in _CHOSUNG_SET for ch in hangul)
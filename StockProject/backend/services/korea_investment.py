@@ -1,19 +1,83 @@
-import requests
-import json
+import asyncio
+import httpx
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable, AsyncIterator
 from config import get_settings
+from metrics import KIS_QUEUE_WAIT_SECONDS, KIS_REQUEST_SECONDS, KIS_REQUESTS
+from tracing import span
+from utils import KST, CLOSE_SETTLED, now_kst, is_price_settling, is_trading_day, seconds_until_next_open
+from .token_manager import TokenManager
+from .rate_limiter import RequestScheduler, PRIORITY_INTERACTIVE
+from .singleflight import SingleFlight
+from .cache import TTLCache
+from .quote import Quote
+from .bar_store import BarStore
+from .bars import Bars
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# HTTP/2는 h2 패키지가 설치된 경우에만 사용
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 커넥션 풀 / 타임아웃 설정 (config에 없으면 기본값 사용)
+KIS_MAX_CONNECTIONS = getattr(settings, "KIS_MAX_CONNECTIONS", 100)
+KIS_MAX_KEEPALIVE = getattr(settings, "KIS_MAX_KEEPALIVE", 20)
+KIS_KEEPALIVE_EXPIRY = getattr(settings, "KIS_KEEPALIVE_EXPIRY", 30.0)
+KIS_TIMEOUT = getattr(settings, "KIS_TIMEOUT", 10.0)
+KIS_CONNECT_TIMEOUT = getattr(settings, "KIS_CONNECT_TIMEOUT", 5.0)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 토큰 캐시 파일 (같은 호스트의 워커 / stockDashBoard.py 공유)
+KIS_TOKEN_CACHE_PATH = getattr(settings, "KIS_TOKEN_CACHE_PATH", os.path.join(BACKEND_DIR, ".kis_token.json"))
+KIS_TOKEN_REFRESH_MARGIN = getattr(settings, "KIS_TOKEN_REFRESH_MARGIN", 3600)
+
+# 호출 한도 (앱키 전체 초당 호출 수, tr_id별 초당 호출 수, 대기열 마감 시간)
+KIS_RATE_LIMIT = getattr(settings, "KIS_RATE_LIMIT", 18)
+KIS_TR_RATE_LIMITS = getattr(settings, "KIS_TR_RATE_LIMITS", {})
+KIS_QUEUE_TIMEOUT = getattr(settings, "KIS_QUEUE_TIMEOUT", 10.0)
+# 여러 종목 동시 조회 시 최대 동시 요청 수
+KIS_BATCH_CONCURRENCY = getattr(settings, "KIS_BATCH_CONCURRENCY", 10)
+
+# 응답 캐시 (항목 수 / 메모리 예산, 장중 TTL, 과거 일봉 TTL)
+KIS_CACHE_MAX_ENTRIES = getattr(settings, "KIS_CACHE_MAX_ENTRIES", 10000)
+KIS_CACHE_MAX_BYTES = getattr(settings, "KIS_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+KIS_QUOTE_TTL = getattr(settings, "KIS_QUOTE_TTL", 3)
+KIS_CHART_TTL = getattr(settings, "KIS_CHART_TTL", 60)
+KIS_HISTORY_TTL = getattr(settings, "KIS_HISTORY_TTL", 7 * 24 * 3600)
+
+# 로컬 봉 데이터 저장소 (None이면 사용하지 않음)
+KIS_BAR_STORE_PATH = getattr(settings, "KIS_BAR_STORE_PATH", os.path.join(BACKEND_DIR, "bars.sqlite3"))
+
+QUOTE_TR_ID = "FHKST01010100"  # 주식현재가 시세
+CHART_TR_ID = "FHKST03010100"  # 기간별 시세 (일/주/월/년)
+
+# 기간 구분별 기본 조회 기간 / 응답 한 번(최대 약 100건)에 담기는 구간 (일)
+CHART_PERIOD_DAYS = {"D": 30, "W": 90, "M": 365, "Y": 365 * 3}
+CHART_WINDOW_DAYS = {"D": 130, "W": 650, "M": 2900, "Y": 36500}
+
+# 실시간 시세 WebSocket 접속키 (설정하면 oauth2/Approval을 호출하지 않음, 대역 서버용)
+KIS_WS_APPROVAL_KEY = getattr(settings, "KIS_WS_APPROVAL_KEY", None)
+
+# 초당 거래건수 초과 응답 코드
+RATE_LIMIT_ERROR_CODE = "EGW00201"
+
+# 만료/무효 토큰 응답 코드 (EGW00123: 기간 만료, EGW00121: 유효하지 않은 토큰)
+TOKEN_ERROR_CODES = {"EGW00123", "EGW00121"}
+
 
 class KoreaInvestmentService:
-    """한국투자증권 OpenAPI 서비스"""
-    
+    """한국투자증권 OpenAPI 서비스 (비동기)"""
+
     def __init__(self):
-        self.access_token: Optional[str] = None
         self.config = {
             'REAL_APP_KEY': settings.REAL_APP_KEY,
             'REAL_APP_SECRET': settings.REAL_APP_SECRET,
@@ -21,134 +85,292 @@ class KoreaInvestmentService:
             'REAL_CANO': settings.REAL_CANO,
             'REAL_ACNT_PRDT_CD': settings.REAL_ACNT_PRDT_CD
         }
-    
-    def get_access_token(self) -> Optional[str]:
-        """토큰 발급"""
+        self._client: Optional[httpx.AsyncClient] = None
+        self.token_manager = TokenManager(
+            self._issue_token,
+            cache_path=KIS_TOKEN_CACHE_PATH,
+            app_key=self.config['REAL_APP_KEY'],
+            refresh_margin=KIS_TOKEN_REFRESH_MARGIN
+        )
+        self.scheduler = RequestScheduler(
+            global_rate=KIS_RATE_LIMIT,
+            tr_rates=KIS_TR_RATE_LIMITS,
+            default_timeout=KIS_QUEUE_TIMEOUT
+        )
+        self.inflight = SingleFlight()
+        self.cache = TTLCache(max_entries=KIS_CACHE_MAX_ENTRIES, max_bytes=KIS_CACHE_MAX_BYTES)
+        self.bar_store = BarStore(KIS_BAR_STORE_PATH) if KIS_BAR_STORE_PATH else None
+        self._approval_key: Optional[str] = KIS_WS_APPROVAL_KEY
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.token_manager.access_token
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """keep-alive 커넥션 풀을 공유하는 HTTP 클라이언트 (지연 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.config['REAL_URL'],
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=KIS_MAX_CONNECTIONS,
+                    max_keepalive_connections=KIS_MAX_KEEPALIVE,
+                    keepalive_expiry=KIS_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(KIS_TIMEOUT, connect=KIS_CONNECT_TIMEOUT)
+            )
+        return self._client
+
+    async def aclose(self):
+        """커넥션 풀 종료"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def _issue_token(self) -> Dict[str, Any]:
+        """oauth2/tokenP 호출 (TokenManager가 사용)"""
         headers = {"content-type": "application/json"}
         body = {
             "grant_type": "client_credentials",
             "appkey": self.config['REAL_APP_KEY'],
             "appsecret": self.config['REAL_APP_SECRET']
         }
-        
+
         PATH = "oauth2/tokenP"
-        URL = f"{self.config['REAL_URL']}/{PATH}"
-        
+
+        logger.info(f"🔑 토큰 발급 시도: {self.config['REAL_URL']}/{PATH}")
+        res = await self.client.post(f"/{PATH}", headers=headers, json=body)
+
+        if res.status_code == 200:
+            logger.info("✅ 토큰 발급 성공")
+            return res.json()
+        raise Exception(f"토큰 발급 실패 - 상태코드: {res.status_code}")
+
+    async def get_approval_key(self, refresh: bool = False) -> str:
+        """실시간 시세 WebSocket 접속키 (oauth2/Approval, 한 번 발급받아 재사용)"""
+        if self._approval_key and not (refresh and not KIS_WS_APPROVAL_KEY):
+            return self._approval_key
+
+        headers = {"content-type": "application/json"}
+        body = {
+            "grant_type": "client_credentials",
+            "appkey": self.config['REAL_APP_KEY'],
+            "secretkey": self.config['REAL_APP_SECRET']
+        }
+
+        PATH = "oauth2/Approval"
+        res = await self.client.post(f"/{PATH}", headers=headers, json=body)
+        if res.status_code != 200:
+            raise Exception(f"실시간 접속키 발급 실패 - 상태코드: {res.status_code}")
+
+        self._approval_key = res.json()["approval_key"]
+        logger.info("✅ 실시간 접속키 발급 성공")
+        return self._approval_key
+
+    async def get_access_token(self) -> Optional[str]:
+        """토큰 준비 (공유 캐시에 유효한 토큰이 있으면 재사용)"""
         try:
-            logger.info(f"🔑 토큰 발급 시도: {URL}")
-            res = requests.post(URL, headers=headers, data=json.dumps(body), timeout=10)
-            
-            if res.status_code == 200:
-                self.access_token = res.json()["access_token"]
-                logger.info("✅ 토큰 발급 성공")
+            if self.token_manager.load_cached():
+                logger.info("✅ 공유 토큰 캐시 사용")
                 return self.access_token
-            else:
-                logger.error(f"❌ 토큰 발급 실패 - 상태코드: {res.status_code}")
-                return None
-        
+            return await self.token_manager.get_token()
         except Exception as e:
             logger.error(f"❌ 토큰 발급 오류: {e}")
             return None
-    
-    def ensure_token(self) -> str:
-        """토큰이 없으면 발급"""
-        if not self.access_token:
-            token = self.get_access_token()
-            if not token:
-                raise Exception("토큰 발급 실패")
-        return self.access_token
-    
-    def get_current_price(self, stock_code: str) -> Dict[str, Any]:
-        """현재가 조회"""
-        self.ensure_token()
-        
-        headers = {
-            "content-type": "application/json",
-            "authorization": f"Bearer {self.access_token}",
-            "appkey": self.config['REAL_APP_KEY'],
-            "appsecret": self.config['REAL_APP_SECRET'],
-            "tr_id": "FHKST01010100"
-        }
-        
+
+    async def ensure_token(self) -> str:
+        """유효한 토큰 반환 (만료 임박 시 백그라운드 갱신)"""
+        try:
+            return await self.token_manager.get_token()
+        except Exception as e:
+            raise Exception(f"토큰 발급 실패: {e}")
+
+    @staticmethod
+    def _error_code(res: httpx.Response) -> Optional[str]:
+        """실패 응답의 msg_cd (401은 토큰 오류로 취급)"""
+        if res.status_code == 200:
+            return None
+        if res.status_code == 401:
+            return "EGW00123"
+        try:
+            return res.json().get("msg_cd")
+        except ValueError:
+            return None
+
+    async def _get(
+        self,
+        path: str,
+        tr_id: str,
+        params: Dict[str, str],
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> httpx.Response:
+        """
+        시세 조회 공통 GET 요청
+
+        호출 한도 스케줄러를 거쳐 전송하며, 토큰 만료나 초당 거래건수 초과 응답이면 1회 재시도
+        """
+        for attempt in range(2):
+            with KIS_QUEUE_WAIT_SECONDS.time(tr_id), span("kis_queue"):
+                await self.scheduler.acquire(tr_id, priority)
+            token = await self.ensure_token()
+
+            headers = {
+                "content-type": "application/json",
+                "authorization": f"Bearer {token}",
+                "appkey": self.config['REAL_APP_KEY'],
+                "appsecret": self.config['REAL_APP_SECRET'],
+                "tr_id": tr_id
+            }
+
+            try:
+                with KIS_REQUEST_SECONDS.time(tr_id), span("kis"):
+                    res = await self.client.get(f"/{path}", headers=headers, params=params)
+            except httpx.HTTPError:
+                KIS_REQUESTS.inc(tr_id, "transport_error")
+                raise
+            error_code = self._error_code(res)
+            KIS_REQUESTS.inc(tr_id, _request_result(res, error_code))
+            if attempt == 0 and error_code in TOKEN_ERROR_CODES:
+                logger.warning("⚠️ 토큰 만료 응답 - 갱신 후 재시도")
+                await self.token_manager.refresh(bad_token=token)
+                continue
+            if attempt == 0 and error_code == RATE_LIMIT_ERROR_CODE:
+                logger.warning(f"⚠️ 호출 한도 초과 응답 ({tr_id}) - 재시도")
+                await asyncio.sleep(1 / self.scheduler.global_bucket.rate)
+                continue
+            return res
+
+    async def _fetch_json(
+        self,
+        path: str,
+        tr_id: str,
+        params: Dict[str, str],
+        priority: int = PRIORITY_INTERACTIVE,
+        error_message: str = "API 호출 실패",
+        parse: Optional[Callable[[Dict[str, str], Dict[str, Any]], Any]] = None
+    ) -> Any:
+        """
+        GET 후 JSON(또는 parse(params, json) 결과) 반환
+
+        정상 응답은 장 운영시간에 맞춘 TTL로 캐시하고, (tr_id, params)가 같은 동시 호출은
+        하나의 업스트림 요청과 파싱 결과를 공유함. 반환값은 호출자끼리 공유되므로 수정하지 말 것
+        """
+        key = (tr_id, tuple(sorted(params.items())), parse)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def fetch():
+            res = await self._get(path, tr_id, params, priority)
+            if res.status_code != 200:
+                raise Exception(f"{error_message}: {res.status_code}")
+            data = res.json()
+            if parse is not None:
+                result = parse(params, data)  # 실패 응답이면 예외 (캐시하지 않음)
+            elif data.get('rt_cd') == '0':
+                result = data
+            else:
+                return data
+            self.cache.set(key, result, self._cache_ttl(tr_id, params))
+            return result
+
+        with span("kis_wait"):
+            return await self.inflight.do(key, fetch)
+
+    @staticmethod
+    def _cache_ttl(tr_id: str, params: Dict[str, str]) -> float:
+        """
+        캐시 TTL (초)
+
+        - 오늘 이전에 끝나는 차트 구간: 과거 일봉은 바뀌지 않으므로 긴 TTL
+        - 장중 / 종가 확정 전(15:40까지): 시세는 수 초, 차트는 수십 초
+        - 종가 확정 후 / 휴장일: 다음 장 시작까지
+        """
+        now = now_kst()
+        if tr_id == CHART_TR_ID and params.get("fid_input_date_2", "") < now.strftime("%Y%m%d"):
+            return KIS_HISTORY_TTL
+        if is_price_settling(now):
+            return KIS_CHART_TTL if tr_id == CHART_TR_ID else KIS_QUOTE_TTL
+        return seconds_until_next_open(now)
+
+    async def get_quote(
+        self,
+        stock_code: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Quote:
+        """현재가 조회 (시가총액, 투자지표 포함)"""
         params = {
             "fid_cond_mrkt_div_code": "J",
             "fid_input_iscd": stock_code
         }
-        
+
         PATH = "uapi/domestic-stock/v1/quotations/inquire-price"
-        URL = f"{self.config['REAL_URL']}/{PATH}"
-        
-        res = requests.get(URL, headers=headers, params=params, timeout=10)
-        
-        if res.status_code == 200:
-            return res.json()
-        else:
-            raise Exception(f"API 호출 실패: {res.status_code}")
-    # 추가    
-    def get_stock_info(self, stock_code: str) -> Dict[str, Any]:
-        """
-        종목 기본 정보 조회 (시가총액 포함)
-        """
-        self.ensure_token()
-        
-        headers = {
-            "content-type": "application/json",
-            "authorization": f"Bearer {self.access_token}",
-            "appkey": self.config['REAL_APP_KEY'],
-            "appsecret": self.config['REAL_APP_SECRET'],
-            "tr_id": "FHKST01010100"  # 주식현재가 시세
-        }
-        
+        return await self._fetch_json(PATH, QUOTE_TR_ID, params, priority, parse=_parse_quote)
+
+    async def get_current_price_raw(self, stock_code: str) -> Dict[str, Any]:
+        """현재가 원본 응답 조회 (디버그용)"""
         params = {
             "fid_cond_mrkt_div_code": "J",
             "fid_input_iscd": stock_code
         }
-        
+
         PATH = "uapi/domestic-stock/v1/quotations/inquire-price"
-        URL = f"{self.config['REAL_URL']}/{PATH}"
-        
-        res = requests.get(URL, headers=headers, params=params, timeout=10)
-        
-        if res.status_code == 200:
-            data = res.json()
-            if data['rt_cd'] == '0':
-                output = data['output']
-                # 시가총액 계산: 현재가 * 상장주식수
-                current_price = int(output['stck_prpr'])
-                listed_shares = int(output.get('lstn_stcn', 0))  # 상장주식수
-                market_cap = current_price * listed_shares if listed_shares > 0 else 0
-                
-                return {
-                    'stock_code': stock_code,
-                    'current_price': current_price,
-                    'change': int(output['prdy_vrss']),
-                    'change_rate': float(output['prdy_ctrt']),
-                    'volume': int(output['acml_vol']),
-                    'market_cap': market_cap,  # 시가총액 (원)
-                    'listed_shares': listed_shares,  # 상장주식수
-                    'per': output.get('per', '0'),
-                    'pbr': output.get('pbr', '0')
-                }
-        
-        raise Exception(f"API 호출 실패: {res.status_code}")
-
-    def get_stock_chart(self, stock_code: str, period: str = "D") -> Dict[str, Any]:
-        """차트 데이터 조회"""
-        self.ensure_token()
-        
-        headers = {
-            "content-type": "application/json",
-            "authorization": f"Bearer {self.access_token}",
-            "appkey": self.config['REAL_APP_KEY'],
-            "appsecret": self.config['REAL_APP_SECRET'],
-            "tr_id": "FHKST03010100"
-        }
-        
-        end_date = datetime.now().strftime("%Y%m%d")
-        period_days = {"D": 30, "W": 90, "M": 365, "Y": 365 * 3}
-        days = period_days.get(period, 30)
-        start_date = (datetime.now() - timedelta(days=days)).strftime("%Y%m%d")
-        
+        return await self._fetch_json(PATH, QUOTE_TR_ID, params)
+
+    async def get_quotes(
+        self,
+        stock_codes: List[str],
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Tuple[Dict[str, Quote], Dict[str, str]]:
+        """
+        여러 종목 시세 동시 조회
+
+        호출 한도 안에서 최대 KIS_BATCH_CONCURRENCY개씩 병렬로 조회하며,
+        일부 종목이 실패해도 나머지 결과는 반환함
+
+        Returns:
+            (종목코드별 Quote, 종목코드별 오류 메시지)
+        """
+        semaphore = asyncio.Semaphore(KIS_BATCH_CONCURRENCY)
+        quotes: Dict[str, Quote] = {}
+        errors: Dict[str, str] = {}
+
+        async def fetch(stock_code: str):
+            async with semaphore:
+                try:
+                    quotes[stock_code] = await self.get_quote(stock_code, priority)
+                except Exception as e:
+                    errors[stock_code] = str(e)
+
+        await asyncio.gather(*(fetch(code) for code in dict.fromkeys(stock_codes)))
+        return quotes, errors
+
+    @staticmethod
+    def _chart_windows(period: str, start_date: str, end_date: str) -> List[Tuple[str, str]]:
+        """
+        조회 구간을 응답 한 번(약 100건)에 담기는 창으로 분할 (최신 구간부터)
+        """
+        span = timedelta(days=CHART_WINDOW_DAYS.get(period, CHART_WINDOW_DAYS["D"]))
+        start = datetime.strptime(start_date, "%Y%m%d")
+        window_end = datetime.strptime(end_date, "%Y%m%d")
+
+        windows = []
+        while window_end >= start:
+            window_start = max(start, window_end - span + timedelta(days=1))
+            windows.append((window_start.strftime("%Y%m%d"), window_end.strftime("%Y%m%d")))
+            window_end = window_start - timedelta(days=1)
+        return windows
+
+    async def _fetch_chart_window(
+        self,
+        stock_code: str,
+        period: str,
+        start_date: str,
+        end_date: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Bars:
+        """차트 한 구간 조회"""
         params = {
             "fid_cond_mrkt_div_code": "J",
             "fid_input_iscd": stock_code,
@@ -157,16 +379,150 @@ class KoreaInvestmentService:
             "fid_period_div_code": period,
             "fid_org_adj_prc": "0"
         }
-        
+
         PATH = "uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
-        URL = f"{self.config['REAL_URL']}/{PATH}"
-        
-        res = requests.get(URL, headers=headers, params=params, timeout=10)
-        
-        if res.status_code == 200:
-            return res.json()
+        return await self._fetch_json(PATH, CHART_TR_ID, params, priority, "차트 조회 실패", _parse_chart)
+
+    @staticmethod
+    def _chart_range(period: str, start_date: Optional[str], end_date: Optional[str]) -> Tuple[str, str]:
+        """조회 구간 기본값 (종료일: 오늘, 시작일: 기간 구분별 기본 조회 기간)"""
+        end_date = end_date or now_kst().strftime("%Y%m%d")
+        if not start_date:
+            days = CHART_PERIOD_DAYS.get(period, CHART_PERIOD_DAYS["D"])
+            start_date = (datetime.strptime(end_date, "%Y%m%d") - timedelta(days=days)).strftime("%Y%m%d")
+        return start_date, end_date
+
+    async def iter_stock_chart(
+        self,
+        stock_code: str,
+        period: str = "D",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> AsyncIterator[Bars]:
+        """
+        구간별 차트 데이터 스트리밍
+
+        모든 구간을 호출 한도 안에서 동시에 요청하고, 최신 구간부터 순서대로
+        이미 내보낸 날짜를 뺀 Bars를 내보냄
+        """
+        start_date, end_date = self._chart_range(period, start_date, end_date)
+        semaphore = asyncio.Semaphore(KIS_BATCH_CONCURRENCY)
+
+        async def fetch(window: Tuple[str, str]):
+            async with semaphore:
+                return await self._fetch_chart_window(stock_code, period, *window, priority)
+
+        tasks = [
+            asyncio.ensure_future(fetch(window))
+            for window in self._chart_windows(period, start_date, end_date)
+        ]
+        oldest = None
+        try:
+            for task in tasks:
+                bars = await task
+                if oldest is not None:
+                    bars = bars.slice(0, oldest - 1)
+                if len(bars):
+                    oldest = int(bars.dates[0])
+                yield bars
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_chart_bars(
+        self,
+        stock_code: str,
+        period: str,
+        start_date: str,
+        end_date: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Bars:
+        """업스트림에서 구간 전체를 받아 하나의 Bars로 합침"""
+        parts = [
+            bars async for bars in self.iter_stock_chart(stock_code, period, start_date, end_date, priority)
+        ]
+        return Bars.concat(parts)
+
+    async def _sync_bars(
+        self,
+        stock_code: str,
+        period: str,
+        start_date: str,
+        end_date: str,
+        priority: int = PRIORITY_INTERACTIVE
+    ):
+        """
+        요청 구간이 로컬 저장소에 모두 있도록 빠진 부분만 업스트림에서 받아 저장
+
+        - 저장된 구간보다 과거: first_date 이전 구간만 조회
+        - 저장된 구간보다 최신: synced_to부터 조회 (마지막 봉이 미완성일 수 있으므로 포함)
+        - 오늘 봉은 종가 확정 후 동기화되기 전까지 KIS_CHART_TTL 간격으로 갱신
+        """
+        coverage = self.bar_store.coverage(stock_code, period)
+        if coverage is None:
+            gaps = [(start_date, end_date)]
         else:
-            raise Exception(f"차트 조회 실패: {res.status_code}")
+            first_date, synced_to, synced_at = coverage
+            gaps = []
+            if start_date < first_date:
+                head_end = (datetime.strptime(first_date, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+                gaps.append((start_date, head_end))
+
+            now = now_kst()
+            today = now.strftime("%Y%m%d")
+            settled_at = datetime.combine(now.date(), CLOSE_SETTLED, tzinfo=KST).timestamp()
+            today_final = not is_trading_day(now.date()) or synced_at >= settled_at
+            stale = time.time() - synced_at >= KIS_CHART_TTL
+            if end_date > synced_to or (end_date >= today and not today_final and stale):
+                gaps.append((synced_to, max(end_date, synced_to)))
+
+        for gap_start, gap_end in gaps:
+            bars = await self._fetch_chart_bars(stock_code, period, gap_start, gap_end, priority)
+            self.bar_store.replace_range(stock_code, period, gap_start, gap_end, bars)
+
+    async def get_stock_chart(
+        self,
+        stock_code: str,
+        period: str = "D",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Bars:
+        """
+        차트 데이터 조회 (날짜 오름차순 Bars)
+
+        로컬 봉 저장소에 없는 구간만 업스트림에서 받아 채운 뒤 저장소에서 읽음.
+        KIS는 응답 한 번에 약 100건까지만 주므로 긴 구간은 나눠서 동시에 받음
+        """
+        start_date, end_date = self._chart_range(period, start_date, end_date)
+
+        if self.bar_store is None:
+            return await self._fetch_chart_bars(stock_code, period, start_date, end_date, priority)
+
+        key = ("bar_sync", stock_code, period, start_date, end_date)
+        await self.inflight.do(key, lambda: self._sync_bars(stock_code, period, start_date, end_date, priority))
+        with span("bar_store"):
+            return self.bar_store.get_bars(stock_code, period, start_date, end_date)
+
+
+def _request_result(res: httpx.Response, error_code: Optional[str]) -> str:
+    """kis_requests 메트릭의 result 라벨"""
+    if error_code in TOKEN_ERROR_CODES:
+        return "token_expired"
+    if error_code == RATE_LIMIT_ERROR_CODE:
+        return "rate_limited"
+    return "ok" if res.status_code == 200 else "error"
+
+
+def _parse_chart(params: Dict[str, str], data: Dict[str, Any]) -> Bars:
+    if data.get('rt_cd') != '0':
+        raise Exception(f"차트 조회 실패: {data.get('msg1', data.get('rt_cd'))}")
+    return Bars.from_kis_rows(data.get('output2') or [])
+
+
+def _parse_quote(params: Dict[str, str], data: Dict[str, Any]) -> Quote:
+    return Quote.from_response(params["fid_input_iscd"], data)
 
 
 # 싱글톤 인스턴스
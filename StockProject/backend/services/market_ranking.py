@@ -0,0 +1,204 @@
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config import get_settings
+from database import SessionLocal, Stock
+from utils import is_price_settling, seconds_until_next_open
+from .korea_investment import ki_service
+from .quote import Quote
+from .rate_limiter import PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 전체 종목 시세를 다시 훑는 간격 (초, 장중)
+TOP_STOCKS_REFRESH_INTERVAL = getattr(settings, "TOP_STOCKS_REFRESH_INTERVAL", 300)
+# 한 번에 조회하는 종목 수 (조회할 때마다 스냅샷 갱신)
+TOP_STOCKS_CHUNK_SIZE = getattr(settings, "TOP_STOCKS_CHUNK_SIZE", 50)
+# 스냅샷에 담는 최대 순위
+TOP_STOCKS_SIZE = getattr(settings, "TOP_STOCKS_SIZE", 50)
+
+# 서버 시작 직후 첫 스냅샷을 빨리 만들기 위해 먼저 조회하는 종목 (2025년 10월 코스피 시가총액 상위)
+SEED_CODES = [
+    '005930', '000660', '373220', '207940', '005935', '012450', '329180', '005380', '105560', '034020',
+    '000270', '068270', '035420', '055550', '042660', '028260', '032830', '402340', '009540', '012330',
+    '035720', '086790', '015760', '005490', '051910', '267260', '011200', '287410', '066570', '096770'
+]
+
+
+def format_market_cap(market_cap: int) -> str:
+    """시가총액을 읽기 쉽게 포맷팅"""
+    if market_cap >= 1_000_000_000_000:
+        return f"{market_cap / 1_000_000_000_000:.1f}조원"
+    elif market_cap >= 100_000_000:
+        return f"{market_cap / 100_000_000:.0f}억원"
+    else:
+        return f"{market_cap:,}원"
+
+
+class RankingSnapshot:
+    """
+    시가총액 순위 스냅샷
+
+    종목별 JSON은 만들 때 한 번만 직렬화해 두고, 요청 시에는 limit개를 이어 붙이고 경과 시간만 채움
+    """
+
+    __slots__ = ("created_at", "as_of", "priced", "total", "_items")
+
+    def __init__(self, ranked: List[Tuple[str, Quote]], priced: int, total: int):
+        self.created_at = time.time()
+        self.as_of = datetime.fromtimestamp(self.created_at, timezone.utc).isoformat()
+        self.priced = priced
+        self.total = total
+        self._items = [
+            json.dumps({
+                "rank": rank,
+                "stock_code": quote.stock_code,
+                "stock_name": name,
+                "current_price": quote.price,
+                "change": quote.change,
+                "change_rate": quote.change_rate,
+                "volume": quote.volume,
+                "market_cap": quote.market_cap,
+                "market_cap_formatted": format_market_cap(quote.market_cap)
+            }, ensure_ascii=False).encode()
+            for rank, (name, quote) in enumerate(ranked, start=1)
+        ]
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+    def body(self, limit: int) -> bytes:
+        """응답 본문 (JSON)"""
+        items = self._items[:limit]
+        head = {
+            "success": True,
+            "as_of": self.as_of,
+            "age_seconds": round(self.age, 1),
+            "coverage": {"priced": self.priced, "total": self.total},
+            "count": len(items)
+        }
+        return b"".join((json.dumps(head)[:-1].encode(), b',"stocks":[', b",".join(items), b"]}"))
+
+
+class MarketCapRanking:
+    """
+    시가총액 순위 백그라운드 계산
+
+    - stocks 테이블의 전체 종목을 TOP_STOCKS_CHUNK_SIZE개씩 백그라운드 우선순위로 조회
+      (대화형 요청이 호출 한도를 먼저 씀)
+    - 조회할 때마다 지금까지 받은 시세로 스냅샷을 다시 만듦
+    - 다음 조회는 직전 시가총액이 큰 종목부터 (첫 조회는 SEED_CODES부터)
+    - 장중에는 TOP_STOCKS_REFRESH_INTERVAL마다, 장 마감 후에는 종가 반영 뒤 다음 장 시작까지 쉼
+    """
+
+    def __init__(self):
+        self.snapshot: Optional[RankingSnapshot] = None
+        self._quotes: Dict[str, Quote] = {}
+        self._names: Dict[str, str] = {}
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.sweeps = 0
+        self.last_sweep_seconds: Optional[float] = None
+        self.errors = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def wait_ready(self, timeout: float) -> Optional[RankingSnapshot]:
+        """첫 스냅샷이 만들어질 때까지 대기 (시간 초과 시 None)"""
+        if self.snapshot is None:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self.snapshot
+
+    @staticmethod
+    def _load_universe() -> Dict[str, str]:
+        db = SessionLocal()
+        try:
+            return dict(db.query(Stock.stock_code, Stock.stock_name).all())
+        finally:
+            db.close()
+
+    def _sweep_order(self) -> List[str]:
+        """직전 시가총액이 큰 종목부터 (시세가 없는 종목은 SEED_CODES, 나머지 순)"""
+        seed = [code for code in SEED_CODES if code in self._names and code not in self._quotes]
+        priced = sorted(self._quotes, key=lambda code: self._quotes[code].market_cap or 0, reverse=True)
+        ordered = set(seed)
+        rest = [code for code in self._names if code not in self._quotes and code not in ordered]
+        return seed + priced + rest
+
+    async def sweep(self):
+        """전체 종목 시세 한 바퀴 조회"""
+        started = time.monotonic()
+        self._names = await asyncio.to_thread(self._load_universe)
+        self._quotes = {code: q for code, q in self._quotes.items() if code in self._names}
+
+        order = self._sweep_order()
+        for i in range(0, len(order), TOP_STOCKS_CHUNK_SIZE):
+            quotes, errors = await ki_service.get_quotes(order[i:i + TOP_STOCKS_CHUNK_SIZE], PRIORITY_BACKGROUND)
+            self._quotes.update(quotes)
+            self.errors += len(errors)
+            self._publish()
+
+        self._publish()
+        self.sweeps += 1
+        self.last_sweep_seconds = round(time.monotonic() - started, 2)
+        logger.info(f"📊 시가총액 순위 갱신: {len(self._quotes)}/{len(self._names)}종목, {self.last_sweep_seconds}초")
+
+    def _publish(self):
+        ranked = sorted(self._quotes.values(), key=lambda q: q.market_cap or 0, reverse=True)[:TOP_STOCKS_SIZE]
+        self.snapshot = RankingSnapshot(
+            [(self._names[q.stock_code], q) for q in ranked],
+            priced=len(self._quotes),
+            total=len(self._names)
+        )
+        self._ready.set()
+
+    async def _loop(self):
+        while True:
+            settling = is_price_settling()
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"❌ 시가총액 순위 갱신 실패: {e}")
+
+            # 종가 확정 전에 시작한 조회가 끝났으면 한 번 더 (확정된 종가 반영)
+            if settling or is_price_settling():
+                await asyncio.sleep(TOP_STOCKS_REFRESH_INTERVAL)
+            else:
+                await asyncio.sleep(max(seconds_until_next_open(), TOP_STOCKS_REFRESH_INTERVAL))
+
+    def metrics(self) -> Dict[str, object]:
+        snapshot = self.snapshot
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "sweeps": self.sweeps,
+            "last_sweep_seconds": self.last_sweep_seconds,
+            "errors": self.errors,
+            "priced": len(self._quotes),
+            "universe": len(self._names),
+            "snapshot_age": round(snapshot.age, 1) if snapshot else None
+        }
+
+
+top_stock_ranking = MarketCapRanking()
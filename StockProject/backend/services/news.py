@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+import feedparser
+import httpx
+
+from config import get_settings
+from metrics import NEWS_CACHE_LOOKUPS, NEWS_FETCH_ERRORS, NEWS_FETCH_SECONDS, NEWS_NOT_MODIFIED
+from tracing import span
+from .news_store import NEWS_STORE_ENABLED, save_items
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 피드 캐시 (이 시간 안에는 그대로 사용, 지나면 이전 값을 주면서 백그라운드 재검증, 초)
+NEWS_TTL = getattr(settings, "NEWS_TTL", 300)
+# 이 시간이 지난 캐시는 재검증이 끝날 때까지 기다림 (초)
+NEWS_STALE_TTL = getattr(settings, "NEWS_STALE_TTL", 3600)
+NEWS_CACHE_MAX_FEEDS = getattr(settings, "NEWS_CACHE_MAX_FEEDS", 2000)
+NEWS_TIMEOUT = getattr(settings, "NEWS_TIMEOUT", 10.0)
+NEWS_MAX_CONNECTIONS = getattr(settings, "NEWS_MAX_CONNECTIONS", 20)
+
+GOOGLE_NEWS_RSS = "https://news.google.com/rss/search"
+
+
+def stock_news_url(stock_name: str) -> str:
+    return f"{GOOGLE_NEWS_RSS}?q={quote(stock_name)}+{quote('주식')}&hl=ko&gl=KR&ceid=KR:ko"
+
+
+def market_news_url() -> str:
+    return f"{GOOGLE_NEWS_RSS}?q={quote('코스피 주식시장')}&hl=ko&gl=KR&ceid=KR:ko"
+
+
+def parse_feed(content: bytes) -> List[Dict[str, str]]:
+    """RSS 본문 -> 뉴스 목록 (이벤트 루프 밖에서 실행)"""
+    feed = feedparser.parse(content)
+    if feed.get("bozo") and not feed.entries:
+        raise ValueError(f"피드 파싱 실패: {feed.get('bozo_exception')}")
+    return [
+        {
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'published': entry.get('published', ''),
+            'source': entry.get('source', {}).get('title', 'Unknown')
+        }
+        for entry in feed.entries
+    ]
+
+
+class CachedFeed:
+    __slots__ = ("items", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, items: List[Dict[str, str]], etag: Optional[str], last_modified: Optional[str]):
+        self.items = items
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class NewsFetcher:
+    """
+    뉴스 RSS 비동기 수집기
+
+    - keep-alive 커넥션 풀을 공유하는 httpx 클라이언트로 수집하고 파싱은 스레드에서 실행
+    - ETag / Last-Modified로 조건부 요청 (304면 캐시 그대로 연장)
+    - NEWS_TTL 안에는 캐시만 사용, NEWS_STALE_TTL 안에는 캐시를 바로 주고 백그라운드에서 재검증
+    - 같은 피드의 동시 수집은 하나로 합침. 반환한 목록은 호출자끼리 공유하므로 수정하지 말 것
+    - 새로 받은 피드는 news 테이블에 저장 (stock_id를 주면 종목과 연결, 저장 실패는 수집 결과에 영향 없음)
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._feeds: "OrderedDict[str, CachedFeed]" = OrderedDict()
+        self.inflight = SingleFlight()
+        self._background: Set[asyncio.Task] = set()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=NEWS_MAX_CONNECTIONS),
+                timeout=NEWS_TIMEOUT,
+                headers={"user-agent": "Mozilla/5.0 (StockDashboard news fetcher)"}
+            )
+        return self._client
+
+    async def aclose(self):
+        for task in self._background:
+            task.cancel()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    def cached(self, url: str) -> Optional[CachedFeed]:
+        return self._feeds.get(url)
+
+    async def get(
+        self,
+        url: str,
+        feed_name: str,
+        stock_id: Optional[int] = None
+    ) -> Tuple[List[Dict[str, str]], float]:
+        """
+        피드 뉴스 목록 조회
+
+        Returns:
+            (뉴스 목록, 캐시 경과 시간(초))
+        """
+        cached = self._feeds.get(url)
+        if cached is not None and cached.age < NEWS_TTL:
+            NEWS_CACHE_LOOKUPS.inc("fresh")
+            self._feeds.move_to_end(url)
+            return cached.items, cached.age
+
+        if cached is not None and cached.age < NEWS_STALE_TTL:
+            NEWS_CACHE_LOOKUPS.inc("stale")
+            self._feeds.move_to_end(url)
+            self.revalidate(url, feed_name, stock_id)
+            return cached.items, cached.age
+
+        NEWS_CACHE_LOOKUPS.inc("miss")
+        try:
+            feed = await self.refresh(url, feed_name, stock_id)
+        except Exception:
+            if cached is None:
+                raise
+            logger.warning(f"⚠️ 뉴스 수집 실패 - 오래된 캐시 사용 ({feed_name})")
+            return cached.items, cached.age
+        return feed.items, feed.age
+
+    async def refresh(self, url: str, feed_name: str, stock_id: Optional[int] = None) -> CachedFeed:
+        """캐시와 관계없이 다시 수집 (같은 피드를 수집 중이면 합쳐짐)"""
+        return await self.inflight.do(url, lambda: self._fetch(url, feed_name, stock_id))
+
+    def revalidate(self, url: str, feed_name: str, stock_id: Optional[int] = None):
+        """백그라운드 재검증"""
+        task = asyncio.create_task(self.refresh(url, feed_name, stock_id))
+        self._background.add(task)
+        task.add_done_callback(self._revalidated)
+
+    def _revalidated(self, task: asyncio.Task):
+        self._background.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"⚠️ 뉴스 백그라운드 갱신 실패: {task.exception()}")
+
+    async def _fetch(self, url: str, feed_name: str, stock_id: Optional[int]) -> CachedFeed:
+        cached = self._feeds.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["if-none-match"] = cached.etag
+            if cached.last_modified:
+                headers["if-modified-since"] = cached.last_modified
+
+        try:
+            with NEWS_FETCH_SECONDS.time(feed_name), span("news"):
+                res = await self.client.get(url, headers=headers)
+                modified = not (res.status_code == 304 and cached is not None)
+                if not modified:
+                    NEWS_NOT_MODIFIED.inc(feed_name)
+                    feed = CachedFeed(cached.items, cached.etag, cached.last_modified)
+                else:
+                    res.raise_for_status()
+                    with span("news_parse"):
+                        items = await asyncio.to_thread(parse_feed, res.content)
+                    feed = CachedFeed(items, res.headers.get("etag"), res.headers.get("last-modified"))
+        except Exception:
+            NEWS_FETCH_ERRORS.inc(feed_name)
+            raise
+
+        self._store(url, feed)
+        if NEWS_STORE_ENABLED and modified:
+            await self._persist(feed.items, stock_id)
+        return feed
+
+    async def _persist(self, items: List[Dict[str, str]], stock_id: Optional[int]):
+        try:
+            with span("news_store"):
+                await asyncio.to_thread(save_items, items, stock_id)
+        except Exception as e:
+            logger.warning(f"⚠️ 뉴스 저장 실패: {e}")
+
+    def _store(self, url: str, feed: CachedFeed):
+        self._feeds[url] = feed
+        self._feeds.move_to_end(url)
+        while len(self._feeds) > NEWS_CACHE_MAX_FEEDS:
+            self._feeds.popitem(last=False)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "feeds": len(self._feeds),
+            "revalidating": len(self._background),
+            **self.inflight.metrics()
+        }
+
+
+news_fetcher = NewsFetcher()
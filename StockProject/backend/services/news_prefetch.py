@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from config import get_settings
+from database import SessionLocal, Stock, Watchlist, Portfolio, SearchHistory
+from utils import utc_now
+from .news import NEWS_TTL, news_fetcher, stock_news_url, market_news_url
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 인기 종목 뉴스 미리 수집 사용 여부
+NEWS_PREFETCH_ENABLED = getattr(settings, "NEWS_PREFETCH_ENABLED", True)
+# 한 바퀴 주기 (초) - 이 안에 만료될 피드만 다시 수집
+NEWS_PREFETCH_INTERVAL = getattr(settings, "NEWS_PREFETCH_INTERVAL", NEWS_TTL)
+# 한 바퀴에 보낼 수 있는 최대 요청 수 (Google News 호출 예산)
+NEWS_PREFETCH_BUDGET = getattr(settings, "NEWS_PREFETCH_BUDGET", 60)
+# 미리 수집할 인기 종목 수
+NEWS_PREFETCH_STOCKS = getattr(settings, "NEWS_PREFETCH_STOCKS", 100)
+# 검색 기록 반영 기간 (일)
+NEWS_PREFETCH_SEARCH_DAYS = getattr(settings, "NEWS_PREFETCH_SEARCH_DAYS", 7)
+
+# 인기 점수 가중치 (관심 종목 / 보유 종목 / 최근 검색 1건당)
+HOT_WEIGHTS = {"watchlist": 3.0, "portfolio": 2.0, "search": 1.0}
+
+
+def hot_stocks(limit: int) -> List[Tuple[int, str, str]]:
+    """관심 종목 / 포트폴리오 / 최근 검색 기록으로 매긴 인기 종목 [(종목 ID, 종목코드, 종목명)] (점수 내림차순)"""
+    since = utc_now() - timedelta(days=NEWS_PREFETCH_SEARCH_DAYS)
+    db = SessionLocal()
+    try:
+        scores: Dict[int, float] = {}
+        sources = [
+            (HOT_WEIGHTS["watchlist"], db.query(Watchlist.stock_id, func.count()).group_by(Watchlist.stock_id)),
+            (HOT_WEIGHTS["portfolio"], db.query(Portfolio.stock_id, func.count()).group_by(Portfolio.stock_id)),
+            (HOT_WEIGHTS["search"], db.query(SearchHistory.stock_id, func.count())
+                .filter(SearchHistory.searched_at >= since)
+                .group_by(SearchHistory.stock_id)),
+        ]
+        for weight, query in sources:
+            for stock_id, count in query.all():
+                scores[stock_id] = scores.get(stock_id, 0.0) + weight * count
+
+        top_ids = sorted(scores, key=scores.get, reverse=True)[:limit]
+        if not top_ids:
+            return []
+        names = {
+            row[0]: tuple(row)
+            for row in db.query(Stock.stock_id, Stock.stock_code, Stock.stock_name)
+                .filter(Stock.stock_id.in_(top_ids))
+        }
+        return [names[stock_id] for stock_id in top_ids if stock_id in names]
+    finally:
+        db.close()
+
+
+class NewsPrefetcher:
+    """
+    인기 종목 뉴스 미리 수집
+
+    - NEWS_PREFETCH_INTERVAL마다 인기 종목(관심 종목, 보유 종목, 최근 검색)을 다시 계산
+    - 다음 바퀴 전에 캐시가 만료될 피드만 골라 오래된 순(처음 보는 피드 먼저, 같으면 인기 순)으로
+      최대 NEWS_PREFETCH_BUDGET개 수집 (예산을 넘는 피드는 가장 오래된 채로 남아 다음 바퀴에 먼저 수집됨)
+    - 한꺼번에 보내지 않고 주기 안에 고르게 나눠 보냄
+    - 조건부 요청을 쓰므로 바뀌지 않은 피드는 304로 끝남
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.passes = 0
+        self.fetched = 0
+        self.skipped = 0
+        self.deferred = 0
+        self.errors = 0
+        self.hot = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @staticmethod
+    def _age(url: str) -> float:
+        """캐시된 피드의 나이 (초, 수집한 적 없으면 무한대)"""
+        cached = news_fetcher.cached(url)
+        return float("inf") if cached is None else cached.age
+
+    async def run_once(self):
+        started = time.monotonic()
+        stocks = await asyncio.to_thread(hot_stocks, NEWS_PREFETCH_STOCKS)
+        self.hot = len(stocks)
+
+        feeds = [(market_news_url(), "market", None)] + [
+            (stock_news_url(name), "stock", stock_id) for stock_id, _, name in stocks
+        ]
+        ages = {url: self._age(url) for url, _, _ in feeds}
+        # 다음 바퀴 전에 만료되는 피드를 오래된 순으로 (정렬이 안정적이므로 같은 나이는 인기 순 유지)
+        due = sorted(
+            (feed for feed in feeds if ages[feed[0]] + NEWS_PREFETCH_INTERVAL >= NEWS_TTL),
+            key=lambda feed: -ages[feed[0]]
+        )
+        todo = due[:NEWS_PREFETCH_BUDGET]
+        self.skipped += len(feeds) - len(due)
+        self.deferred += len(due) - len(todo)
+
+        # i번째 요청은 주기의 i/len(todo) 지점에 보냄
+        gap = NEWS_PREFETCH_INTERVAL / len(todo) if todo else 0
+        for i, (url, feed_name, stock_id) in enumerate(todo):
+            await asyncio.sleep(max(started + i * gap - time.monotonic(), 0))
+            try:
+                await news_fetcher.refresh(url, feed_name, stock_id)
+                self.fetched += 1
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"⚠️ 뉴스 미리 수집 실패: {e}")
+
+        self.passes += 1
+
+    async def _loop(self):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"❌ 뉴스 미리 수집 오류: {e}")
+            await asyncio.sleep(max(NEWS_PREFETCH_INTERVAL - (time.monotonic() - started), 1))
+
+    def metrics(self) -> Dict[str, object]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "passes": self.passes,
+            "hot_stocks": self.hot,
+            "fetched": self.fetched,
+            "skipped": self.skipped,
+            "deferred": self.deferred,
+            "errors": self.errors
+        }
+
+
+news_prefetcher = NewsPrefetcher()
@@ -0,0 +1,213 @@
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from sqlalchemy import or_, text
+from sqlalchemy.exc import IntegrityError
+
+from config import get_settings
+from database import SessionLocal, News, NewsStock, Stock, engine
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 수집한 뉴스를 news 테이블에 저장할지
+NEWS_STORE_ENABLED = getattr(settings, "NEWS_STORE_ENABLED", True)
+
+# 링크 비교 시 버리는 추적/지역 파라미터
+_IGNORED_PARAMS = {"oc", "hl", "gl", "ceid", "fbclid", "gclid"}
+# Google News 제목 끝의 " - 언론사"
+_SOURCE_SUFFIX = re.compile(r"\s+[-–|]\s+[^-–|]+$")
+_SPACES = re.compile(r"\s+")
+# FTS5 trigram은 3글자 이상 검색어만 인덱스를 탐
+_FTS_MIN_TOKEN = 3
+
+
+def normalize_link(link: str) -> str:
+    """스킴, 추적 파라미터, #fragment를 뺀 비교용 링크"""
+    parts = urlsplit(link.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in _IGNORED_PARAMS
+    )
+    path = parts.path.rstrip("/")
+    return f"{parts.netloc.lower()}{path}" + (f"?{urlencode(query)}" if query else "")
+
+
+def normalize_title(title: str, source: Optional[str] = None) -> str:
+    """언론사 꼬리표와 공백 차이를 없앤 비교용 제목"""
+    title = unicodedata.normalize("NFKC", title).strip()
+    if source and title.endswith(source):
+        title = title[:-len(source)].rstrip(" -–|")
+    else:
+        title = _SOURCE_SUFFIX.sub("", title)
+    return _SPACES.sub(" ", title).strip().lower()
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def _parse_published(value: str):
+    """RSS 발행 시각 (RFC 822) -> UTC naive datetime"""
+    if not value:
+        return None
+    try:
+        published = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if published.tzinfo is not None:
+        published = published.astimezone(timezone.utc).replace(tzinfo=None)
+    return published
+
+
+def save_items(items: List[Dict[str, str]], stock_id: Optional[int] = None) -> int:
+    """
+    뉴스 저장 (스레드에서 실행)
+
+    정규화한 링크 또는 제목이 같은 뉴스는 한 건으로 보고 종목 연결만 추가
+
+    Returns:
+        새로 저장한 뉴스 수
+    """
+    if not items:
+        return 0
+
+    rows = {}
+    titles = set()
+    for item in items:
+        if not item.get("link") or not item.get("title"):
+            continue
+        link_hash = _hash(normalize_link(item["link"]))
+        title_hash = _hash(normalize_title(item["title"], item.get("source")))
+        if link_hash not in rows and title_hash not in titles:
+            rows[link_hash] = (item, title_hash)
+            titles.add(title_hash)
+    if not rows:
+        return 0
+
+    db = SessionLocal()
+    try:
+        existing = db.query(News.news_id, News.link_hash, News.title_hash).filter(
+            or_(News.link_hash.in_(list(rows)), News.title_hash.in_(list(titles)))
+        ).all()
+        by_link = {link_hash: news_id for news_id, link_hash, _ in existing}
+        by_title = {title_hash: news_id for news_id, _, title_hash in existing}
+
+        news_ids = []
+        created = 0
+        for link_hash, (item, title_hash) in rows.items():
+            news_id = by_link.get(link_hash) or by_title.get(title_hash)
+            if news_id is None:
+                news = News(
+                    link_hash=link_hash,
+                    title_hash=title_hash,
+                    title=item["title"],
+                    link=item["link"],
+                    source=(item.get("source") or None),
+                    published_at=_parse_published(item.get("published", ""))
+                )
+                db.add(news)
+                db.flush()
+                news_id = news.news_id
+                created += 1
+            news_ids.append(news_id)
+
+        if stock_id is not None and news_ids:
+            linked = {
+                news_id for (news_id,) in db.query(NewsStock.news_id).filter(
+                    NewsStock.stock_id == stock_id, NewsStock.news_id.in_(news_ids)
+                )
+            }
+            db.add_all(
+                NewsStock(news_id=news_id, stock_id=stock_id)
+                for news_id in dict.fromkeys(news_ids) if news_id not in linked
+            )
+
+        db.commit()
+        return created
+    except IntegrityError as e:
+        # 다른 수집과 동시에 같은 뉴스를 저장한 경우 - 다음 수집 때 다시 연결됨
+        db.rollback()
+        logger.warning(f"⚠️ 뉴스 저장 충돌: {e.orig}")
+        return 0
+    finally:
+        db.close()
+
+
+def _fts_query(tokens: List[str]) -> str:
+    """FTS5 MATCH 식 (각 검색어를 문자열로 감싸 연산자로 해석되지 않게 함)"""
+    return " AND ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+
+
+def search(
+    query: str,
+    stock_code: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    저장된 뉴스 전문 검색 (최신순)
+
+    - SQLite: FTS5 trigram 인덱스 (3글자 미만 검색어는 LIKE로 거름)
+    - PostgreSQL: search_vector(tsvector) GIN 인덱스, 검색어별 접두 일치
+    - 그 외: LIKE
+    """
+    tokens = [token for token in _SPACES.split(query.strip()) if token]
+    if not tokens:
+        return []
+
+    db = SessionLocal()
+    try:
+        q = db.query(News)
+        dialect = engine.dialect.name
+        long_tokens = [token for token in tokens if len(token) >= _FTS_MIN_TOKEN]
+        like_tokens = tokens
+
+        if dialect == "sqlite" and long_tokens:
+            q = q.filter(News.news_id.in_(
+                text("SELECT rowid FROM news_fts WHERE news_fts MATCH :match").bindparams(match=_fts_query(long_tokens))
+            ))
+            like_tokens = [token for token in tokens if len(token) < _FTS_MIN_TOKEN]
+        elif dialect == "postgresql":
+            terms = " & ".join(re.sub(r"[^\w]", "", token) + ":*" for token in tokens if re.sub(r"[^\w]", "", token))
+            if terms:
+                q = q.filter(text("news.search_vector @@ to_tsquery('simple', :terms)").bindparams(terms=terms))
+                like_tokens = []
+
+        for token in like_tokens:
+            pattern = f"%{token}%"
+            q = q.filter(or_(News.title.ilike(pattern), News.source.ilike(pattern)))
+
+        if stock_code:
+            q = q.join(NewsStock, NewsStock.news_id == News.news_id) \
+                .join(Stock, Stock.stock_id == NewsStock.stock_id) \
+                .filter(Stock.stock_code == stock_code)
+
+        rows = q.order_by(News.published_at.desc(), News.news_id.desc()).offset(offset).limit(limit).all()
+
+        codes: Dict[int, List[str]] = {}
+        if rows:
+            for news_id, code in db.query(NewsStock.news_id, Stock.stock_code) \
+                    .join(Stock, Stock.stock_id == NewsStock.stock_id) \
+                    .filter(NewsStock.news_id.in_([row.news_id for row in rows])):
+                codes.setdefault(news_id, []).append(code)
+
+        return [
+            {
+                "news_id": row.news_id,
+                "title": row.title,
+                "link": row.link,
+                "source": row.source,
+                "published": row.published_at.isoformat() if row.published_at else None,
+                "stock_codes": codes.get(row.news_id, [])
+            }
+            for row in rows
+        ]
+    finally:
+        db.close()
@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional
+
+
+def _int(value: Optional[str]) -> int:
+    """KIS 숫자 문자열 -> int (빈 값은 0)"""
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        return int(float(value))
+
+
+def _float(value: Optional[str]) -> float:
+    """KIS 숫자 문자열 -> float (빈 값은 0.0)"""
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+class Quote:
+    """주식현재가 시세 (inquire-price 응답을 한 번만 파싱해 모든 라우터가 공유)"""
+
+    __slots__ = (
+        "stock_code", "price", "change", "change_rate", "volume",
+        "open", "high", "low", "listed_shares", "market_cap",
+        "per", "pbr", "eps", "bps", "w52_high", "w52_low", "sector"
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_response(cls, stock_code: str, data: Dict[str, Any]) -> "Quote":
+        """KIS inquire-price 응답 -> Quote"""
+        if data.get('rt_cd') != '0':
+            raise Exception(f"API 호출 실패: {data.get('msg1', data.get('rt_cd'))}")
+
+        output = data['output']
+        price = _int(output.get('stck_prpr'))
+        listed_shares = _int(output.get('lstn_stcn'))  # 상장주식수
+
+        return cls(
+            stock_code=stock_code,
+            price=price,
+            change=_int(output.get('prdy_vrss')),
+            change_rate=_float(output.get('prdy_ctrt')),
+            volume=_int(output.get('acml_vol')),
+            open=_int(output.get('stck_oprc')),
+            high=_int(output.get('stck_hgpr')),
+            low=_int(output.get('stck_lwpr')),
+            listed_shares=listed_shares,
+            market_cap=price * listed_shares,  # 시가총액 (원) = 현재가 * 상장주식수
+            per=_float(output.get('per')),
+            pbr=_float(output.get('pbr')),
+            eps=_float(output.get('eps')),
+            bps=_float(output.get('bps')),
+            w52_high=_int(output.get('w52_hgpr')),
+            w52_low=_int(output.get('w52_lwpr')),
+            sector=output.get('bstp_kor_isnm', '')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 dict"""
+        return {
+            'stock_code': self.stock_code,
+            'current_price': self.price,
+            'change': self.change,
+            'change_rate': self.change_rate,
+            'volume': self.volume,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'listed_shares': self.listed_shares,
+            'market_cap': self.market_cap,
+            'per': self.per,
+            'pbr': self.pbr,
+            'eps': self.eps,
+            'bps': self.bps,
+            'w52_high': self.w52_high,
+            'w52_low': self.w52_low,
+            'sector': self.sector
+        }
+
+    def __repr__(self) -> str:
+        return f"Quote({self.stock_code}, price={self.price}, change={self.change})"
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import get_settings
+from .korea_investment import ki_service
+from .quote import Quote
+from .rate_limiter import PRIORITY_BACKGROUND
+from .realtime import RealtimeQuoteFeed, Tick, realtime_feed
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 연결 하나가 구독할 수 있는 최대 종목 수
+STREAM_MAX_CODES = getattr(settings, "STREAM_MAX_CODES", 100)
+
+# 클라이언트에 보내는 시세 필드 (Quote.to_dict / Tick.to_dict 공통 키)
+STREAM_FIELDS = ("current_price", "change", "change_rate", "open", "high", "low", "volume")
+
+
+class QuoteSession:
+    """
+    클라이언트 연결 하나의 구독 상태
+
+    전송 대기 중인 종목만 표시해 두고(dirty), 보낼 때 최신 시세를 읽으므로
+    느린 클라이언트는 중간 체결을 건너뛰고 마지막 값만 받음
+    """
+
+    def __init__(self, hub: "QuoteStreamHub"):
+        self.hub = hub
+        self.codes: Set[str] = set()
+        self._dirty: Dict[str, None] = {}  # 순서 있는 집합
+        self._wakeup = asyncio.Event()
+        self._sent: Dict[str, Tuple[int, Dict[str, Any]]] = {}  # 종목코드 -> (버전, 보낸 필드)
+        self.closed = False
+
+    def mark(self, stock_code: str):
+        self._dirty[stock_code] = None
+        self._wakeup.set()
+
+    async def messages(self) -> AsyncIterator[str]:
+        """보낼 메시지 (JSON 문자열)"""
+        while not self.closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            dirty, self._dirty = self._dirty, {}
+            for code in dirty:
+                if code not in self.codes:
+                    continue
+                message = self._message(code)
+                if message is not None:
+                    yield message
+
+    def _message(self, stock_code: str) -> Optional[str]:
+        state = self.hub.state.get(stock_code)
+        if state is None:
+            return None
+        version, fields = state
+        sent = self._sent.get(stock_code)
+        self._sent[stock_code] = state
+
+        # 직전 버전을 받은 세션은 허브가 한 번만 만든 변경분을 그대로 공유
+        if sent is not None and sent[0] == version - 1:
+            return self.hub.delta(stock_code, version)
+        if sent is not None and sent[0] == version:
+            return None
+        return encode(stock_code, diff(sent[1] if sent else None, fields))
+
+    def forget(self, stock_code: str):
+        """구독 해제한 종목의 전송 기록 삭제 (다시 구독하면 전체 스냅샷부터)"""
+        self._sent.pop(stock_code, None)
+        self._dirty.pop(stock_code, None)
+
+    def close(self):
+        self.closed = True
+        self._wakeup.set()
+
+
+def diff(previous: Optional[Dict[str, Any]], current: Dict[str, Any]) -> Dict[str, Any]:
+    """바뀐 필드만 (이전 값이 없으면 전체)"""
+    if previous is None:
+        return current
+    return {k: v for k, v in current.items() if previous.get(k) != v}
+
+
+def encode(stock_code: str, fields: Dict[str, Any]) -> str:
+    return json.dumps({"type": "quote", "stock_code": stock_code, **fields}, ensure_ascii=False)
+
+
+class QuoteStreamHub:
+    """
+    실시간 시세 팬아웃
+
+    - 종목별로 업스트림 구독(RealtimeQuoteFeed.watch)은 하나만 유지하고 모든 세션에 나눠 줌
+    - 체결마다 종목 상태의 버전을 올리고 직전 버전 대비 변경분을 한 번만 직렬화
+    - 구독 시작 시 아직 체결이 없는 종목은 REST 시세로 첫 스냅샷을 채움
+      (장 마감 후에는 체결이 없으므로 이 스냅샷이 마지막 값)
+    """
+
+    def __init__(self, feed: RealtimeQuoteFeed):
+        self.feed = feed
+        self.sessions: Dict[str, Set[QuoteSession]] = {}
+        self.state: Dict[str, Tuple[int, Dict[str, Any]]] = {}  # 종목코드 -> (버전, 필드)
+        self._deltas: Dict[str, Tuple[int, str]] = {}  # 종목코드 -> (버전, 직전 대비 변경분 메시지)
+        self._previous: Dict[str, Dict[str, Any]] = {}
+        feed.add_listener(self.on_tick)
+
+        # 메트릭
+        self.updates = 0
+        self.messages_shared = 0
+
+    def open(self) -> QuoteSession:
+        return QuoteSession(self)
+
+    async def subscribe(self, session: QuoteSession, stock_codes: Iterable[str]) -> List[str]:
+        """세션에 종목 추가 (한도를 넘는 종목은 무시), 추가된 종목 반환"""
+        added = []
+        for code in dict.fromkeys(stock_codes):
+            if code in session.codes or len(session.codes) >= STREAM_MAX_CODES:
+                continue
+            session.codes.add(code)
+            subscribers = self.sessions.setdefault(code, set())
+            if not subscribers:
+                self.feed.watch(code)
+            subscribers.add(session)
+            added.append(code)
+
+        missing = [code for code in added if code not in self.state]
+        if missing:
+            quotes, _ = await ki_service.get_quotes(missing, PRIORITY_BACKGROUND)
+            for code, quote in quotes.items():
+                self._seed(code, quote)
+
+        for code in added:
+            session.mark(code)
+        return added
+
+    def unsubscribe(self, session: QuoteSession, stock_codes: Iterable[str]):
+        for code in list(stock_codes):
+            if code not in session.codes:
+                continue
+            session.codes.discard(code)
+            session.forget(code)
+            subscribers = self.sessions.get(code)
+            if subscribers is None:
+                continue
+            subscribers.discard(session)
+            if not subscribers:
+                del self.sessions[code]
+                self.state.pop(code, None)
+                self._deltas.pop(code, None)
+                self._previous.pop(code, None)
+                self.feed.unwatch(code)
+
+    def close(self, session: QuoteSession):
+        self.unsubscribe(session, list(session.codes))
+        session.close()
+
+    def _seed(self, stock_code: str, quote: Quote):
+        # 시세 조회 중 구독자가 모두 떠났거나(상태를 남기면 다음 구독자가 오래된 스냅샷을 받음)
+        # 그 사이 체결이 먼저 도착한 경우
+        if stock_code not in self.sessions or stock_code in self.state:
+            return
+        quote_fields = quote.to_dict()
+        self.state[stock_code] = (0, {k: quote_fields[k] for k in STREAM_FIELDS})
+
+    def on_tick(self, tick: Tick):
+        subscribers = self.sessions.get(tick.stock_code)
+        if not subscribers:
+            return
+
+        tick_fields = tick.to_dict()
+        fields = {k: tick_fields[k] for k in STREAM_FIELDS}
+        version, previous = self.state.get(tick.stock_code, (0, None))
+        if previous == fields:  # 체결은 있었지만 보낼 필드는 그대로
+            return
+
+        version += 1
+        self.state[tick.stock_code] = (version, fields)
+        self._previous[tick.stock_code] = previous
+        self._deltas.pop(tick.stock_code, None)
+        self.updates += 1
+        for session in subscribers:
+            session.mark(tick.stock_code)
+
+    def delta(self, stock_code: str, version: int) -> str:
+        """직전 버전 대비 변경분 메시지 (버전마다 한 번만 직렬화)"""
+        cached = self._deltas.get(stock_code)
+        if cached is not None and cached[0] == version:
+            self.messages_shared += 1
+            return cached[1]
+        message = encode(stock_code, diff(self._previous.get(stock_code), self.state[stock_code][1]))
+        self._deltas[stock_code] = (version, message)
+        return message
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "sessions": len({s for sessions in self.sessions.values() for s in sessions}),
+            "symbols": len(self.sessions),
+            "updates": self.updates,
+            "messages_shared": self.messages_shared
+        }
+
+
+quote_hub = QuoteStreamHub(realtime_feed)
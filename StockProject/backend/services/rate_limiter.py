@@ -0,0 +1,175 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+
+# 우선순위 (값이 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+
+class RateLimitTimeout(Exception):
+    """대기열에서 마감 시간 안에 호출 권한을 얻지 못함"""
+    pass
+
+
+class TokenBucket:
+    """
+    초당 rate개 토큰이 채워지는 토큰 버킷 (최대 capacity개 누적)
+
+    기본 capacity는 1: 호출 간격을 1/rate로 고르게 유지해 어느 1초 구간에서도 rate를 넘지 않음
+    (capacity를 rate로 두면 쉬고 난 직후 채워진 만큼 한꺼번에 나가 1초에 최대 2배까지 호출됨)
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """토큰 1개를 쓸 수 있을 때까지 남은 시간 (초)"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+
+class RequestScheduler:
+    """
+    KIS 호출 스케줄러
+
+    - 앱키 전체 한도(global_rate)와 tr_id별 한도를 토큰 버킷으로 관리
+    - 한도를 넘는 호출은 우선순위 대기열에 넣고, 대화형 호출을 백그라운드 호출보다 먼저 처리
+    - 마감 시간(deadline)을 넘긴 대기 호출은 RateLimitTimeout으로 실패
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        tr_rates: Optional[Dict[str, float]] = None,
+        default_timeout: Optional[float] = None
+    ):
+        self.global_bucket = TokenBucket(global_rate)
+        self.tr_rates = tr_rates or {}
+        self.default_timeout = default_timeout
+        self._buckets: Dict[str, TokenBucket] = {}
+
+        self._heap = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.granted = defaultdict(int)
+        self.timeouts = defaultdict(int)
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+
+    def _bucket(self, tr_id: str) -> Optional[TokenBucket]:
+        if tr_id not in self.tr_rates:
+            return None
+        if tr_id not in self._buckets:
+            self._buckets[tr_id] = TokenBucket(self.tr_rates[tr_id])
+        return self._buckets[tr_id]
+
+    def _wait_time(self, tr_id: str, now: float) -> float:
+        wait = self.global_bucket.wait_time(now)
+        bucket = self._bucket(tr_id)
+        if bucket:
+            wait = max(wait, bucket.wait_time(now))
+        return wait
+
+    def _consume(self, tr_id: str):
+        self.global_bucket.consume()
+        bucket = self._bucket(tr_id)
+        if bucket:
+            bucket.consume()
+        self.granted[tr_id] += 1
+
+    async def acquire(
+        self,
+        tr_id: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        timeout: Optional[float] = None
+    ):
+        """호출 권한 획득 (한도 초과 시 대기)"""
+        now = time.monotonic()
+
+        # 대기열이 비어 있고 토큰이 남아 있으면 바로 통과
+        if not self._heap and self._wait_time(tr_id, now) <= 0:
+            self._consume(tr_id)
+            return
+
+        timeout = timeout if timeout is not None else self.default_timeout
+        deadline = now + timeout if timeout is not None else None
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq), tr_id, deadline, future))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._heap))
+
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        await future
+        self.total_wait += time.monotonic() - now
+
+    async def _dispatch(self):
+        while self._heap:
+            priority, _, tr_id, deadline, future = self._heap[0]
+            now = time.monotonic()
+
+            if future.done():  # 호출자가 취소됨
+                heapq.heappop(self._heap)
+                continue
+
+            if deadline is not None and now >= deadline:
+                heapq.heappop(self._heap)
+                self.timeouts[tr_id] += 1
+                future.set_exception(RateLimitTimeout(f"호출 대기 시간 초과: {tr_id}"))
+                continue
+
+            wait = self._wait_time(tr_id, now)
+            if wait <= 0:
+                heapq.heappop(self._heap)
+                self._consume(tr_id)
+                future.set_result(None)
+                continue
+
+            if deadline is not None:
+                wait = min(wait, deadline - now)
+
+            # 더 높은 우선순위 호출이 들어오면 바로 깨어남
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def metrics(self) -> Dict[str, object]:
+        """대기열 깊이 및 처리량 메트릭"""
+        depth_by_priority = defaultdict(int)
+        for priority, _, _, _, future in self._heap:
+            if not future.done():
+                depth_by_priority[priority] += 1
+
+        granted_total = sum(self.granted.values())
+        return {
+            "queue_depth": sum(depth_by_priority.values()),
+            "queue_depth_interactive": depth_by_priority[PRIORITY_INTERACTIVE],
+            "queue_depth_background": depth_by_priority[PRIORITY_BACKGROUND],
+            "max_queue_depth": self.max_queue_depth,
+            "global_rate": self.global_bucket.rate,
+            "granted": dict(self.granted),
+            "timeouts": dict(self.timeouts),
+            "avg_wait_ms": round(self.total_wait / granted_total * 1000, 2) if granted_total else 0.0
+        }
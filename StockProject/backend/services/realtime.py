@@ -0,0 +1,343 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from websockets.asyncio.client import connect
+
+from config import get_settings
+from .korea_investment import ki_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# 실시간 시세 WebSocket 설정 (config에 없으면 기본값 사용)
+KIS_WS_ENABLED = getattr(settings, "KIS_WS_ENABLED", True)
+KIS_WS_URL = getattr(settings, "KIS_WS_URL", "ws://ops.koreainvestment.com:21000")
+# 세션당 실시간 등록 한도 (KIS: 41건)
+KIS_WS_MAX_SUBSCRIPTIONS = getattr(settings, "KIS_WS_MAX_SUBSCRIPTIONS", 41)
+# 재접속 대기 시간 (초, 실패할 때마다 두 배로 늘려 최대값까지)
+KIS_WS_RECONNECT_MIN = getattr(settings, "KIS_WS_RECONNECT_MIN", 1.0)
+KIS_WS_RECONNECT_MAX = getattr(settings, "KIS_WS_RECONNECT_MAX", 30.0)
+
+TICK_TR_ID = "H0STCNT0"  # 국내주식 실시간체결가
+PINGPONG_TR_ID = "PINGPONG"
+
+# H0STCNT0 레코드 필드 수 / 사용하는 필드 위치
+TICK_FIELD_COUNT = 46
+F_CODE = 0           # 유가증권단축종목코드
+F_TIME = 1           # 주식체결시간 (HHMMSS)
+F_PRICE = 2          # 주식현재가
+F_SIGN = 3           # 전일대비부호
+F_CHANGE = 4         # 전일대비
+F_CHANGE_RATE = 5    # 전일대비율
+F_OPEN = 7           # 시가
+F_HIGH = 8           # 고가
+F_LOW = 9            # 저가
+F_TRADE_VOLUME = 12  # 체결거래량
+F_VOLUME = 13        # 누적거래량
+
+# 전일 대비 부호 (4: 하한, 5: 하락)
+DOWN_SIGNS = {"4", "5"}
+
+
+class Tick:
+    """실시간 체결 (H0STCNT0 레코드 하나)"""
+
+    __slots__ = (
+        "stock_code", "time", "price", "change", "change_rate",
+        "open", "high", "low", "volume", "trade_volume"
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_fields(cls, fields: List[str]) -> "Tick":
+        """'^'로 나눈 레코드 필드 -> Tick"""
+        change = abs(int(fields[F_CHANGE] or 0))
+        return cls(
+            stock_code=fields[F_CODE],
+            time=fields[F_TIME],
+            price=int(fields[F_PRICE]),
+            change=-change if fields[F_SIGN] in DOWN_SIGNS else change,
+            change_rate=float(fields[F_CHANGE_RATE] or 0),
+            open=int(fields[F_OPEN] or 0),
+            high=int(fields[F_HIGH] or 0),
+            low=int(fields[F_LOW] or 0),
+            volume=int(fields[F_VOLUME] or 0),
+            trade_volume=int(fields[F_TRADE_VOLUME] or 0)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 dict (Quote.to_dict와 같은 키 사용)"""
+        return {
+            'stock_code': self.stock_code,
+            'time': self.time,
+            'current_price': self.price,
+            'change': self.change,
+            'change_rate': self.change_rate,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'volume': self.volume,
+            'trade_volume': self.trade_volume
+        }
+
+    def __repr__(self) -> str:
+        return f"Tick({self.stock_code}, {self.time}, price={self.price})"
+
+
+def parse_ticks(message: str) -> List[Tick]:
+    """
+    실시간 데이터 프레임 파싱
+
+    형식: '0|H0STCNT0|{건수}|{필드^필드^...}' (건수만큼 레코드가 이어서 붙음)
+    """
+    _, tr_id, count, payload = message.split("|", 3)
+    if tr_id != TICK_TR_ID:
+        return []
+    fields = payload.split("^")
+    return [
+        Tick.from_fields(fields[i * TICK_FIELD_COUNT:(i + 1) * TICK_FIELD_COUNT])
+        for i in range(int(count))
+    ]
+
+
+class RealtimeQuoteFeed:
+    """
+    KIS 실시간 체결가 WebSocket 수신기
+
+    - 종목별 구독자 수(watch/unwatch)를 세어 구독 목록을 실제 등록 상태와 맞춤
+      (구독자가 생기면 등록, 모두 떠나면 해제, 아무도 없으면 연결 종료)
+    - 세션당 등록 한도(KIS_WS_MAX_SUBSCRIPTIONS)를 넘는 종목은 먼저 구독한 종목이 빠질 때까지 대기
+    - 연결이 끊기면 지수 백오프로 재접속하고 구독 목록을 다시 등록
+    - 수신한 체결은 종목별 최신값(ticks)에 저장하고 리스너에 전달
+    """
+
+    def __init__(
+        self,
+        url: str,
+        approval_key: Callable[..., Awaitable[str]],
+        max_subscriptions: int = 41,
+        reconnect_min: float = 1.0,
+        reconnect_max: float = 30.0
+    ):
+        self.url = url
+        self.approval_key = approval_key
+        self.max_subscriptions = max_subscriptions
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+
+        self.watchers: Dict[str, int] = {}  # 종목코드 -> 구독자 수 (구독 순서 유지)
+        self.subscribed: Set[str] = set()   # 현재 세션에 등록된 종목
+        self.ticks: Dict[str, Tick] = {}    # 종목코드 -> 최신 체결
+        self._listeners: List[Callable[[Tick], None]] = []
+
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+
+        # 메트릭
+        self.connects = 0
+        self.ticks_received = 0
+        self.last_tick_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    # ==================== 구독 관리 ====================
+
+    def watch(self, stock_code: str):
+        """종목 구독자 추가"""
+        self.watchers[stock_code] = self.watchers.get(stock_code, 0) + 1
+        if self.watchers[stock_code] == 1:
+            self._changed.set()
+
+    def unwatch(self, stock_code: str):
+        """종목 구독자 제거 (마지막 구독자면 등록 해제)"""
+        count = self.watchers.get(stock_code, 0) - 1
+        if count > 0:
+            self.watchers[stock_code] = count
+            return
+        if self.watchers.pop(stock_code, None) is not None:
+            self.ticks.pop(stock_code, None)
+            self._changed.set()
+
+    @asynccontextmanager
+    async def watching(self, stock_codes: Iterable[str]):
+        """with 블록 동안 종목 구독"""
+        stock_codes = list(dict.fromkeys(stock_codes))
+        for code in stock_codes:
+            self.watch(code)
+        try:
+            yield self
+        finally:
+            for code in stock_codes:
+                self.unwatch(code)
+
+    def wanted(self) -> Set[str]:
+        """등록해야 할 종목 (먼저 구독한 순서로 한도까지)"""
+        return set(list(self.watchers)[:self.max_subscriptions])
+
+    def add_listener(self, listener: Callable[[Tick], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Tick], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # ==================== 연결 관리 ====================
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        delay = self.reconnect_min
+        failed = False
+        while True:
+            # 구독자가 생길 때까지 연결하지 않음
+            while not self.watchers:
+                self._changed.clear()
+                await self._changed.wait()
+
+            started = time.monotonic()
+            try:
+                approval_key = await self.approval_key(refresh=failed)
+                async with connect(self.url, ping_interval=None) as ws:
+                    self.connected = True
+                    self.connects += 1
+                    logger.info(f"✅ 실시간 시세 연결: {self.url}")
+                    await self._session(ws, approval_key)
+                failed = False
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e)
+                failed = True
+                logger.warning(f"⚠️ 실시간 시세 연결 오류: {e}")
+            finally:
+                self.connected = False
+                self.subscribed.clear()
+
+            if not self.watchers:  # 구독자가 모두 떠나서 정상 종료
+                delay = self.reconnect_min
+                continue
+
+            # 한동안 유지된 연결이면 백오프 초기화
+            if time.monotonic() - started > self.reconnect_max:
+                delay = self.reconnect_min
+            wait = delay * random.uniform(0.5, 1.0)
+            logger.info(f"🔄 실시간 시세 재접속 대기: {wait:.1f}초")
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, self.reconnect_max)
+
+    async def _session(self, ws, approval_key: str):
+        """연결 하나의 수명 (구독 동기화 + 수신)"""
+        syncer = asyncio.create_task(self._sync_subscriptions(ws, approval_key))
+        try:
+            async for message in ws:
+                await self._handle(ws, message)
+        finally:
+            syncer.cancel()
+            try:
+                await syncer
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.warning(f"⚠️ 실시간 구독 등록 오류: {e}")
+
+    async def _sync_subscriptions(self, ws, approval_key: str):
+        """구독 목록이 바뀔 때마다 등록/해제 요청 전송 (구독자가 없으면 연결 종료)"""
+        while True:
+            self._changed.clear()
+            wanted = self.wanted()
+            for code in self.subscribed - wanted:
+                await ws.send(self._request(approval_key, code, subscribe=False))
+                self.subscribed.discard(code)
+            for code in wanted - self.subscribed:
+                await ws.send(self._request(approval_key, code, subscribe=True))
+                self.subscribed.add(code)
+
+            if not wanted:
+                await ws.close()
+                return
+            await self._changed.wait()
+
+    @staticmethod
+    def _request(approval_key: str, stock_code: str, subscribe: bool) -> str:
+        return json.dumps({
+            "header": {
+                "approval_key": approval_key,
+                "custtype": "P",
+                "tr_type": "1" if subscribe else "2",
+                "content-type": "utf-8"
+            },
+            "body": {
+                "input": {"tr_id": TICK_TR_ID, "tr_key": stock_code}
+            }
+        })
+
+    async def _handle(self, ws, message: str):
+        # 실시간 데이터 ('0': 평문, '1': 암호화 - 체결통보 전용이라 사용하지 않음)
+        if message[:1] in ("0", "1"):
+            if message[0] == "0":
+                for tick in parse_ticks(message):
+                    self._dispatch(tick)
+            return
+
+        data = json.loads(message)
+        header = data.get("header", {})
+        if header.get("tr_id") == PINGPONG_TR_ID:
+            await ws.send(message)
+            return
+
+        body = data.get("body", {})
+        if body.get("rt_cd") not in (None, "0"):
+            logger.warning(f"⚠️ 실시간 등록 실패 ({header.get('tr_key')}): {body.get('msg1')}")
+
+    def _dispatch(self, tick: Tick):
+        if tick.stock_code not in self.watchers:  # 해제 직후 도착한 체결
+            return
+
+        self.ticks[tick.stock_code] = tick
+        self.ticks_received += 1
+        self.last_tick_at = time.time()
+        for listener in list(self._listeners):
+            try:
+                listener(tick)
+            except Exception as e:
+                logger.error(f"❌ 실시간 체결 처리 오류: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "connects": self.connects,
+            "watched": len(self.watchers),
+            "subscribed": len(self.subscribed),
+            "waiting": max(len(self.watchers) - self.max_subscriptions, 0),
+            "ticks_received": self.ticks_received,
+            "last_tick_at": self.last_tick_at,
+            "last_error": self.last_error
+        }
+
+
+realtime_feed = RealtimeQuoteFeed(
+    KIS_WS_URL,
+    ki_service.get_approval_key,
+    max_subscriptions=KIS_WS_MAX_SUBSCRIPTIONS,
+    reconnect_min=KIS_WS_RECONNECT_MIN,
+    reconnect_max=KIS_WS_RECONNECT_MAX
+)
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    동일 키의 동시 호출 중복 제거
+
+    같은 키로 진행 중인 호출이 있으면 새로 호출하지 않고 그 결과(또는 예외)를 함께 받음.
+    결과 객체는 모든 호출자가 공유하므로 읽기 전용으로 다뤄야 함
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+        else:
+            self.executed += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+
+        # 한 호출자가 취소돼도 공유 작업은 계속 진행
+        return await asyncio.shield(future)
+
+    def _done(self, key: Hashable, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우 'exception was never retrieved' 경고 방지
+        if not future.cancelled():
+            future.exception()
+
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "inflight": len(self._inflight),
+            "executed": self.executed,
+            "shared": self.shared
+        }
@@ -0,0 +1,121 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+import zlib
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from config import get_settings
+from database import SessionLocal, Stock
+from .singleflight import SingleFlight
+from .stock_search import StockIndex, stock_search
+
+settings = get_settings()
+
+# 전체 종목 스트리밍 시 한 번에 읽는 종목 수
+STOCK_STREAM_CHUNK_SIZE = getattr(settings, "STOCK_STREAM_CHUNK_SIZE", 1000)
+
+
+def fetch_page(after: Optional[str], limit: int, offset: int = 0) -> List[Tuple[str, str]]:
+    """
+    종목코드 순 [(종목코드, 종목명)]
+
+    after를 주면 그 종목코드 다음부터 (stock_code 인덱스를 타므로 깊은 페이지도 일정한 시간)
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(Stock.stock_code, Stock.stock_name)
+        if after is not None:
+            query = query.filter(Stock.stock_code > after)
+        return [tuple(row) for row in query.order_by(Stock.stock_code).offset(offset).limit(limit)]
+    finally:
+        db.close()
+
+
+async def stream_universe(compress: bool) -> AsyncIterator[bytes]:
+    """전체 종목 NDJSON (종목코드 순, STOCK_STREAM_CHUNK_SIZE개씩 읽어서 바로 전송, compress면 gzip)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    after = None
+    while True:
+        rows = await asyncio.to_thread(fetch_page, after, STOCK_STREAM_CHUNK_SIZE)
+        if not rows:
+            break
+        chunk = "".join(
+            json.dumps({"stock_code": code, "stock_name": name}, ensure_ascii=False) + "\n"
+            for code, name in rows
+        ).encode()
+        if compressor is not None:
+            chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield chunk
+        if len(rows) < STOCK_STREAM_CHUNK_SIZE:
+            break
+        after = rows[-1][0]
+    if compressor is not None:
+        yield compressor.flush()
+
+
+class MasterSnapshot:
+    """
+    종목 마스터 스냅샷 (종목코드 -> 종목명 전체)
+
+    만들 때 JSON과 gzip 본문을 한 번만 만들어 두고, 본문 해시로 강한 ETag를 붙임
+    (gzip 본문은 다른 표현이므로 ETag도 따로 둠)
+    """
+
+    __slots__ = ("version", "count", "body", "gzip_body", "etag", "gzip_etag", "created_at")
+
+    def __init__(self, stocks: List[Tuple[str, str]], version: Optional[str]):
+        self.version = version
+        self.count = len(stocks)
+        self.created_at = time.time()
+        self.body = json.dumps(
+            {"version": version, "count": self.count, "stocks": sorted(stocks)},
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode()
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """If-None-Match 헤더가 이 스냅샷을 가리키는지 (W/ 접두어는 무시)"""
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags or self.gzip_etag in tags
+
+
+class StockMasterCache:
+    """종목 검색 인덱스가 바뀔 때만 스냅샷을 다시 만듦 (인덱스가 종목 마스터 버전을 추적)"""
+
+    def __init__(self):
+        self.snapshot: Optional[MasterSnapshot] = None
+        self.inflight = SingleFlight()
+        self.builds = 0
+
+    async def get(self) -> MasterSnapshot:
+        index = await stock_search.get_index()
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.version != index.version:
+            snapshot = await self.inflight.do(index.version, lambda: self._build(index))
+        return snapshot
+
+    async def _build(self, index: StockIndex) -> MasterSnapshot:
+        snapshot = await asyncio.to_thread(MasterSnapshot, list(zip(index.codes, index.names)), index.version)
+        self.snapshot = snapshot
+        self.builds += 1
+        return snapshot
+
+    def metrics(self) -> Dict[str, object]:
+        snapshot = self.snapshot
+        return {
+            "builds": self.builds,
+            "version": snapshot.version if snapshot else None,
+            "bytes": len(snapshot.body) if snapshot else 0,
+            "gzip_bytes": len(snapshot.gzip_body) if snapshot else 0
+        }
+
+
+stock_master = StockMasterCache()
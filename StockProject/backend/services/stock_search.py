@@ -0,0 +1,371 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from config import get_settings
+from database import SessionLocal, Stock
+from .hangul import has_hangul, is_chosung_query, normalize, to_chosung, to_jamo
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# stocks 테이블 변경 확인 간격 (초) - load_stocks.py로 종목을 바꾸면 이 안에 인덱스를 다시 만듦
+STOCK_INDEX_CHECK_INTERVAL = getattr(settings, "STOCK_INDEX_CHECK_INTERVAL", 60)
+
+# 트라이 노드의 종목이 이 수 이하이면 더 나누지 않고 접두어를 직접 비교
+_TRIE_LEAF_SIZE = 8
+
+# 오타 검색: 자모 기준 검색어 길이별 허용 편집 거리 (이보다 짧으면 오타 검색 안 함)
+FUZZY_MIN_LENGTH = 3
+FUZZY_DISTANCE_2_LENGTH = 6
+
+
+def stock_master_version(db) -> str:
+    """종목 마스터 버전 (종목 수, 최대 ID, 최근 수정 시각 - 추가/삭제/이름 변경 시 바뀜)"""
+    count, max_id, updated_at = db.query(
+        func.count(Stock.stock_id), func.max(Stock.stock_id), func.max(Stock.updated_at)
+    ).one()
+    return f"{count}:{max_id or 0}:{updated_at.isoformat() if updated_at else ''}"
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Optional[Dict[str, "_TrieNode"]] = None  # None: 더 나누지 않은 노드
+        self.ids: List[int] = []
+
+
+def _build_trie(keys: List[str]) -> _TrieNode:
+    """
+    접두어 트라이 (노드마다 그 접두어로 시작하는 keys 번호를 오름차순으로 기록)
+
+    종목이 _TRIE_LEAF_SIZE개 이하인 노드는 더 나누지 않음 (긴 자모 키도 노드 수가 크게 늘지 않음)
+    """
+    root = _TrieNode()
+    root.ids = list(range(len(keys)))
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if len(node.ids) <= _TRIE_LEAF_SIZE:
+            continue
+        node.children = {}
+        for i in node.ids:
+            key = keys[i]
+            if len(key) > depth:
+                child = node.children.get(key[depth])
+                if child is None:
+                    child = node.children[key[depth]] = _TrieNode()
+                child.ids.append(i)
+        stack.extend((child, depth + 1) for child in node.children.values())
+    return root
+
+
+def _fuzzy_distance(length: int) -> int:
+    """검색어 길이(자모)별 허용 편집 거리"""
+    if length < FUZZY_MIN_LENGTH:
+        return 0
+    return 1 if length < FUZZY_DISTANCE_2_LENGTH else 2
+
+
+def _build_grams(keys: List[str], n: int) -> Dict[str, List[int]]:
+    """1~n글자 n-gram -> keys 번호 목록 (오름차순, 중복 없음)"""
+    postings: Dict[str, List[int]] = {}
+    for i, key in enumerate(keys):
+        grams = set()
+        for size in range(1, n + 1):
+            grams.update(key[j:j + size] for j in range(len(key) - size + 1))
+        for gram in grams:
+            postings.setdefault(gram, []).append(i)
+    return postings
+
+
+class StockIndex:
+    """
+    종목 검색 인덱스 (읽기 전용 스냅샷)
+
+    종목은 종목명 순으로 번호를 매겨 두므로 모든 후보 목록이 이미 종목명 순으로 정렬되어 있음.
+    검색 순위는 기존 SQL과 같음: 종목명 접두 > 종목코드 접두 > 종목명 포함 > 종목코드 포함 (같은 순위는 종목명 순)
+    한글 검색어는 그 뒤에 자모 / 초성 일치를 이어 붙임: 접두 > 포함
+    ("삼성저", "ㅅㅅㅈㅈ", "skㅎㅇ" 처럼 입력 중인 글자나 초성만 입력해도 찾음)
+    오타 검색을 켜면 마지막에 편집 거리가 가까운 종목명 접두를 이어 붙임 ("NAVR", "삼송전")
+
+    - 접두 일치: 종목명 / 종목코드 / 자모 / 초성 트라이
+    - 포함 일치: n-gram 역색인에서 가장 짧은 후보 목록만 골라 실제 포함 여부 확인
+    - 오타 일치: 자모 트라이를 내려가며 편집 거리 표를 한 줄씩 계산 (허용 거리를 넘는 가지는 건너뜀)
+    - 영문은 대소문자 구분 없음
+    """
+
+    __slots__ = ("version", "built_at", "codes", "names",
+                 "_name_keys", "_code_keys", "_jamo_keys", "_chosung_keys",
+                 "_name_trie", "_code_trie", "_jamo_trie", "_chosung_trie",
+                 "_name_grams", "_code_grams", "_jamo_grams", "_chosung_grams")
+
+    def __init__(self, stocks: List[Tuple[str, str]], version: Optional[str] = None):
+        stocks = sorted(stocks, key=lambda stock: (stock[1], stock[0]))
+        self.version = version
+        self.built_at = time.time()
+        self.codes = [code for code, _ in stocks]
+        self.names = [name for _, name in stocks]
+        self._name_keys = [normalize(name) for name in self.names]
+        self._code_keys = [normalize(code) for code in self.codes]
+        self._jamo_keys = [to_jamo(key) for key in self._name_keys]
+        self._chosung_keys = [to_chosung(key) for key in self._name_keys]
+        self._name_trie = _build_trie(self._name_keys)
+        self._code_trie = _build_trie(self._code_keys)
+        self._jamo_trie = _build_trie(self._jamo_keys)
+        self._chosung_trie = _build_trie(self._chosung_keys)
+        self._name_grams = _build_grams(self._name_keys, 2)
+        self._code_grams = _build_grams(self._code_keys, 2)
+        # 자모는 글자 종류가 적어 2글자 조합도 흔하므로 3글자까지
+        self._jamo_grams = _build_grams(self._jamo_keys, 3)
+        self._chosung_grams = _build_grams(self._chosung_keys, 2)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @staticmethod
+    def _prefix(trie: _TrieNode, keys: List[str], q: str) -> Iterator[int]:
+        node = trie
+        for ch in q:
+            if node.children is None:
+                yield from (i for i in node.ids if keys[i].startswith(q))
+                return
+            node = node.children.get(ch)
+            if node is None:
+                return
+        yield from node.ids
+
+    @staticmethod
+    def _contains(grams: Dict[str, List[int]], keys: List[str], q: str, n: int) -> Iterator[int]:
+        size = min(len(q), n)
+        candidates = None
+        for j in range(len(q) - size + 1):
+            ids = grams.get(q[j:j + size])
+            if ids is None:
+                return
+            if candidates is None or len(ids) < len(candidates):
+                candidates = ids
+        if size == len(q):
+            yield from candidates
+            return
+        for i in candidates:
+            if q in keys[i]:
+                yield i
+
+    @staticmethod
+    def _fuzzy(trie: _TrieNode, keys: List[str], q: str, max_distance: int) -> Iterator[int]:
+        """
+        q와의 편집 거리가 max_distance 이하인 접두어를 가진 keys 번호 (거리, 번호 순)
+
+        대각선에서 max_distance 안쪽 칸만 계산하고 나머지는 max_distance + 1로 둠
+        """
+        m = len(q)
+        cap = max_distance + 1
+        found: Dict[int, int] = {}
+
+        def step(prev: List[int], ch: str, depth: int) -> Tuple[List[int], int]:
+            """다음 줄과 그 줄의 최솟값"""
+            row = [cap] * (m + 1)
+            lo = depth - max_distance
+            if lo <= 0:
+                row[0] = depth
+                lo = 1
+            left = lowest = row[lo - 1]
+            for j in range(lo, min(m, depth + max_distance) + 1):
+                value = prev[j - 1] + (q[j - 1] != ch)
+                if left + 1 < value:
+                    value = left + 1
+                if prev[j] + 1 < value:
+                    value = prev[j] + 1
+                row[j] = left = value
+                if value < lowest:
+                    lowest = value
+            return row, lowest
+
+        def match(ids: List[int], distance: int):
+            for i in ids:
+                if distance < found.get(i, cap):
+                    found[i] = distance
+
+        stack = [(trie, list(range(m + 1)), 0)]
+        while stack:
+            node, row, depth = stack.pop()
+            if node.children is None:
+                # 나누지 않은 노드: 종목마다 남은 글자를 이어서 계산
+                for i in node.ids:
+                    current, best = row, row[m]
+                    for offset, ch in enumerate(keys[i][depth:], start=depth + 1):
+                        current, lowest = step(current, ch, offset)
+                        if current[m] < best:
+                            best = current[m]
+                        if lowest > max_distance:
+                            break
+                    if best <= max_distance:
+                        match((i,), best)
+                continue
+            for ch, child in node.children.items():
+                child_row, lowest = step(row, ch, depth + 1)
+                if child_row[m] <= max_distance:
+                    match(child.ids, child_row[m])
+                if lowest <= max_distance:
+                    stack.append((child, child_row, depth + 1))
+
+        yield from sorted(found, key=lambda i: (found[i], i))
+
+    def _ranked(self, q: str, hangul: bool, fuzzy: bool) -> Iterator[Iterator[int]]:
+        """순위별 후보 (순위가 높은 것부터)"""
+        yield self._prefix(self._name_trie, self._name_keys, q)
+        yield self._prefix(self._code_trie, self._code_keys, q)
+        yield self._contains(self._name_grams, self._name_keys, q, 2)
+        yield self._contains(self._code_grams, self._code_keys, q, 2)
+
+        jamo = to_jamo(q)
+        if hangul and has_hangul(q):
+            chosung = is_chosung_query(q)
+            yield self._prefix(self._jamo_trie, self._jamo_keys, jamo)
+            if chosung:
+                yield self._prefix(self._chosung_trie, self._chosung_keys, q)
+            yield self._contains(self._jamo_grams, self._jamo_keys, jamo, 3)
+            if chosung:
+                yield self._contains(self._chosung_grams, self._chosung_keys, q, 2)
+
+        # 앞 순위로 limit개를 채우지 못한 경우에만 계산됨
+        max_distance = _fuzzy_distance(len(jamo))
+        if fuzzy and max_distance and not is_chosung_query(q):
+            yield self._fuzzy(self._jamo_trie, self._jamo_keys, jamo, max_distance)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        hangul: bool = True,
+        fuzzy: bool = False
+    ) -> List[Tuple[str, str]]:
+        """
+        검색어와 일치하는 [(종목코드, 종목명)] (순위순, 최대 limit개)
+
+        hangul=False면 자모 / 초성 일치를 빼고 기존 SQL 검색과 같은 결과만 반환
+        fuzzy=True면 일치하는 종목이 limit개보다 적을 때 오타 일치를 이어 붙임
+        """
+        q = normalize(query.strip())
+        if not q or limit <= 0:
+            return []
+
+        result: List[int] = []
+        seen = set()
+        for candidates in self._ranked(q, hangul, fuzzy):
+            for i in candidates:
+                if i in seen:
+                    continue
+                seen.add(i)
+                result.append(i)
+                if len(result) >= limit:
+                    return [(self.codes[i], self.names[i]) for i in result]
+        return [(self.codes[i], self.names[i]) for i in result]
+
+
+def load_index() -> StockIndex:
+    """stocks 테이블로 인덱스 생성 (스레드에서 실행)"""
+    db = SessionLocal()
+    try:
+        version = stock_master_version(db)
+        stocks = db.query(Stock.stock_code, Stock.stock_name).all()
+    finally:
+        db.close()
+    return StockIndex([tuple(stock) for stock in stocks], version)
+
+
+class StockSearchService:
+    """
+    프로세스 내 종목 검색 인덱스 관리
+
+    - 서버 시작 시 stocks 테이블로 인덱스를 만들고, 검색은 DB를 거치지 않음
+    - STOCK_INDEX_CHECK_INTERVAL마다 종목 마스터 버전을 확인해 바뀌었으면 새 인덱스로 교체
+      (load_stocks.py는 별도 프로세스이므로 버전 비교로 변경을 감지)
+    - 인덱스는 통째로 교체하므로 검색 중인 요청은 이전 인덱스를 끝까지 사용
+    """
+
+    def __init__(self):
+        self.index: Optional[StockIndex] = None
+        self.inflight = SingleFlight()
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.builds = 0
+        self.last_build_seconds: Optional[float] = None
+        self.errors = 0
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get_index(self) -> StockIndex:
+        """현재 인덱스 (아직 없으면 만들 때까지 대기)"""
+        index = self.index
+        if index is None:
+            index = await self.reload()
+        return index
+
+    async def reload(self) -> StockIndex:
+        """인덱스 다시 만들기 (동시에 호출되면 하나로 합침)"""
+        return await self.inflight.do("build", self._build)
+
+    async def _build(self) -> StockIndex:
+        started = time.monotonic()
+        index = await asyncio.to_thread(load_index)
+        self.index = index
+        self.builds += 1
+        self.last_build_seconds = round(time.monotonic() - started, 3)
+        logger.info(f"🔎 종목 검색 인덱스 생성: {len(index)}종목, {self.last_build_seconds}초")
+        return index
+
+    async def _check(self):
+        index = self.index
+        version = await asyncio.to_thread(self._current_version)
+        if index is None or index.version != version:
+            await self.reload()
+
+    @staticmethod
+    def _current_version() -> str:
+        db = SessionLocal()
+        try:
+            return stock_master_version(db)
+        finally:
+            db.close()
+
+    async def _loop(self):
+        while True:
+            try:
+                await self._check()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"❌ 종목 검색 인덱스 갱신 실패: {e}")
+            await asyncio.sleep(STOCK_INDEX_CHECK_INTERVAL)
+
+    def metrics(self) -> Dict[str, object]:
+        index = self.index
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "stocks": len(index) if index else 0,
+            "version": index.version if index else None,
+            "builds": self.builds,
+            "last_build_seconds": self.last_build_seconds,
+            "errors": self.errors
+        }
+
+
+stock_search = StockSearchService()
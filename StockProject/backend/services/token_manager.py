@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from token_cache import EXPIRY_SAFETY_SECONDS, FileLock, is_fresh, key_id, lock_path, read_cache, write_cache
+
+logger = logging.getLogger(__name__)
+
+# 갱신 실패 시 재시도 간격 (KIS는 토큰 발급을 1분에 1회로 제한)
+REFRESH_RETRY_SECONDS = 65
+
+
+class TokenManager:
+    """
+    접근 토큰 수명 관리
+
+    - expires_in 기반 만료 추적, 만료 전 백그라운드 선제 갱신
+    - 동시에 들어온 갱신 요청은 하나의 발급 작업을 공유 (single-flight)
+    - 락으로 보호되는 로컬 파일에 토큰을 저장해 같은 호스트의 워커들이 재사용
+    """
+
+    def __init__(
+        self,
+        issue: Callable[[], Awaitable[Dict[str, Any]]],
+        cache_path: str,
+        app_key: str,
+        refresh_margin: float = 3600
+    ):
+        self._issue = issue
+        self.cache_path = cache_path
+        self.refresh_margin = refresh_margin
+        self._key_id = key_id(app_key)
+
+        self.access_token: Optional[str] = None
+        self.issued_at: float = 0.0
+        self.expires_at: float = 0.0
+        self._rejected_token: Optional[str] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background_task: Optional[asyncio.Task] = None
+
+    # ==================== 상태 ====================
+    def is_valid(self) -> bool:
+        return bool(self.access_token) and time.time() < self.expires_at - EXPIRY_SAFETY_SECONDS
+
+    @property
+    def margin(self) -> float:
+        """선제 갱신 구간 (수명이 짧은 토큰은 수명의 절반)"""
+        return min(self.refresh_margin, (self.expires_at - self.issued_at) / 2)
+
+    def needs_refresh(self) -> bool:
+        return time.time() >= self.expires_at - self.margin
+
+    @property
+    def expires_in(self) -> int:
+        return max(0, int(self.expires_at - time.time()))
+
+    # ==================== 조회 / 갱신 ====================
+    async def get_token(self) -> str:
+        """
+        유효한 토큰 반환
+
+        토큰이 갱신 구간에 들어왔으면 현재 토큰을 그대로 반환하고 갱신은 백그라운드로 진행.
+        유효한 토큰이 전혀 없을 때만 발급을 기다림.
+        """
+        if self.is_valid():
+            if self.needs_refresh():
+                self._start_refresh()
+            return self.access_token
+
+        await self.refresh()
+        return self.access_token
+
+    async def refresh(self, bad_token: Optional[str] = None):
+        """
+        토큰 갱신 (진행 중인 갱신이 있으면 그 결과를 공유)
+
+        bad_token: 서버가 거부한 토큰 (EGW00123 등). 파일 캐시에 남아 있어도 재사용하지 않음
+        """
+        if bad_token:
+            self._rejected_token = bad_token
+            if bad_token == self.access_token:
+                self.access_token = None
+                self.expires_at = 0.0
+        await asyncio.shield(self._start_refresh())
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._do_refresh())
+            self._refresh_task.add_done_callback(self._log_refresh_error)
+        return self._refresh_task
+
+    @staticmethod
+    def _log_refresh_error(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            logger.error(f"❌ 토큰 갱신 실패: {task.exception()}")
+
+    @staticmethod
+    async def _acquire(lock: FileLock):
+        """
+        파일 락 획득
+
+        스레드에서 진행 중인 acquire는 취소되지 않으므로, 기다리던 쪽이 취소되면
+        (종료, 대기 시간 초과) 스레드가 락을 잡는 대로 바로 풀어 줌
+        """
+        acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+
+        def release_abandoned(future: asyncio.Future):
+            if not future.cancelled() and future.exception() is None:
+                lock.release()
+
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            acquiring.add_done_callback(release_abandoned)
+            raise
+
+    async def _do_refresh(self):
+        # 갱신마다 새 락 객체 (취소된 이전 갱신의 락 해제가 이번 락을 건드리지 않게)
+        lock = FileLock(lock_path(self.cache_path))
+        await self._acquire(lock)
+        try:
+            # 다른 워커가 이미 갱신했으면 파일의 토큰을 재사용
+            cached = self._read_cache()
+            if is_fresh(cached) and cached["access_token"] not in (self.access_token, self._rejected_token):
+                self._adopt(cached)
+                logger.info("✅ 공유 토큰 캐시 사용")
+                return
+
+            payload = await self._issue()
+            self.access_token = payload["access_token"]
+            self.issued_at = time.time()
+            self.expires_at = self.issued_at + int(payload.get("expires_in", 86400))
+            self._write_cache()
+            logger.info(f"✅ 토큰 갱신 완료 (만료까지 {self.expires_in}초)")
+        finally:
+            await asyncio.to_thread(lock.release)
+
+    # ==================== 파일 캐시 ====================
+    def load_cached(self) -> bool:
+        """디스크 캐시에서 유효한 토큰을 읽어옴"""
+        cached = self._read_cache()
+        if is_fresh(cached):
+            self._adopt(cached)
+            return True
+        return False
+
+    def _adopt(self, cached: Dict[str, Any]):
+        self.access_token = cached["access_token"]
+        self.expires_at = cached["expires_at"]
+        self.issued_at = cached.get("issued_at", self.expires_at - 86400)
+
+    def _read_cache(self) -> Optional[Dict[str, Any]]:
+        return read_cache(self.cache_path, self._key_id)
+
+    def _write_cache(self):
+        write_cache(self.cache_path, self._key_id, self.access_token, self.issued_at, self.expires_at)
+
+    # ==================== 백그라운드 갱신 ====================
+    def start(self):
+        """만료 전 선제 갱신 루프 시작"""
+        if self._background_task is None or self._background_task.done():
+            self._background_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._background_task:
+            self._background_task.cancel()
+            try:
+                await self._background_task
+            except asyncio.CancelledError:
+                pass
+            self._background_task = None
+
+    async def _refresh_loop(self):
+        while True:
+            # 자는 동안 다른 경로(401 재발급, 다른 워커)로 갱신됐으면 새 만료 시각까지 다시 잠
+            while (delay := self.expires_at - self.margin - time.time()) > 0:
+                await asyncio.sleep(delay)
+            try:
+                await self._start_refresh()
+            except Exception:
+                pass
+            if self.needs_refresh():
+                await asyncio.sleep(REFRESH_RETRY_SECONDS)
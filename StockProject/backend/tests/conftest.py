@@ -0,0 +1,37 @@
+"""
+테스트 공통 설정
+
+config.py는 gitignore 대상이라 깨끗한 체크아웃에는 없으므로, 서비스 모듈을 가져오기 전에
+테스트용 설정을 config 모듈로 주입함 (로컬 config.py가 있어도 실제 DB / KIS / 파일은 건드리지 않음)
+"""
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+import types
+
+TEST_DIR = tempfile.mkdtemp(prefix="stock-tests-")
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+
+
+class TestSettings:
+    DEBUG = False
+    SECRET_KEY = "test-secret-key"
+    cors_origins = ["http://localhost:5173"]
+    database_url = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+
+    # KIS 호출은 테스트에서 대역으로 바꾸므로 닿지 않는 주소
+    REAL_URL = "http://127.0.0.1:9"
+    REAL_APP_KEY = "test-app-key"
+    REAL_APP_SECRET = "test-app-secret"
+    REAL_CANO = "00000000"
+    REAL_ACNT_PRDT_CD = "01"
+    KIS_TOKEN_CACHE_PATH = os.path.join(TEST_DIR, "kis_token.json")
+    KIS_BAR_STORE_PATH = None
+
+
+_settings = TestSettings()
+_config = types.ModuleType("config")
+_config.get_settings = lambda: _settings
+sys.modules["config"] = _config
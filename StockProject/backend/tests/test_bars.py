@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+from services.bars import Bars
+
+# KIS output2: 최신순, 신규 상장 종목이나 짧은 기간이면 뒤에 빈 행이 붙어 옴
+PADDED_ROWS = [
+    {"stck_bsop_date": "20260116", "stck_oprc": "71000", "stck_hgpr": "72000", "stck_lwpr": "70500",
+     "stck_clpr": "71500", "acml_vol": "1200000"},
+    {"stck_bsop_date": "20260115", "stck_oprc": "70000", "stck_hgpr": "71200", "stck_lwpr": "69800",
+     "stck_clpr": "71000", "acml_vol": ""},
+    {"stck_bsop_date": "", "stck_oprc": "", "stck_hgpr": "", "stck_lwpr": "", "stck_clpr": "", "acml_vol": ""},
+    {},
+]
+
+
+def test_from_kis_rows_skips_blank_padding_rows():
+    bars = Bars.from_kis_rows(PADDED_ROWS)
+
+    assert len(bars) == 2
+    assert bars.dates.tolist() == [20260115, 20260116]  # 날짜 오름차순
+    assert bars.close.tolist() == [71000, 71500]
+    assert bars.volume.tolist() == [0, 1200000]  # 빈 값은 0
+
+
+def test_from_kis_rows_only_padding_is_empty():
+    bars = Bars.from_kis_rows(PADDED_ROWS[2:])
+
+    assert len(bars) == 0
+    assert bars.records() == []
+
+
+def test_dashboard_chart_frame_skips_blank_padding_rows():
+    """Streamlit 대시보드도 같은 응답에서 빈 행 때문에 정수 변환이 실패하지 않음"""
+    pytest.importorskip("pandas")
+    pytest.importorskip("streamlit")
+    pytest.importorskip("plotly")
+    pytest.importorskip("yaml")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from stockDashBoard import chart_frame
+
+    df = chart_frame(PADDED_ROWS)
+
+    assert len(df) == 2
+    assert df["stck_bsop_date"].dt.strftime("%Y%m%d").tolist() == ["20260115", "20260116"]
+    assert df["acml_vol"].tolist() == [0, 1200000]
+    assert chart_frame(PADDED_ROWS[2:]) is None
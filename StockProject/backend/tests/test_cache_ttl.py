@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+
+from services import korea_investment
+from services.korea_investment import (
+    CHART_TR_ID, KIS_CHART_TTL, KIS_HISTORY_TTL, KIS_QUOTE_TTL, QUOTE_TR_ID, KoreaInvestmentService
+)
+from utils import KST, is_price_settling, seconds_until_next_open
+
+FRIDAY = (2026, 10, 16)
+TODAY_CHART = {"fid_input_date_2": "20261016"}
+
+
+def at(*hm, day=FRIDAY):
+    return datetime(*day, *hm, tzinfo=KST)
+
+
+def ttl(monkeypatch, now, tr_id, params=None):
+    monkeypatch.setattr(korea_investment, "now_kst", lambda: now)
+    return KoreaInvestmentService._cache_ttl(tr_id, params or {})
+
+
+@pytest.mark.parametrize("hm", [(9, 0), (15, 29), (15, 30), (15, 35), (15, 39)])
+def test_short_ttl_until_close_settles(monkeypatch, hm):
+    """장중과 마감 직후(종가 확정 전)에는 시세 / 오늘 차트를 짧게만 캐시"""
+    now = at(*hm)
+    assert ttl(monkeypatch, now, QUOTE_TR_ID) == KIS_QUOTE_TTL
+    assert ttl(monkeypatch, now, CHART_TR_ID, TODAY_CHART) == KIS_CHART_TTL
+
+
+@pytest.mark.parametrize("now", [at(15, 40), at(20, 0), at(8, 59), at(12, 0, day=(2026, 10, 17))])
+def test_after_settle_cached_until_next_open(monkeypatch, now):
+    """종가 확정 후 / 장 시작 전 / 주말에는 다음 장 시작까지"""
+    expected = seconds_until_next_open(now)
+    assert ttl(monkeypatch, now, QUOTE_TR_ID) == expected
+    assert ttl(monkeypatch, now, CHART_TR_ID, {"fid_input_date_2": now.strftime("%Y%m%d")}) == expected
+
+
+def test_friday_after_settle_lasts_until_monday_open(monkeypatch):
+    assert ttl(monkeypatch, at(15, 40), QUOTE_TR_ID) == (2 * 24 + 17) * 3600 + 20 * 60
+
+
+def test_past_chart_range_uses_history_ttl(monkeypatch):
+    assert ttl(monkeypatch, at(10, 0), CHART_TR_ID, {"fid_input_date_2": "20261015"}) == KIS_HISTORY_TTL
+
+
+def test_is_price_settling_window():
+    assert not is_price_settling(at(8, 59))
+    assert is_price_settling(at(9, 0))
+    assert is_price_settling(at(15, 39, 59))
+    assert not is_price_settling(at(15, 40))
+    assert not is_price_settling(at(12, 0, day=(2026, 10, 17)))  # 토요일
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+from services import news_prefetch
+from services.news_prefetch import NewsPrefetcher
+
+
+class FakeFeed:
+    def __init__(self):
+        self.fetched_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class FakeFetcher:
+    """news_fetcher 대역 (수집 순서만 기록)"""
+
+    def __init__(self):
+        self.feeds = {}
+        self.order = []
+
+    def cached(self, url):
+        return self.feeds.get(url)
+
+    async def refresh(self, url, feed_name, stock_id=None):
+        self.order.append(stock_id)
+        self.feeds[url] = FakeFeed()
+        return self.feeds[url]
+
+
+def test_deferred_feeds_are_fetched_on_next_pass(monkeypatch):
+    """예산을 넘어 밀린 인기 종목도 다음 바퀴에 먼저 수집됨"""
+    fetcher = FakeFetcher()
+    stocks = [(stock_id, f"{stock_id:06d}", f"종목{stock_id}") for stock_id in range(1, 6)]
+    monkeypatch.setattr(news_prefetch, "news_fetcher", fetcher)
+    monkeypatch.setattr(news_prefetch, "hot_stocks", lambda limit: stocks[:limit])
+    monkeypatch.setattr(news_prefetch, "NEWS_TTL", 60)
+    monkeypatch.setattr(news_prefetch, "NEWS_PREFETCH_INTERVAL", 0.01)
+    monkeypatch.setattr(news_prefetch, "NEWS_PREFETCH_BUDGET", 2)
+
+    # 바퀴 사이에 TTL만큼 시간이 흐른 것처럼 (수집한 피드도 모두 다시 due)
+    def age_all(seconds):
+        for feed in fetcher.feeds.values():
+            feed.fetched_at -= seconds
+
+    prefetcher = NewsPrefetcher()
+    passes = []
+    for _ in range(3):
+        fetcher.order = []
+        asyncio.run(prefetcher.run_once())
+        passes.append(fetcher.order)
+        age_all(60)
+
+    # 시장 뉴스(None)와 1위 -> 밀린 2, 3위 -> 밀린 4, 5위
+    assert passes == [[None, 1], [2, 3], [4, 5]]
+    assert prefetcher.deferred == 4 * 3
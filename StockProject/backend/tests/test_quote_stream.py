@@ -0,0 +1,71 @@
+import asyncio
+
+from services import quote_stream
+from services.quote import Quote
+from services.quote_stream import QuoteStreamHub
+
+
+class FakeFeed:
+    """업스트림 구독 기록만 남기는 RealtimeQuoteFeed 대역"""
+
+    def __init__(self):
+        self.watched = set()
+
+    def add_listener(self, listener):
+        pass
+
+    def watch(self, stock_code):
+        self.watched.add(stock_code)
+
+    def unwatch(self, stock_code):
+        self.watched.discard(stock_code)
+
+
+def _quote(stock_code):
+    return Quote(stock_code=stock_code, price=70000, change=0, change_rate=0.0,
+                 volume=0, open=70000, high=70000, low=70000)
+
+
+def test_seed_skipped_when_session_closes_during_fetch(monkeypatch):
+    """시세 조회 중 세션이 끊기면 구독자 없는 상태를 남기지 않음"""
+
+    async def scenario():
+        released = asyncio.Event()
+
+        async def get_quotes(stock_codes, priority):
+            await released.wait()
+            return {code: _quote(code) for code in stock_codes}, {}
+
+        monkeypatch.setattr(quote_stream.ki_service, "get_quotes", get_quotes)
+        feed = FakeFeed()
+        hub = QuoteStreamHub(feed)
+        session = hub.open()
+
+        pending = asyncio.create_task(hub.subscribe(session, ["005930"]))
+        await asyncio.sleep(0)
+        hub.close(session)
+        released.set()
+        await pending
+
+        assert hub.state == {}
+        assert hub.sessions == {}
+        assert feed.watched == set()
+
+    asyncio.run(scenario())
+
+
+def test_seed_fills_state_for_live_subscriber(monkeypatch):
+    async def scenario():
+        async def get_quotes(stock_codes, priority):
+            return {code: _quote(code) for code in stock_codes}, {}
+
+        monkeypatch.setattr(quote_stream.ki_service, "get_quotes", get_quotes)
+        hub = QuoteStreamHub(FakeFeed())
+        session = hub.open()
+
+        assert await hub.subscribe(session, ["005930"]) == ["005930"]
+        version, fields = hub.state["005930"]
+        assert version == 0
+        assert fields["current_price"] == 70000
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+import asyncio
+import bisect
+import time
+
+import pytest
+
+from services.rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, RateLimitTimeout, RequestScheduler
+
+
+def max_per_second(times):
+    """어느 1초 구간 [t, t + 1)에든 들어간 최대 호출 수"""
+    times = sorted(times)
+    return max(bisect.bisect_left(times, t + 1.0) - i for i, t in enumerate(times))
+
+
+async def _burst(scheduler, tr_id, count, **kwargs):
+    granted = []
+
+    async def call():
+        await scheduler.acquire(tr_id, **kwargs)
+        granted.append(time.monotonic())
+
+    await asyncio.gather(*(call() for _ in range(count)))
+    return granted
+
+
+def test_global_rate_never_exceeded_in_any_window():
+    async def scenario():
+        scheduler = RequestScheduler(20)
+        return await _burst(scheduler, "FHKST01010100", 45)
+
+    granted = asyncio.run(scenario())
+    assert len(granted) == 45
+    assert max_per_second(granted) <= 20
+
+
+def test_no_burst_after_idle():
+    """쉬고 난 뒤에도 누적된 토큰으로 한꺼번에 나가지 않음"""
+
+    async def scenario():
+        scheduler = RequestScheduler(20)
+        await asyncio.sleep(1.0)
+        return await _burst(scheduler, "FHKST01010100", 25)
+
+    assert max_per_second(asyncio.run(scenario())) <= 20
+
+
+def test_tr_rate_limits_its_own_calls():
+    async def scenario():
+        scheduler = RequestScheduler(100, tr_rates={"FHKST03010100": 5})
+        return await _burst(scheduler, "FHKST03010100", 12)
+
+    assert max_per_second(asyncio.run(scenario())) <= 5
+
+
+def test_interactive_calls_jump_background_queue():
+    async def scenario():
+        scheduler = RequestScheduler(20)
+        await scheduler.acquire("X")  # 토큰 소진
+        order = []
+
+        async def call(name, priority):
+            await scheduler.acquire("X", priority)
+            order.append(name)
+
+        background = [asyncio.create_task(call(f"bg{i}", PRIORITY_BACKGROUND)) for i in range(3)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(call("ui", PRIORITY_INTERACTIVE))
+        await asyncio.gather(*background, interactive)
+        return order
+
+    assert asyncio.run(scenario()) == ["ui", "bg0", "bg1", "bg2"]
+
+
+def test_waiter_past_deadline_times_out():
+    async def scenario():
+        scheduler = RequestScheduler(1)
+        await scheduler.acquire("X")
+        started = time.monotonic()
+        with pytest.raises(RateLimitTimeout):
+            await scheduler.acquire("X", timeout=0.05)
+        return time.monotonic() - started, scheduler.metrics()
+
+    elapsed, metrics = asyncio.run(scenario())
+    assert elapsed < 0.5
+    assert metrics["timeouts"] == {"X": 1}
+    assert metrics["queue_depth"] == 0
+
+
+def test_cancelled_waiter_does_not_consume_a_slot():
+    async def scenario():
+        scheduler = RequestScheduler(10)
+        await scheduler.acquire("X")
+        cancelled = asyncio.create_task(scheduler.acquire("X"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await scheduler.acquire("X")
+        return scheduler.granted["X"]
+
+    assert asyncio.run(scenario()) == 2
@@ -0,0 +1,94 @@
+import pytest
+
+from services.hangul import is_chosung_query, to_chosung, to_jamo
+from services.stock_search import StockIndex, _fuzzy_distance
+
+STOCKS = [
+    ("005930", "삼성전자"), ("005935", "삼성전자우"), ("006400", "삼성SDI"), ("028260", "삼성물산"),
+    ("032830", "삼성생명"), ("010140", "삼성중공업"), ("000810", "삼성화재"), ("207940", "삼성바이오로직스"),
+    ("016360", "삼성증권"), ("029780", "삼성카드"), ("000660", "SK하이닉스"), ("017670", "SK텔레콤"),
+    ("035420", "NAVER"), ("035720", "카카오"), ("323410", "카카오뱅크"), ("373220", "LG에너지솔루션"),
+    ("051910", "LG화학"), ("005380", "현대차"), ("000270", "기아"), ("068270", "셀트리온"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return StockIndex(STOCKS, "test")
+
+
+def names(results):
+    return [name for _, name in results]
+
+
+def test_hangul_decomposition():
+    assert to_jamo("삼성") == "ㅅㅏㅁㅅㅓㅇ"
+    assert to_jamo("화") == "ㅎㅗㅏ"  # 겹모음은 입력 순서대로
+    assert to_chosung("삼성전자") == "ㅅㅅㅈㅈ"
+    assert is_chosung_query("skㅎㅇ")
+    assert not is_chosung_query("삼성ㅈ")
+
+
+def test_prefix_ranks_name_before_code_and_contains(index):
+    assert names(index.search("삼성전")) == ["삼성전자", "삼성전자우"]
+    assert names(index.search("naver")) == ["NAVER"]  # 대소문자 무시
+    assert index.search("00593") == [("005930", "삼성전자"), ("005935", "삼성전자우")]
+    # 종목명 포함 일치는 접두 일치 뒤
+    assert names(index.search("카카오")) == ["카카오", "카카오뱅크"]
+    assert names(index.search("화학")) == ["LG화학"]
+
+
+def test_jamo_matches_partially_typed_syllable(index):
+    assert names(index.search("삼성저"))[:2] == ["삼성전자", "삼성전자우"]
+    assert names(index.search("현대ㅊ")) == ["현대차"]
+    assert index.search("삼성저", hangul=False) == []
+
+
+def test_chosung_prefix_and_contains(index):
+    assert names(index.search("ㅅㅅㅈㅈ")) == ["삼성전자", "삼성전자우"]
+    assert names(index.search("ㅋㅋㅇ")) == ["카카오", "카카오뱅크"]
+    assert names(index.search("skㅎㅇ")) == ["SK하이닉스"]
+    assert names(index.search("ㄷㅊ")) == ["현대차"]  # 초성 포함 일치
+    assert index.search("ㅅㅅㅈㅈ", hangul=False) == []
+
+
+def test_limit_caps_results(index):
+    assert len(index.search("삼성", limit=3)) == 3
+    assert len(index.search("ㅅㅅ", limit=100)) == 10
+
+
+def test_fuzzy_only_when_enabled(index):
+    assert index.search("NAVR") == []
+    assert names(index.search("NAVR", fuzzy=True)) == ["NAVER"]
+    assert names(index.search("삼송전", fuzzy=True))[:2] == ["삼성전자", "삼성전자우"]
+    assert names(index.search("셀트리욘", fuzzy=True)) == ["셀트리온"]
+
+
+def test_fuzzy_skips_short_and_chosung_queries(index):
+    assert _fuzzy_distance(len(to_jamo("sk"))) == 0
+    assert index.search("ㅅㅅㅈㅈㅈ", fuzzy=True) == []
+
+
+def _levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[0], i
+        for j, cb in enumerate(b, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (ca != cb))
+    return row[-1]
+
+
+@pytest.mark.parametrize("query", ["삼송전", "셀트리욘", "nver", "카카우뱅", "LG하학", "혼대차"])
+def test_fuzzy_matches_brute_force_prefix_distance(index, query):
+    """오타 일치 = 자모 키의 어떤 접두어와든 편집 거리가 허용 거리 이하인 종목 (거리, 종목명 순)"""
+    q = to_jamo(query.casefold())
+    max_distance = _fuzzy_distance(len(q))
+    expected = {}
+    for i, key in enumerate(index._jamo_keys):
+        distance = min(_levenshtein(q, key[:n]) for n in range(len(key) + 1))
+        if distance <= max_distance:
+            expected[i] = distance
+
+    assert expected
+    assert list(index._fuzzy(index._jamo_trie, index._jamo_keys, q, max_distance)) == \
+        sorted(expected, key=lambda i: (expected[i], i))
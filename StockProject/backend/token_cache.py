@@ -0,0 +1,117 @@
+"""
+한국투자증권 접근 토큰 공유 파일 캐시
+
+백엔드 워커(services/token_manager.py)와 Streamlit 대시보드가 같은 파일과 락을 사용해
+토큰을 한 번만 발급하고 나눠 씀 (KIS는 토큰 발급을 1분에 1회로 제한).
+표준 라이브러리만 사용하므로 대시보드에서도 `from backend.token_cache import ...`로 가져올 수 있음
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# 만료 직전 토큰은 사용하지 않음 (초)
+EXPIRY_SAFETY_SECONDS = 60
+
+
+class FileLock:
+    """프로세스 간 배타적 파일 락 (같은 호스트의 워커끼리 토큰 파일 공유용)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = None
+
+    def acquire(self):
+        self._fh = open(self.path, "a+")
+        if fcntl:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+        else:
+            self._fh.seek(0)
+            msvcrt.locking(self._fh.fileno(), msvcrt.LK_LOCK, 1)
+
+    def release(self):
+        if self._fh is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            else:
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+
+def lock_path(cache_path: str) -> str:
+    return cache_path + ".lock"
+
+
+def key_id(app_key: str) -> str:
+    """앱키 식별자 (앱키 자체는 파일에 남기지 않음)"""
+    return hashlib.sha256(app_key.encode()).hexdigest()[:16]
+
+
+def is_fresh(cached: Optional[Dict[str, Any]]) -> bool:
+    return bool(cached) and cached["expires_at"] - time.time() > EXPIRY_SAFETY_SECONDS
+
+
+def read_cache(cache_path: str, app_key_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("key_id") != app_key_id or not data.get("access_token"):
+        return None
+    return data
+
+
+def write_cache(cache_path: str, app_key_id: str, access_token: str, issued_at: float, expires_at: float):
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "key_id": app_key_id,
+            "access_token": access_token,
+            "issued_at": issued_at,
+            "expires_at": expires_at
+        }, f)
+    os.replace(tmp_path, cache_path)
+
+
+def get_shared_token(cache_path: str, app_key: str, issue: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    동기 클라이언트용 토큰 조회 (대시보드)
+
+    파일의 토큰이 유효하면 그대로 쓰고, 아니면 락을 잡은 뒤 다시 확인하고 그래도 없을 때만
+    issue()로 발급해 파일에 저장 (백엔드 TokenManager와 같은 순서)
+
+    Returns:
+        {"access_token", "issued_at", "expires_at"}
+    """
+    app_key_id = key_id(app_key)
+    cached = read_cache(cache_path, app_key_id)
+    if is_fresh(cached):
+        return cached
+
+    lock = FileLock(lock_path(cache_path))
+    lock.acquire()
+    try:
+        cached = read_cache(cache_path, app_key_id)
+        if is_fresh(cached):
+            return cached
+
+        payload = issue()
+        issued_at = time.time()
+        expires_at = issued_at + int(payload.get("expires_in", 86400))
+        write_cache(cache_path, app_key_id, payload["access_token"], issued_at, expires_at)
+        return {"access_token": payload["access_token"], "issued_at": issued_at, "expires_at": expires_at}
+    finally:
+        lock.release()
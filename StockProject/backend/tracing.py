@@ -0,0 +1,191 @@
+"""
+요청 단계별 시간 측정
+
+요청마다 Trace를 contextvar에 두고, DB / KIS / 뉴스 수집 / 직렬화 구간에서 span을 기록함.
+응답에는 Server-Timing 헤더로 단계별 합계를 붙이고, 느린 요청은 최근 N건을 메모리에 보관
+"""
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+
+from config import get_settings
+
+settings = get_settings()
+
+# 이 시간(ms) 이상 걸린 요청만 보관
+TRACE_SLOW_MS = getattr(settings, "TRACE_SLOW_MS", 500)
+# 보관할 느린 요청 수
+TRACE_BUFFER_SIZE = getattr(settings, "TRACE_BUFFER_SIZE", 200)
+# 요청 하나에 기록할 최대 span 수 (여러 종목 일괄 조회 등)
+TRACE_MAX_SPANS = getattr(settings, "TRACE_MAX_SPANS", 500)
+
+_current: ContextVar[Optional["Trace"]] = ContextVar("trace", default=None)
+_ids = itertools.count(1)
+
+
+class Trace:
+    """요청 하나의 단계별 시간 기록"""
+
+    __slots__ = (
+        "trace_id", "method", "path", "route", "status_code",
+        "started_at", "_started", "duration", "spans", "dropped_spans"
+    )
+
+    def __init__(self, method: str, path: str):
+        self.trace_id = next(_ids)
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.spans: List[tuple] = []  # (이름, 시작 오프셋, 소요 시간)
+        self.dropped_spans = 0
+
+    def add(self, name: str, started: float, duration: float):
+        """span 기록 (started: time.perf_counter() 값)"""
+        if len(self.spans) >= TRACE_MAX_SPANS:
+            self.dropped_spans += 1
+            return
+        self.spans.append((name, started - self._started, duration))
+
+    def finish(self, status_code: int, route: Optional[str]):
+        self.status_code = status_code
+        self.route = route
+        self.duration = time.perf_counter() - self._started
+
+    def summary(self) -> Dict[str, List[float]]:
+        """단계별 [합계(초), 횟수] (기록 순서 유지)"""
+        totals: Dict[str, List[float]] = {}
+        for name, _, duration in self.spans:
+            total = totals.setdefault(name, [0.0, 0])
+            total[0] += duration
+            total[1] += 1
+        return totals
+
+    def server_timing(self) -> str:
+        """
+        Server-Timing 헤더 값
+
+        같은 단계는 합계로 묶고 desc에 횟수 표시 (동시에 실행된 span이 있으면 합계가 전체 시간보다 클 수 있음).
+        헤더 값은 latin-1이어야 하므로 ASCII만 사용
+        """
+        entries = [
+            f'{name};dur={total * 1000:.1f};desc="x{count}"'
+            for name, (total, count) in self.summary().items()
+        ]
+        elapsed = self.duration if self.duration is not None else time.perf_counter() - self._started
+        entries.append(f"total;dur={elapsed * 1000:.1f}")
+        return ", ".join(entries)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 2) if self.duration is not None else None,
+            "summary": {
+                name: {"total_ms": round(total * 1000, 2), "count": count}
+                for name, (total, count) in self.summary().items()
+            },
+            "spans": [
+                {"name": name, "offset_ms": round(offset * 1000, 2), "duration_ms": round(duration * 1000, 2)}
+                for name, offset, duration in self.spans
+            ],
+            "dropped_spans": self.dropped_spans
+        }
+
+
+def start_trace(method: str, path: str) -> Token:
+    return _current.set(Trace(method, path))
+
+
+def end_trace(token: Token):
+    _current.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def record(name: str, started: float, duration: float):
+    """이미 잰 구간을 현재 요청에 기록 (요청 밖이면 무시)"""
+    trace = _current.get()
+    if trace is not None:
+        trace.add(name, started, duration)
+
+
+@contextmanager
+def span(name: str):
+    """블록 실행 시간을 현재 요청의 span으로 기록 (예외가 나도 기록)"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, started, time.perf_counter() - started)
+
+
+class TraceBuffer:
+    """느린 요청 링 버퍼"""
+
+    def __init__(self, size: int, slow_ms: float):
+        self.slow_ms = slow_ms
+        self._traces: "deque[Trace]" = deque(maxlen=size)
+        self.recorded = 0
+
+    def add(self, trace: Trace):
+        if trace.duration is None or trace.duration * 1000 < self.slow_ms:
+            return
+        self._traces.append(trace)
+        self.recorded += 1
+
+    def recent(
+        self,
+        limit: int = 50,
+        min_ms: float = 0,
+        route: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """최근 느린 요청 (최신순)"""
+        result = []
+        for trace in reversed(self._traces):
+            if trace.duration * 1000 < min_ms or (route and trace.route != route):
+                continue
+            result.append(trace.to_dict())
+            if len(result) >= limit:
+                break
+        return result
+
+    def clear(self):
+        self._traces.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "buffered": len(self._traces),
+            "capacity": self._traces.maxlen,
+            "slow_ms": self.slow_ms,
+            "recorded": self.recorded
+        }
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON 직렬화 시간을 serialize span으로 기록하는 기본 응답 클래스"""
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            return super().render(content)
+
+
+trace_buffer = TraceBuffer(TRACE_BUFFER_SIZE, TRACE_SLOW_MS)
@@ -1,4 +1,5 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
 
 def utc_now():
     """timezone-aware UTC 현재 시간 반환"""
@@ -12,4 +13,44 @@ def to_utc(dt: datetime) -> datetime:
 
 def format_datetime(dt: datetime, format_str: str = "%Y-%m-%d %H:%M:%S") -> str:
     """datetime을 문자열로 포맷"""
-    return dt.strftime(format_str)
\ No newline at end of file
+    return dt.strftime(format_str)
+
+# ==================== 한국거래소(KRX) 장 운영시간 ====================
+KST = timezone(timedelta(hours=9))
+MARKET_OPEN = time(9, 0)
+MARKET_CLOSE = time(15, 30)
+# 종가 확정 시각 (마감 직후 응답은 동시호가 이전 가격일 수 있어 이때까지는 장중처럼 다시 읽음)
+CLOSE_SETTLED = time(15, 40)
+
+def now_kst() -> datetime:
+    """한국 시간 현재 시각"""
+    return datetime.now(KST)
+
+def is_trading_day(d: date) -> bool:
+    """거래일 여부 (주말 제외, 공휴일은 고려하지 않음)"""
+    return d.weekday() < 5
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """정규장(09:00~15:30 KST) 진행 중인지 여부"""
+    now = (now or now_kst()).astimezone(KST)
+    return is_trading_day(now.date()) and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+def is_price_settling(now: Optional[datetime] = None) -> bool:
+    """시세가 아직 바뀔 수 있는지 여부 (정규장 + 종가 확정 전, 09:00~15:40 KST)"""
+    now = (now or now_kst()).astimezone(KST)
+    return is_trading_day(now.date()) and MARKET_OPEN <= now.time() < CLOSE_SETTLED
+
+def next_market_open(now: Optional[datetime] = None) -> datetime:
+    """다음 정규장 시작 시각 (장중이면 다음 거래일 시작 시각)"""
+    now = (now or now_kst()).astimezone(KST)
+    day = now.date()
+    if now.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return datetime.combine(day, MARKET_OPEN, tzinfo=KST)
+
+def seconds_until_next_open(now: Optional[datetime] = None) -> float:
+    """다음 정규장 시작까지 남은 시간 (초)"""
+    now = (now or now_kst()).astimezone(KST)
+    return (next_market_open(now) - now).total_seconds()
@@ -0,0 +1,82 @@
+// 실시간 시세 스트림 (모든 컴포넌트가 WebSocket 연결 하나를 공유)
+const STREAM_URL = 'ws://localhost:8000/api/stream/quotes'
+const RECONNECT_MAX = 30000
+
+let socket = null
+let reconnectDelay = 1000
+let reconnectTimer = null
+
+// 종목코드 -> 콜백 목록
+const listeners = new Map()
+
+const send = (action, codes) => {
+  if (codes.length && socket?.readyState === WebSocket.OPEN) {
+    socket.send(JSON.stringify({ action, codes }))
+  }
+}
+
+const connect = () => {
+  if (socket || !listeners.size) return
+
+  socket = new WebSocket(STREAM_URL)
+
+  socket.onopen = () => {
+    reconnectDelay = 1000
+    send('subscribe', [...listeners.keys()])
+  }
+
+  socket.onmessage = (event) => {
+    const message = JSON.parse(event.data)
+    if (message.type !== 'quote') return
+    const { type, ...quote } = message
+    listeners.get(quote.stock_code)?.forEach(callback => callback(quote))
+  }
+
+  socket.onclose = () => {
+    socket = null
+    if (!listeners.size) return
+    // 재접속 (지수 백오프)
+    clearTimeout(reconnectTimer)
+    reconnectTimer = setTimeout(connect, reconnectDelay)
+    reconnectDelay = Math.min(reconnectDelay * 2, RECONNECT_MAX)
+  }
+}
+
+export function useQuoteStream() {
+  // 종목 구독 (콜백에는 stock_code와 바뀐 필드만 전달), 구독 해제 함수 반환
+  const subscribe = (codes, callback) => {
+    const added = []
+    codes.forEach(code => {
+      if (!listeners.has(code)) {
+        listeners.set(code, new Set())
+        added.push(code)
+      }
+      listeners.get(code).add(callback)
+    })
+
+    if (socket) {
+      send('subscribe', added)
+    } else {
+      connect()
+    }
+
+    return () => {
+      const removed = []
+      codes.forEach(code => {
+        const callbacks = listeners.get(code)
+        if (!callbacks) return
+        callbacks.delete(callback)
+        if (!callbacks.size) {
+          listeners.delete(code)
+          removed.push(code)
+        }
+      })
+      send('unsubscribe', removed)
+      if (!listeners.size && socket) {
+        socket.close()
+      }
+    }
+  }
+
+  return { subscribe }
+}
@@ -0,0 +1,148 @@
+// 종목 마스터 (종목코드 -> 종목명 전체를 한 번 받아 두고 검색은 브라우저에서)
+import axios from 'axios'
+
+const API_BASE = 'http://localhost:8000/api'
+const STORAGE_KEY = 'stockMaster'
+
+// ==================== 한글 자모 분해 (백엔드 services/hangul.py와 같은 규칙) ====================
+const CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+const JUNGSUNG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+const JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+  'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+const COMPOUND = {
+  'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+  'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+  'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ'
+}
+
+const syllable = (ch) => {
+  const code = ch.charCodeAt(0) - 0xAC00
+  return code >= 0 && code <= 11171 ? [Math.floor(code / 588), Math.floor((code % 588) / 28), code % 28] : null
+}
+const isJamo = (ch) => ch >= 'ㄱ' && ch <= 'ㆎ'
+const normalize = (text) => text.normalize('NFC').toLowerCase()
+
+const toJamo = (text) => [...text].map(ch => {
+  const parts = syllable(ch)
+  if (!parts) return COMPOUND[ch] || ch
+  const [cho, jung, jong] = parts
+  return CHOSUNG[cho] + (COMPOUND[JUNGSUNG[jung]] || JUNGSUNG[jung]) + (COMPOUND[JONGSUNG[jong]] || JONGSUNG[jong])
+}).join('')
+
+const toChosung = (text) => [...text].map(ch => {
+  const parts = syllable(ch)
+  return parts ? CHOSUNG[parts[0]] : ch
+}).join('')
+
+// ==================== 마스터 로드 ====================
+let entries = null   // [{ stock_code, stock_name, name, code, jamo, chosung }] (종목명 순)
+let loading = null
+
+const buildEntries = (stocks) => stocks
+  .map(([code, name]) => {
+    const key = normalize(name)
+    return { stock_code: code, stock_name: name, name: key, code: normalize(code), jamo: toJamo(key), chosung: toChosung(key) }
+  })
+  .sort((a, b) => {
+    if (a.stock_name !== b.stock_name) return a.stock_name < b.stock_name ? -1 : 1
+    return a.stock_code < b.stock_code ? -1 : a.stock_code > b.stock_code ? 1 : 0
+  })
+
+const readCache = () => {
+  try {
+    return JSON.parse(localStorage.getItem(STORAGE_KEY))
+  } catch {
+    return null
+  }
+}
+
+// 저장해 둔 ETag로 조건부 요청 (바뀌지 않았으면 304 - 본문 없이 저장본 사용)
+const fetchMaster = async () => {
+  const cached = readCache()
+  const response = await axios.get(`${API_BASE}/stocks/master`, {
+    headers: cached?.etag && cached.stocks ? { 'If-None-Match': cached.etag } : {},
+    validateStatus: status => status === 200 || status === 304
+  })
+
+  if (response.status === 304 && cached) {
+    return cached.stocks
+  }
+
+  const { stocks } = response.data
+  try {
+    localStorage.setItem(STORAGE_KEY, JSON.stringify({ etag: response.headers.etag, stocks }))
+  } catch {
+    // 저장 공간 부족 - 다음 방문 때 다시 받음
+  }
+  return stocks
+}
+
+const load = () => {
+  if (!loading) {
+    loading = fetchMaster()
+      .then(stocks => { entries = buildEntries(stocks) })
+      .catch(error => {
+        console.error('종목 마스터 로드 실패:', error)
+        loading = null
+      })
+  }
+  return loading
+}
+
+// ==================== 검색 ====================
+// 백엔드 /stocks/search와 같은 순위: 종목명 접두 > 종목코드 접두 > 종목명 포함 > 종목코드 포함
+// 한글 검색어는 이어서 자모 / 초성 접두 > 포함
+const localSearch = (query, limit) => {
+  const q = normalize(query)
+  const tiers = [
+    e => e.name.startsWith(q),
+    e => e.code.startsWith(q),
+    e => e.name.includes(q),
+    e => e.code.includes(q)
+  ]
+
+  const chars = [...q]
+  if (chars.some(ch => syllable(ch) || isJamo(ch))) {
+    const jamo = toJamo(q)
+    const chosungOnly = chars.filter(ch => syllable(ch) || isJamo(ch)).every(ch => CHOSUNG.includes(ch))
+    tiers.push(e => e.jamo.startsWith(jamo))
+    if (chosungOnly) tiers.push(e => e.chosung.startsWith(q))
+    tiers.push(e => e.jamo.includes(jamo))
+    if (chosungOnly) tiers.push(e => e.chosung.includes(q))
+  }
+
+  const results = []
+  const seen = new Set()
+  for (const match of tiers) {
+    for (const entry of entries) {
+      if (seen.has(entry) || !match(entry)) continue
+      seen.add(entry)
+      results.push({ stock_code: entry.stock_code, stock_name: entry.stock_name })
+      if (results.length >= limit) return results
+    }
+  }
+  return results
+}
+
+const remoteSearch = async (query, limit, fuzzy) => {
+  const response = await axios.get(`${API_BASE}/stocks/search`, {
+    params: { q: query, limit, fuzzy }
+  })
+  return response.data.success ? response.data.stocks : []
+}
+
+export function useStockMaster() {
+  // 종목 검색 (마스터를 받았으면 로컬, 일치하는 종목이 없으면 서버의 오타 검색으로 보완)
+  const search = async (query, limit = 10) => {
+    const q = query.trim()
+    if (!q) return []
+
+    await load()
+    if (!entries) return remoteSearch(q, limit, true)
+
+    const results = localSearch(q, limit)
+    return results.length ? results : remoteSearch(q, limit, true)
+  }
+
+  return { load, search }
+}
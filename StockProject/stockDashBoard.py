@@ -7,15 +7,19 @@ import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
+from backend.token_cache import get_shared_token
+
 # 설정 파일 로드
 @st.cache_resource
 def load_config():
     with open('./stockinfo.yaml', encoding='UTF-8') as f:
         return yaml.load(f, Loader=yaml.FullLoader)
 
-# 접근 토큰 발급
-@st.cache_data(ttl=3600)  # 1시간 캐시
-def get_access_token(config):
+# 백엔드 워커와 공유하는 토큰 캐시 파일
+TOKEN_CACHE_PATH = './backend/.kis_token.json'
+
+def issue_token(config):
+    """oauth2/tokenP 호출 (공유 캐시에 유효한 토큰이 없을 때만, 락 안에서 호출됨)"""
     headers = {"content-type": "application/json"}
     body = {
         "grant_type": "client_credentials",
@@ -27,11 +31,26 @@ def get_access_token(config):
     URL = f"{config['REAL_URL']}/{PATH}"
     
     res = requests.post(URL, headers=headers, data=json.dumps(body))
-    
-    if res.status_code == 200:
-        return res.json()["access_token"]
-    else:
-        st.error(f"토큰 발급 실패: {res.status_code}")
+    res.raise_for_status()
+    return res.json()
+
+# 접근 토큰 발급
+def get_access_token(config):
+    """
+    백엔드와 같은 공유 파일 / 락으로 토큰 조회 (KIS 토큰 발급 제한 회피)
+
+    파일의 토큰이 만료 60초 전까지 유효하면 그대로 쓰고, 아니면 락을 잡고 한 번만 발급해 저장.
+    실행마다 파일을 다시 읽으므로 만료된 토큰을 계속 쓰지 않음
+    """
+    try:
+        token = get_shared_token(
+            config.get('KIS_TOKEN_CACHE_PATH', TOKEN_CACHE_PATH),
+            config['REAL_APP_KEY'],
+            lambda: issue_token(config)
+        )
+        return token['access_token']
+    except requests.HTTPError as e:
+        st.error(f"토큰 발급 실패: {e.response.status_code}")
         return None
 
 # 주식 현재가 조회
@@ -108,6 +127,29 @@ def get_stock_price_daily(token, config, stock_code, period="D"):
         st.error(f"시세 조회 실패: {res.status_code}")
         return None
 
+# 차트에 사용하는 KIS output2 필드 (일자, 시가, 고가, 저가, 종가, 거래량)
+CHART_COLUMNS = ['stck_bsop_date', 'stck_oprc', 'stck_hgpr', 'stck_lwpr', 'stck_clpr', 'acml_vol']
+
+def chart_frame(output):
+    """
+    KIS output2 (최신순) -> 날짜 오름차순 데이터프레임 (데이터가 없으면 None)
+    """
+    # KIS가 채워 보내는 빈 행(일자 없음)은 제외 (신규 상장 종목, 짧은 기간)
+    output = [row for row in output if row.get("stck_bsop_date")]
+    
+    if not output:
+        return None
+    
+    # 데이터 역순 정렬 (날짜 오름차순)
+    output = output[::-1]
+    
+    # 데이터프레임 생성 (필요한 컬럼만 한 번에 숫자 변환, 빈 값은 0)
+    df = pd.DataFrame(output, columns=CHART_COLUMNS).replace('', 0).fillna(0).astype('int64')
+    
+    # 날짜 형식 변환
+    df['stck_bsop_date'] = pd.to_datetime(df['stck_bsop_date'].astype(str), format='%Y%m%d')
+    return df
+
 # 차트 그리기 함수
 def draw_stock_chart(data, stock_name, stock_code, period_name):
     """
@@ -117,28 +159,12 @@ def draw_stock_chart(data, stock_name, stock_code, period_name):
         st.error("차트 데이터를 가져올 수 없습니다.")
         return None
     
-    output = data.get("output2", [])
+    df = chart_frame(data.get("output2", []))
     
-    if not output:
+    if df is None:
         st.warning("차트 데이터가 없습니다.")
         return None
     
-    # 데이터 역순 정렬 (날짜 오름차순)
-    output = output[::-1]
-    
-    # 데이터프레임 생성
-    df = pd.DataFrame(output)
-    
-    # 날짜 형식 변환
-    df['stck_bsop_date'] = pd.to_datetime(df['stck_bsop_date'])
-    
-    # 숫자 변환
-    df['stck_oprc'] = pd.to_numeric(df['stck_oprc'])
-    df['stck_hgpr'] = pd.to_numeric(df['stck_hgpr'])
-    df['stck_lwpr'] = pd.to_numeric(df['stck_lwpr'])
-    df['stck_clpr'] = pd.to_numeric(df['stck_clpr'])
-    df['acml_vol'] = pd.to_numeric(df['acml_vol'])
-    
     # 캔들스틱 차트 생성
     fig = go.Figure()
     